@@ -2,9 +2,46 @@
 
 # NOTE: import order matters. Only change the order if you know what you are doing
 # isort: skip_file
+# ruff: noqa: E402
 
 from __future__ import annotations
+import sys
 from functools import partial
+from typing import TYPE_CHECKING
+
+from gdsfactory.lazy_import import LazyImports, LazyModule
+
+# submodules and functions with heavy dependencies are imported on first access
+_lazy_imports: LazyImports = {
+    "add_padding": ("gdsfactory.add_padding", "add_padding"),
+    "add_padding_container": ("gdsfactory.add_padding", "add_padding_container"),
+    "add_pins": ("gdsfactory.add_pins", None),
+    "add_ports": ("gdsfactory.add_ports", None),
+    "c": ("gdsfactory.components", None),
+    "components": ("gdsfactory.components", None),
+    "constants": ("gdsfactory.constants", None),
+    "diff": ("gdsfactory.difftest", "diff"),
+    "difftest": ("gdsfactory.difftest", "difftest"),
+    "export": ("gdsfactory.export", None),
+    "fill": ("gdsfactory.fill", None),
+    "functions": ("gdsfactory.functions", None),
+    "get_cells": ("gdsfactory.get_factories", "get_cells"),
+    "get_padding_points": ("gdsfactory.add_padding", "get_padding_points"),
+    "grid": ("gdsfactory.grid", "grid"),
+    "grid_with_text": ("gdsfactory.grid", "grid_with_text"),
+    "import_gds": ("gdsfactory.read.import_gds", "import_gds"),
+    "labels": ("gdsfactory.labels", None),
+    "pack": ("gdsfactory.pack", "pack"),
+    "read": ("gdsfactory.read", None),
+    "regression": ("gdsfactory.regression", None),
+    "routing": ("gdsfactory.routing", None),
+    "samples": ("gdsfactory.samples", None),
+    "schematic": ("gdsfactory.schematic", None),
+    "technology": ("gdsfactory.technology", None),
+    "write_cells": ("gdsfactory.write_cells", None),
+}
+sys.modules[__name__].__class__ = LazyModule
+
 from toolz import compose
 from aenum import constant  # type: ignore[import-untyped]
 
@@ -26,33 +63,15 @@ from gdsfactory.component import (
 )
 from gdsfactory.config import CONF, PATH
 from gdsfactory.port import Port
-from gdsfactory.read.import_gds import import_gds
 from gdsfactory.cross_section import CrossSection, Section
-from gdsfactory.difftest import difftest, diff
 from gdsfactory.boolean import boolean
 
 from gdsfactory import cross_section
 from gdsfactory import port
-from gdsfactory import components
-from gdsfactory import labels
 from gdsfactory import typings
 from gdsfactory import path
 from gdsfactory import snap
-from gdsfactory import read
-from gdsfactory import add_ports
-from gdsfactory import write_cells
-from gdsfactory import add_pins
-from gdsfactory import technology
-from gdsfactory import routing
-from gdsfactory import export
-from gdsfactory import functions
 
-from gdsfactory.add_padding import (
-    add_padding,
-    add_padding_container,
-    get_padding_points,
-)
-from gdsfactory.pack import pack
 from gdsfactory.pdk import (
     Pdk,
     get_component,
@@ -63,11 +82,34 @@ from gdsfactory.pdk import (
     get_cell,
     get_constant,
 )
-from gdsfactory.get_factories import get_cells
 from gdsfactory.cross_section import get_cross_sections
-from gdsfactory.grid import grid, grid_with_text
 
-c = components
+if TYPE_CHECKING:
+    from gdsfactory import (
+        add_pins,
+        add_ports,
+        components,
+        export,
+        fill,
+        functions,
+        labels,
+        read,
+        regression,
+        routing,
+        technology,
+        write_cells,
+    )
+    from gdsfactory import components as c
+    from gdsfactory.add_padding import (
+        add_padding,
+        add_padding_container,
+        get_padding_points,
+    )
+    from gdsfactory.difftest import diff, difftest
+    from gdsfactory.get_factories import get_cells
+    from gdsfactory.grid import grid, grid_with_text
+    from gdsfactory.pack import pack
+    from gdsfactory.read.import_gds import import_gds
 
 
 def clear_cache(kcl: kf.KCLayout = kf.kcl) -> None:
@@ -98,6 +140,7 @@ __all__ = (
     "clear_cache",
     "cell",
     "components",
+    "constants",
     "compose",
     "constant",
     "container",
@@ -106,6 +149,7 @@ __all__ = (
     "diff",
     "difftest",
     "export",
+    "fill",
     "functions",
     "get_active_pdk",
     "get_cell",
@@ -130,7 +174,10 @@ __all__ = (
     "path",
     "port",
     "read",
+    "regression",
     "routing",
+    "samples",
+    "schematic",
     "show",
     "snap",
     "technology",
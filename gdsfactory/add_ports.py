@@ -6,6 +6,7 @@ import warnings
 from functools import partial
 
 import numpy as np
+from kfactory import kdb
 
 import gdsfactory as gf
 from gdsfactory.component import Component
@@ -67,6 +68,131 @@ def add_ports_from_markers_square(
     return component
 
 
+def _marker_bboxes(
+    component: Component, layer: LayerSpec, boxes_only: bool = False
+) -> np.ndarray:
+    """Returns the (xmin, ymin, xmax, ymax) bboxes in um of the shapes on a layer.
+
+    Only the layer is iterated, recursively through the hierarchy.
+
+    Args:
+        component: to read shapes from.
+        layer: marker layer.
+        boxes_only: only read boxes, otherwise polygons, boxes and paths.
+    """
+    iterator = component.begin_shapes_rec(gf.get_layer(layer))
+    iterator.shape_flags = (
+        kdb.Shapes.SBoxes
+        if boxes_only
+        else kdb.Shapes.SBoxes | kdb.Shapes.SPolygons | kdb.Shapes.SPaths
+    )
+    bboxes = []
+    while not iterator.at_end():
+        bbox = iterator.shape().polygon.transformed(iterator.trans()).bbox()
+        bboxes.append((bbox.left, bbox.bottom, bbox.right, bbox.top))
+        iterator.next()
+    return np.array(bboxes, dtype=float).reshape(-1, 4) * component.kcl.dbu
+
+
+def _ports_from_bboxes(
+    component: Component,
+    bboxes: np.ndarray,
+    layer: LayerSpec,
+    inside: bool,
+    tol: float,
+    pin_extra_width: float,
+    min_pin_area_um2: float | None,
+    max_pin_area_um2: float | None,
+    skip_square_ports: bool,
+    xcenter: float | None,
+    ycenter: float | None,
+    port_name_prefix: str,
+    port_type: str,
+    ports_on_short_side: bool,
+    debug: bool,
+) -> list[Port]:
+    """Returns ports for pin marker bboxes, classifying all markers at once."""
+    xc = xcenter or component.dx
+    yc = ycenter or component.dy
+    index = np.arange(len(bboxes))
+    pxmin, pymin, pxmax, pymax = bboxes.T
+    dx = pxmax - pxmin
+    dy = pymax - pymin
+
+    keep = np.ones(len(bboxes), dtype=bool)
+    if min_pin_area_um2:
+        keep &= dx * dy >= min_pin_area_um2
+    if max_pin_area_um2:
+        keep &= dx * dy <= max_pin_area_um2
+    if skip_square_ports:
+        keep &= snap_to_grid(dx) != snap_to_grid(dy)
+    if debug:
+        for i in np.flatnonzero(~keep):
+            print(f"skipping port at ({dx[i]}, {dy[i]})")
+
+    index, pxmin, pymin, pxmax, pymax, dx, dy = (
+        a[keep] for a in (index, pxmin, pymin, pxmax, pymax, dx, dy)
+    )
+    x = (pxmax + pxmin) / 2
+    y = (pymax + pymin) / 2
+
+    # rectangular ports orientation is easier to detect
+    east_west = dy < dx if ports_on_short_side else dx < dy
+    north_south = dy > dx if ports_on_short_side else dx > dy
+    # square ports ports are harder to detect orientation
+    orientation = np.select(
+        [
+            east_west & (x > xc),
+            east_west,
+            north_south & (y > yc),
+            north_south,
+            pxmax > component.dxmax - tol,
+            pxmin < component.dxmin + tol,
+            pymax > component.dymax - tol,
+            pymin < component.dymin + tol,
+            pxmax > xc,
+        ],
+        [0, 180, 90, 270, 0, 180, 90, 270, 0],
+        180,
+    )
+    horizontal = (orientation == 0) | (orientation == 180)
+    width = np.where(horizontal, dy, dx) - pin_extra_width
+    if inside:
+        x = np.select([orientation == 0, orientation == 180], [pxmax, pxmin], x)
+        y = np.select([orientation == 90, orientation == 270], [pymax, pymin], y)
+
+    # markers at the same location only make one port
+    _, first = np.unique(np.stack([x, y], axis=1), axis=0, return_index=True)
+    first.sort()
+
+    return [
+        Port(
+            name=f"{port_name_prefix}{index[i]+1}"
+            if port_name_prefix
+            else str(index[i]),
+            center=(x[i], y[i]),
+            width=width[i],
+            orientation=orientation[i],
+            layer=layer,
+            port_type=port_type,
+        )
+        for i in first
+    ]
+
+
+def _add_ports(component: Component, ports: list[Port]) -> None:
+    """Adds ports sorted clockwise, raising for names already in component."""
+    names = {p.name for p in component.ports}
+    for port in sort_ports_clockwise(ports):
+        if port.name in names:
+            raise ValueError(
+                f"port {port.name!r} already in {sorted(names)}. "
+                "You can pass a port_name_prefix to add it with a different name."
+            )
+        names.add(port.name)
+        component.add_port(name=port.name, port=port)
+
+
 def add_ports_from_markers_center(
     component: Component,
     pin_layer: LayerSpec,
@@ -144,143 +270,32 @@ def add_ports_from_markers_center(
         dx > xc: east
         dx < xc: west
     """
-    xc = xcenter or component.dx
-    yc = ycenter or component.dy
-    dxmax = component.dxmax
-    dxmin = component.dxmin
-    dymax = component.dymax
-    dymin = component.dymin
-    dbu = component.kcl.dbu
-
-    layer = port_layer or pin_layer
-    port_locations = []
-
-    ports = {}
     port_name_prefix_default = "o" if port_type == "optical" else "e"
     port_name_prefix = port_name_prefix or port_name_prefix_default
 
-    pin_layer = gf.get_layer(pin_layer)
-
-    polygons = component.get_polygons(by="index")
-    if pin_layer not in polygons:
+    bboxes = _marker_bboxes(component, pin_layer)
+    if not len(bboxes):
         warnings.warn(f"no pin layer {pin_layer} found in {component.layers}")
         return component
 
-    port_markers = polygons[pin_layer]
-    ports = []
-
-    for i, p in enumerate(port_markers):
-        port_name = f"{port_name_prefix}{i+1}" if port_name_prefix else str(i)
-        bbox = p.bbox()
-        pxmin, pymin, pxmax, pymax = bbox.left, bbox.bottom, bbox.right, bbox.top
-
-        x = (pxmax + pxmin) / 2
-        y = (pymin + pymax) / 2
-        dy = abs(pymax - pymin)
-        dx = abs(pxmax - pxmin)
-
-        if min_pin_area_um2 and dx * dy < min_pin_area_um2:
-            if debug:
-                print(f"skipping port at ({dx}, {dy}) with min_pin_area_um2 {dx * dy}")
-            continue
-
-        if max_pin_area_um2 and dx * dy > max_pin_area_um2:
-            continue
-
-        if skip_square_ports and snap_to_grid(dx) == snap_to_grid(dy):
-            if debug:
-                print(f"skipping square port at ({dx}, {dy})")
-            continue
-
-        orientation = -1
-
-        dx *= dbu
-        dy *= dbu
-        x = x * dbu
-        y = y * dbu
-        pxmax *= dbu
-        pymax *= dbu
-        pxmin *= dbu
-        pymin *= dbu
-
-        # rectangular ports orientation is easier to detect
-        if dy < dx if ports_on_short_side else dx < dy:
-            if x > xc:  # east
-                orientation = 0
-                width = dy
-                x = pxmax if inside else x
-            elif x <= xc:  # west
-                orientation = 180
-                width = dy
-                x = pxmin if inside else x
-        elif dy > dx if ports_on_short_side else dx > dy:
-            if y > yc:  # north
-                orientation = 90
-                width = dx
-                y = pymax if inside else y
-            elif y <= yc:  # south
-                orientation = 270
-                width = dx
-                y = pymin if inside else y
-
-        # square ports ports are harder to detect orientation
-        elif pxmax > dxmax - tol:  # east
-            orientation = 0
-            width = dy
-            x = pxmax if inside else x
-        elif pxmin < dxmin + tol:  # west
-            orientation = 180
-            width = dy
-            x = pxmin if inside else x
-        elif pymax > dymax - tol:  # north
-            orientation = 90
-            width = dx
-            y = pymax if inside else y
-        elif pymin < dymin + tol:  # south
-            orientation = 270
-            width = dx
-            y = pymin if inside else y
-
-        elif pxmax > xc:
-            orientation = 0
-            width = dy
-            x = pxmax if inside else x
-
-        elif pxmax <= xc:
-            orientation = 180
-            width = dy
-            x = pxmin if inside else x
-
-        if orientation == -1:
-            raise ValueError(f"Unable to detect port at ({dx}, {dy})")
-
-        width = width - pin_extra_width
-
-        if (x, y) not in port_locations:
-            port_locations.append((x, y))
-            port = Port(
-                name=port_name,
-                center=(x, y),
-                width=width,
-                orientation=orientation,
-                layer=layer,
-                port_type=port_type,
-            )
-            ports.append(port)
-
-    ports = sort_ports_clockwise(ports)
-
-    for port in ports:
-        port_name = port.name
-        if port_name in component.ports:
-            component_ports = [p.name for p in component.ports]
-            raise ValueError(
-                f"port {port_name!r} already in {component_ports}. "
-                "You can pass a port_name_prefix to add it with a different name."
-            )
-
-        else:
-            component.add_port(name=port_name, port=port)
+    ports = _ports_from_bboxes(
+        component,
+        bboxes,
+        layer=port_layer or pin_layer,
+        inside=inside,
+        tol=tol,
+        pin_extra_width=pin_extra_width,
+        min_pin_area_um2=min_pin_area_um2,
+        max_pin_area_um2=max_pin_area_um2,
+        skip_square_ports=skip_square_ports,
+        xcenter=xcenter,
+        ycenter=ycenter,
+        port_name_prefix=port_name_prefix,
+        port_type=port_type,
+        ports_on_short_side=ports_on_short_side,
+        debug=debug,
+    )
+    _add_ports(component, ports)
     if auto_rename_ports:
         component.auto_rename_ports()
     return component
@@ -363,129 +378,27 @@ def add_ports_from_boxes(
         dx > xc: east
         dx < xc: west
     """
-    xc = xcenter or component.dx
-    yc = ycenter or component.dy
-    dxmax = component.dxmax
-    dxmin = component.dxmin
-    dymax = component.dymax
-    dymin = component.dymin
-
-    layer = port_layer or pin_layer
-    port_locations = []
-
-    ports = []
     port_name_prefix_default = "o" if port_type == "optical" else "e"
     port_name_prefix = port_name_prefix or port_name_prefix_default
 
-    pin_layer = gf.get_layer(pin_layer)
-    layer = gf.get_layer(layer)
-
-    port_markers = component.get_boxes(layer=pin_layer)
-    for i, p in enumerate(port_markers):
-        port_name = f"{port_name_prefix}{i+1}" if port_name_prefix else str(i)
-        bbox = p.bbox()
-        pxmin, pymin, pxmax, pymax = bbox.left, bbox.bottom, bbox.right, bbox.top
-
-        x = (pxmax + pxmin) / 2
-        y = (pymin + pymax) / 2
-        dy = abs(pymax - pymin)
-        dx = abs(pxmax - pxmin)
-
-        if min_pin_area_um2 and dx * dy < min_pin_area_um2:
-            if debug:
-                print(f"skipping port at ({dx}, {dy}) with min_pin_area_um2 {dx * dy}")
-            continue
-
-        if max_pin_area_um2 and dx * dy > max_pin_area_um2:
-            continue
-
-        if skip_square_ports and snap_to_grid(dx) == snap_to_grid(dy):
-            if debug:
-                print(f"skipping square port at ({dx}, {dy})")
-            continue
-
-        orientation = -1
-
-        # rectangular ports orientation is easier to detect
-        if dy < dx if ports_on_short_side else dx < dy:
-            if x > xc:  # east
-                orientation = 0
-                width = dy
-                x = pxmax if inside else x
-            elif x <= xc:  # west
-                orientation = 180
-                width = dy
-                x = pxmin if inside else x
-        elif dy > dx if ports_on_short_side else dx > dy:
-            if y > yc:  # north
-                orientation = 90
-                width = dx
-                y = pymax if inside else y
-            elif y <= yc:  # south
-                orientation = 270
-                width = dx
-                y = pymin if inside else y
-
-        # square ports ports are harder to detect orientation
-        elif pxmax > dxmax - tol:  # east
-            orientation = 0
-            width = dy
-            x = pxmax if inside else x
-        elif pxmin < dxmin + tol:  # west
-            orientation = 180
-            width = dy
-            x = pxmin if inside else x
-        elif pymax > dymax - tol:  # north
-            orientation = 90
-            width = dx
-            y = pymax if inside else y
-        elif pymin < dymin + tol:  # south
-            orientation = 270
-            width = dx
-            y = pymin if inside else y
-
-        elif pxmax > xc:
-            orientation = 0
-            width = dy
-            x = pxmax if inside else x
-
-        elif pxmax <= xc:
-            orientation = 180
-            width = dy
-            x = pxmin if inside else x
-
-        if orientation == -1:
-            raise ValueError(
-                f"Unable to detect port at ({dx=}, {dy=}, {x=}, {y=}, {xc=}, {yc=}"
-            )
-
-        width = np.round(width - pin_extra_width, 3)
-
-        if (x, y) not in port_locations:
-            port_locations.append((x, y))
-            port = Port(
-                name=port_name,
-                center=(x, y),
-                width=width,
-                orientation=orientation,
-                layer=layer,
-                port_type=port_type,
-            )
-            ports.append(port)
-
-    ports = sort_ports_clockwise(ports)
-
-    for port in ports:
-        port_name = port.name
-        if port_name in component.ports:
-            component_ports = [p.name for p in component.ports]
-            raise ValueError(
-                f"port {port_name!r} already in {component_ports}. "
-                "You can pass a port_name_prefix to add it with a different name."
-            )
-
-        else:
-            component.add_port(name=port_name, port=port)
+    ports = _ports_from_bboxes(
+        component,
+        _marker_bboxes(component, pin_layer, boxes_only=True),
+        layer=port_layer or pin_layer,
+        inside=inside,
+        tol=tol,
+        pin_extra_width=pin_extra_width,
+        min_pin_area_um2=min_pin_area_um2,
+        max_pin_area_um2=max_pin_area_um2,
+        skip_square_ports=skip_square_ports,
+        xcenter=xcenter,
+        ycenter=ycenter,
+        port_name_prefix=port_name_prefix,
+        port_type=port_type,
+        ports_on_short_side=ports_on_short_side,
+        debug=debug,
+    )
+    _add_ports(component, ports)
     if auto_rename_ports:
         component.auto_rename_ports()
     return component
@@ -534,34 +447,33 @@ def add_ports_from_labels(
     layer_label = layer_label or port_layer
 
     xc = xcenter or component.dx
-    for i, label in enumerate(component.get_labels(layer=layer_label)):
-        dx = label.x
-        dy = label.y
-
+    labels = component.get_labels(layer=layer_label)
+    xy = np.array([(label.x, label.y) for label in labels], dtype=float).reshape(-1, 2)
+    x, y = xy.T
+
+    if guess_port_orientation:
+        orientations = np.select(
+            [x > xc, x < xc, y > yc, y < yc], [0, 180, 90, 270], -1
+        ).tolist()
+    else:
+        orientations = [-1] * len(labels)
+
+    names = {port.name for port in component.ports}
+    for i, (label, orientation) in enumerate(zip(labels, orientations)):
         if get_name_from_label:
             port_name = label.string
         else:
             port_name = f"{port_name_prefix}{i+1}" if port_name_prefix else i
 
-        orientation = port_orientation
-
-        if guess_port_orientation:
-            if dx > xc:  # east
-                orientation = 0
-            elif dx < xc:  # west
-                orientation = 180
-            elif dy > yc:  # north
-                orientation = 90
-            elif dy < yc:  # south
-                orientation = 270
+        if orientation == -1:
+            orientation = port_orientation
 
-        if fail_on_duplicates and port_name in component.ports:
-            component_ports = [port.name for port in component.ports]
+        if fail_on_duplicates and port_name in names:
             raise ValueError(
-                f"port {port_name!r} already in {component_ports}. "
+                f"port {port_name!r} already in {sorted(names)}. "
                 "You can pass a port_name_prefix to add it with a different name."
             )
-        if get_name_from_label and port_name in component.ports:
+        if get_name_from_label and port_name in names:
             port_name_to_index[port_name] = (
                 port_name_to_index[port_name] + 1
                 if port_name in port_name_to_index
@@ -569,9 +481,10 @@ def add_ports_from_labels(
             )
             port_name = f"{port_name}{port_name_to_index[port_name]}"
 
+        names.add(port_name)
         component.add_port(
             name=port_name,
-            center=(dx, dy),
+            center=(label.x, label.y),
             width=port_width,
             orientation=orientation,
             port_type=port_type,
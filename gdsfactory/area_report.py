@@ -0,0 +1,136 @@
+"""Merged area and density of many layers in one tiled pass.
+
+`Component.area(layer)` flattens and merges the component once per layer.
+`area_report` reads all layers through the hierarchy in a single multithreaded
+`kdb.TilingProcessor` run and optionally returns the density of each tile.
+
+.. code::
+
+    import gdsfactory as gf
+
+    c = gf.components.mzi()
+    report = c.area_report(tile_size=20)
+    print(report)
+    report.density[(1, 0)]  # numpy array with shape (rows, columns)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+from kfactory import kdb
+
+from gdsfactory.component import Component
+from gdsfactory.typings import LayerSpecs
+
+_default_tile_size = 1000.0
+
+
+@dataclass
+class AreaReport:
+    """Result of :func:`area_report`.
+
+    Attributes:
+        area: merged area in um2 per layer.
+        density: per tile area fraction per layer, indexed [row, column] from the
+            bottom left tile. Only set when a tile_size is given.
+        tile_size: tile edge in um.
+        origin: bottom left corner of the tile grid in um.
+    """
+
+    area: dict[tuple[int, int], float] = field(default_factory=dict)
+    density: dict[tuple[int, int], np.ndarray] = field(default_factory=dict)
+    tile_size: float | None = None
+    origin: tuple[float, float] = (0.0, 0.0)
+
+    def __str__(self) -> str:
+        """Returns a table with the area and density range per layer."""
+        lines = [f"{'layer':<10} {'area(um2)':>14} {'min':>6} {'max':>6}"]
+        for layer, area in self.area.items():
+            line = f"{str(layer):<10} {area:>14.3f}"
+            if layer in self.density:
+                d = self.density[layer]
+                line += f" {d.min():>6.3f} {d.max():>6.3f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class _AreaReceiver(kdb.TileOutputReceiver):
+    def __init__(self, area: np.ndarray) -> None:
+        self.area = area
+
+    def put(
+        self,
+        ix: int,
+        iy: int,
+        tile: kdb.Box,
+        obj: object,
+        dbu: float,
+        clip: bool,
+    ) -> None:
+        self.area[iy, ix] += obj
+
+
+def area_report(
+    component: Component,
+    layers: LayerSpecs | None = None,
+    tile_size: float | None = None,
+    threads: int | None = None,
+) -> AreaReport:
+    """Returns the merged area of layers and optionally their density per tile.
+
+    Args:
+        component: to measure.
+        layers: layers to measure. Defaults to all layers with shapes.
+        tile_size: tile edge in um. If set, returns the density of each tile.
+        threads: number of threads. Defaults to the number of CPUs.
+    """
+    from gdsfactory.pdk import get_layer
+
+    kcl = component.kcl
+    cell = component._kdb_cell
+    if layers is None:
+        layer_indexes = [li for li in kcl.layer_indexes() if not cell.bbox(li).empty()]
+    else:
+        layer_indexes = [get_layer(layer) for layer in layers]
+    keys = [(kcl.get_info(li).layer, kcl.get_info(li).datatype) for li in layer_indexes]
+
+    bbox = cell.dbbox()
+    size = tile_size or _default_tile_size
+    nx = max(math.ceil(bbox.width() / size), 1)
+    ny = max(math.ceil(bbox.height() / size), 1)
+    origin = (bbox.left, bbox.bottom) if not bbox.empty() else (0.0, 0.0)
+    areas = [np.zeros((ny, nx)) for _ in layer_indexes]
+
+    tp = kdb.TilingProcessor()
+    tp.dbu = kcl.dbu
+    tp.tile_size(size, size)
+    tp.tile_origin(*origin)
+    tp.tiles(nx, ny)
+    tp.threads = threads or os.cpu_count() or 1
+    # keeps the receivers alive until the run is done
+    receivers = []
+    for i, (li, area) in enumerate(zip(layer_indexes, areas)):
+        receiver = _AreaReceiver(area)
+        receivers.append(receiver)
+        tp.input(f"l{i}", cell.begin_shapes_rec(li))
+        tp.output(f"o{i}", receiver)
+        # merged area clipped to the tile, so shapes across tiles count once
+        tp.queue(f"_output(o{i}, _tile ? l{i}.area(_tile.bbox) : l{i}.area)")
+    if layer_indexes:
+        tp.execute(f"area report {component.name}")
+
+    dbu2 = kcl.dbu**2
+    report = AreaReport(
+        area={key: float(area.sum()) * dbu2 for key, area in zip(keys, areas)},
+        tile_size=tile_size,
+        origin=origin,
+    )
+    if tile_size:
+        report.density = {
+            key: area * dbu2 / tile_size**2 for key, area in zip(keys, areas)
+        }
+    return report
@@ -7,6 +7,7 @@ from kfactory.kcell import KCell, MetaData
 from kfactory.kcell import cell as _cell
 
 from gdsfactory.component import Component
+from gdsfactory.tracing import traced_cell
 
 ComponentParams = ParamSpec("ComponentParams")
 
@@ -66,8 +67,7 @@ def cell(
 ):
     if post_process is None:
         post_process = []
-    return _cell(  # type: ignore
-        _func,
+    cell_decorator = _cell(  # type: ignore
         set_settings=set_settings,
         set_name=set_name,
         check_ports=check_ports,
@@ -83,3 +83,10 @@ def cell(
         info=info,
         post_process=post_process,
     )
+
+    def decorator(
+        func: ComponentFunc[ComponentParams],
+    ) -> ComponentFunc[ComponentParams]:
+        return traced_cell(cell_decorator, func, name=basename)
+
+    return decorator if _func is None else decorator(_func)
@@ -0,0 +1,133 @@
+"""Canonical geometry hashes for cells.
+
+The hash of a cell only depends on its geometry, not on how it is stored:
+polygons are merged per layer before hashing, so the same shape split into several
+polygons, or written in a different order, hashes the same. Cell names,
+meta info and properties are ignored. Hashes are combined bottom-up through the
+instance transformations, so two cells with the same hash have the same flat
+geometry on every layer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+import klayout.db as kdb
+
+
+def _hash_shapes(layout: kdb.Layout, cell: kdb.Cell, h) -> None:
+    layers = sorted(
+        (layout.get_info(li).layer, layout.get_info(li).datatype, li)
+        for li in layout.layer_indexes()
+    )
+    for layer, datatype, li in layers:
+        shapes = cell.shapes(li)
+        if shapes.is_empty():
+            continue
+        h.update(f"L{layer}/{datatype}".encode())
+        region = kdb.Region(shapes)
+        region.merge()
+        polygons = sorted(str(p) for p in region.each())
+        h.update("\n".join(polygons).encode())
+        texts = sorted(
+            f"{s.text_string}@{s.text_trans}" for s in shapes.each(kdb.Shapes.STexts)
+        )
+        if texts:
+            h.update("\n".join(texts).encode())
+
+
+def _inst_key(child_hash: str, cell_inst: kdb.CellInstArray) -> str:
+    trans = cell_inst.cplx_trans if cell_inst.is_complex() else cell_inst.trans
+    if cell_inst.is_regular_array():
+        return (
+            f"{child_hash} {trans} "
+            f"{cell_inst.a} {cell_inst.na} {cell_inst.b} {cell_inst.nb}"
+        )
+    return f"{child_hash} {trans}"
+
+
+def _needed_cells(
+    layout: kdb.Layout, cell_indexes: Iterable[int] | None
+) -> set[int] | None:
+    if cell_indexes is None:
+        return None
+    needed = set()
+    for ci in cell_indexes:
+        needed.add(ci)
+        needed.update(layout.cell(ci).called_cells())
+    return needed
+
+
+def get_cell_hashes(
+    layout: kdb.Layout, cell_indexes: Iterable[int] | None = None
+) -> dict[int, str]:
+    """Returns a geometry hash for each cell index of a layout.
+
+    Args:
+        layout: klayout Layout.
+        cell_indexes: top cells to hash together with all their children.
+            Defaults to all cells.
+    """
+    needed = _needed_cells(layout, cell_indexes)
+    hashes: dict[int, str] = {}
+    for ci in layout.each_cell_bottom_up():
+        if needed is not None and ci not in needed:
+            continue
+        cell = layout.cell(ci)
+        h = hashlib.sha256()
+        h.update(f"dbu{layout.dbu}".encode())
+        _hash_shapes(layout, cell, h)
+        insts = sorted(
+            _inst_key(hashes[inst.cell_index], inst.cell_inst)
+            for inst in cell.each_inst()
+        )
+        h.update("\n".join(insts).encode())
+        hashes[ci] = h.hexdigest()
+    return hashes
+
+
+def get_cell_own_hashes(
+    layout: kdb.Layout, cell_indexes: Iterable[int] | None = None
+) -> dict[int, str]:
+    """Returns a hash of the content of each cell, without the content of its children.
+
+    The hash covers the shapes of the cell and the names and transformations of
+    its instances. Two cells with the same own hash only differ, if at all,
+    inside their children.
+
+    Args:
+        layout: klayout Layout.
+        cell_indexes: top cells to hash together with all their children.
+            Defaults to all cells.
+    """
+    needed = _needed_cells(layout, cell_indexes)
+    hashes: dict[int, str] = {}
+    for cell in layout.each_cell():
+        ci = cell.cell_index()
+        if needed is not None and ci not in needed:
+            continue
+        h = hashlib.sha256()
+        h.update(f"dbu{layout.dbu}".encode())
+        _hash_shapes(layout, cell, h)
+        insts = sorted(
+            _inst_key(layout.cell(inst.cell_index).name, inst.cell_inst)
+            for inst in cell.each_inst()
+        )
+        h.update("\n".join(insts).encode())
+        hashes[ci] = h.hexdigest()
+    return hashes
+
+
+def get_cell_hash(cell: kdb.Cell) -> str:
+    """Returns the geometry hash of a cell and its children."""
+    return get_cell_hashes(cell.layout(), [cell.cell_index()])[cell.cell_index()]
+
+
+def get_tree_hashes(cell: kdb.Cell) -> dict[str, tuple[str, str]]:
+    """Returns cell name -> (hash, own hash) for a cell and all its children."""
+    layout = cell.layout()
+    cell_indexes = [cell.cell_index()]
+    hashes = get_cell_hashes(layout, cell_indexes)
+    own_hashes = get_cell_own_hashes(layout, cell_indexes)
+    return {layout.cell(ci).name: (h, own_hashes[ci]) for ci, h in hashes.items()}
@@ -26,6 +26,14 @@ class Migration(str, Enum):
     upgrade7to8 = "7to8"
 
 
+class Format(str, Enum):
+    """Layout file formats."""
+
+    gds = "gds"
+    gds_gz = "gds.gz"
+    oas = "oas"
+
+
 @app.command()
 def layermap_to_dataclass(
     filepath: str,
@@ -44,41 +52,142 @@ def layermap_to_dataclass(
 
 
 @app.command()
-def write_cells(gdspath: str, dirpath: str = "", recursively: bool = True) -> None:
+def write_cells(
+    gdspath: str,
+    dirpath: str = "",
+    recursively: bool = True,
+    max_workers: int = typer.Option(
+        None, "--workers", "-j", help="Worker processes, 0 writes in this process"
+    ),
+    format: Format = typer.Option(Format.gds, "--format", help="Output format"),
+) -> None:
     """Write each all level cells into separate GDS files."""
     from gdsfactory.write_cells import write_cells as write_cells_top_cells
     from gdsfactory.write_cells import write_cells_recursively
 
     if recursively:
-        write_cells_recursively(gdspath=gdspath, dirpath=dirpath)
+        write_cells_recursively(
+            gdspath=gdspath,
+            dirpath=dirpath,
+            max_workers=max_workers,
+            format=format.value,
+        )
     else:
-        write_cells_top_cells(gdspath=gdspath, dirpath=dirpath)
+        write_cells_top_cells(gdspath=gdspath, dirpath=dirpath, format=format.value)
 
 
 @app.command()
-def merge_gds(dirpath: str = "", gdspath: str = "") -> None:
-    """Merges GDS cells from a directory into a single GDS."""
-    from gdsfactory.read.from_gdspaths import from_gdsdir
+def merge_gds(
+    dirpath: str = "",
+    gdspath: str = "",
+    max_workers: int = typer.Option(
+        None, "--workers", help="Number of reader processes. Defaults to CPU count"
+    ),
+    format: Format = typer.Option(
+        Format.gds, "--format", help="Output format if gdspath is not set"
+    ),
+) -> None:
+    """Merges GDS and OASIS cells from a directory into a single file."""
+    from gdsfactory.layout_format import suffixes
+    from gdsfactory.read.from_gdspaths import merge_gdsdir
 
     dirpath = dirpath or pathlib.Path.cwd()
-    gdspath = gdspath or pathlib.Path.cwd() / "merged.gds"
+    gdspath = gdspath or pathlib.Path.cwd() / f"merged{suffixes[format.value]}"
 
     dirpath = pathlib.Path(dirpath)
 
-    c = from_gdsdir(dirpath=dirpath)
-    c.write_gds(gdspath=gdspath)
-    c.show()
+    report = merge_gdsdir(dirpath=dirpath, gdspath=gdspath, max_workers=max_workers)
+    print(report)
+    _show(gdspath)
+
+
+@app.command()
+def convert(
+    filepath: str,
+    filepath_out: str,
+    compression_level: int = typer.Option(
+        10, "--compression-level", help="OASIS compression level, 0 to 10"
+    ),
+) -> None:
+    """Converts between GDS, gzipped GDS and OASIS, chosen by the file suffixes."""
+    import time
+
+    import klayout.db as kdb
+
+    from gdsfactory.layout_format import get_layout_format, get_save_options
+
+    t0 = time.perf_counter()
+    layout = kdb.Layout()
+    layout.read(filepath)
+    t1 = time.perf_counter()
+    options = get_save_options(
+        get_layout_format(filepath_out),
+        kdb.SaveLayoutOptions(),
+        oasis_compression_level=compression_level,
+    )
+    layout.write(filepath_out, options)
+    t2 = time.perf_counter()
+    size_in = pathlib.Path(filepath).stat().st_size / 1e6
+    size_out = pathlib.Path(filepath_out).stat().st_size / 1e6
+    pprint(
+        f"read {size_in:.1f} MB in {t1 - t0:.2f}s, "
+        f"wrote {size_out:.1f} MB in {t2 - t1:.2f}s"
+    )
 
 
 @app.command()
 def watch(
     path: str = str(pathlib.Path.cwd()),
     pdk: str = typer.Option(None, "--pdk", "-pdk", help="PDK name"),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Only rebuild instances and routes that changed"
+    ),
+    debounce: float = typer.Option(
+        0.2, "--debounce", help="Seconds to wait for more file events before building"
+    ),
+    run_in_process: bool = typer.Option(
+        False, "--worker", help="Build in a worker process"
+    ),
 ) -> None:
     """Filewatch a folder for changes in *.py or *.pic.yml files."""
     path = pathlib.Path(path)
     path = path.parent if path.is_dir() else path
-    _watch(str(path), pdk=pdk)
+    _watch(
+        str(path),
+        pdk=pdk,
+        incremental=incremental,
+        debounce=debounce,
+        run_in_process=run_in_process,
+    )
+
+
+@app.command(name="build-all")
+def build_all(
+    dirpath: str = "build/regression",
+    dirpath_ref: str = typer.Option(
+        None, "--ref", help="Directory with the reference GDS and YAML files"
+    ),
+    pdk: str = typer.Option(None, "--pdk", "-pdk", help="PDK name"),
+    max_workers: int = typer.Option(
+        None, "--workers", "-j", help="Worker processes, 0 builds in this process"
+    ),
+    junit_xml: str = typer.Option(None, "--junit-xml", help="JUnit XML report"),
+    force: bool = typer.Option(False, "--force", "-f", help="Rebuild all cells"),
+) -> None:
+    """Builds all PDK cells in parallel and compares them with references."""
+    from gdsfactory.regression import run_regression
+
+    report = run_regression(
+        dirpath=dirpath,
+        dirpath_ref=dirpath_ref,
+        max_workers=max_workers,
+        force=force,
+        pdk=pdk,
+        junit_xml=junit_xml,
+    )
+    print(report)
+    if report.failed:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -0,0 +1,200 @@
+"""Replaces instances placed on a regular lattice with instance arrays.
+
+Components that place the same cell many times one reference at a time, like
+photonic crystal unit cells, end up with thousands of instances. Instances of the
+same cell with the same rotation, mirror, magnification and properties that lie
+on a regular 1D or 2D lattice are replaced by a single `kdb.CellInstArray`.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import kfactory as kf
+from kfactory import kdb
+from kfactory.kcell import LockedError
+
+from gdsfactory.component import Component
+
+
+@dataclass
+class CompactReport:
+    """Result of :func:`compact_instances`.
+
+    Attributes:
+        cell: name of the compacted cell.
+        instances_before: number of instances (an array counts as one) before.
+        instances_after: number of instances after.
+        arrays: number of arrays created.
+    """
+
+    cell: str
+    instances_before: int = 0
+    instances_after: int = 0
+    arrays: int = 0
+
+    def __str__(self) -> str:
+        """Returns a one line summary."""
+        return (
+            f"{self.cell}: {self.instances_before} -> {self.instances_after} "
+            f"instances ({self.arrays} arrays)"
+        )
+
+
+def _runs(values: list[int], min_count: int) -> Iterable[tuple[int, int, int]]:
+    """Yields (start, step, count) for maximal arithmetic runs of sorted values."""
+    i = 0
+    while i < len(values):
+        j = i + 1
+        if j < len(values):
+            step = values[j] - values[i]
+            while j + 1 < len(values) and values[j + 1] - values[j] == step:
+                j += 1
+        if j - i + 1 >= min_count and j < len(values):
+            yield values[i], values[j] - values[j - 1], j - i + 1
+            i = j + 1
+        else:
+            yield values[i], 0, 1
+            i += 1
+
+
+def _line(points: list[kdb.Vector]) -> tuple[kdb.Vector, kdb.Vector] | None:
+    """Returns (origin, step) if the points lie on one evenly spaced line."""
+    points = sorted(points, key=lambda p: (p.x, p.y))
+    step = points[1] - points[0]
+    for i, p in enumerate(points):
+        if p != points[0] + step * i:
+            return None
+    return points[0], step
+
+
+def _lattices(
+    points: list[kdb.Vector], min_count: int
+) -> list[tuple[kdb.Vector, kdb.Vector, int, kdb.Vector, int]]:
+    """Splits displacements into lattices (origin, a, na, b, nb).
+
+    A single line in any direction is detected as such. Otherwise each row of
+    constant y is split into evenly spaced runs, and runs with the same x pattern
+    on evenly spaced rows are stacked into 2D arrays. Points that are not part of a
+    lattice come back with na = nb = 1.
+    """
+    if len(points) >= max(min_count, 2) and (line := _line(points)):
+        origin, step = line
+        return [(origin, step, len(points), kdb.Vector(), 1)]
+
+    rows: dict[int, list[int]] = defaultdict(list)
+    for p in points:
+        rows[p.y].append(p.x)
+
+    columns: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for y, xs in rows.items():
+        for x0, dx, nx in _runs(sorted(xs), min_count=2):
+            columns[x0, dx, nx].append(y)
+
+    lattices = []
+    for (x0, dx, nx), ys in columns.items():
+        for y0, dy, ny in _runs(sorted(ys), min_count=2):
+            if nx * ny < min_count:
+                lattices.extend(
+                    (
+                        kdb.Vector(x0 + i * dx, y0 + j * dy),
+                        kdb.Vector(),
+                        1,
+                        kdb.Vector(),
+                        1,
+                    )
+                    for i in range(nx)
+                    for j in range(ny)
+                )
+            else:
+                lattices.append(
+                    (kdb.Vector(x0, y0), kdb.Vector(dx, 0), nx, kdb.Vector(0, dy), ny)
+                )
+    return lattices
+
+
+def compact_instances(
+    component: Component, min_count: int = 2, allow_locked: bool = False
+) -> CompactReport:
+    """Replaces instances on a regular lattice with instance arrays in place.
+
+    Only single (non array) instances are considered. Locked components, like
+    cached cells, are shared and raise LockedError. As a `gf.cell` post process
+    function the cell is locked but not shared yet, so it can be compacted::
+
+        @gf.cell(post_process=[partial(compact_instances, allow_locked=True)])
+        def crystal() -> gf.Component: ...
+
+    Args:
+        component: to compact.
+        min_count: minimum number of instances to replace with an array.
+        allow_locked: compacts locked components too. Only for post process.
+
+    Returns:
+        CompactReport with the instance count reduction.
+    """
+    if component._locked and not allow_locked:
+        raise LockedError(component)
+
+    cell = component._kdb_cell
+    report = CompactReport(cell=component.name, instances_before=cell.child_instances())
+
+    groups: dict[tuple, list[kf.Instance]] = defaultdict(list)
+    for inst in component.insts:
+        cell_inst = inst._instance.cell_inst
+        if cell_inst.is_regular_array():
+            continue
+        trans = (
+            cell_inst.cplx_trans
+            if cell_inst.is_complex()
+            else kdb.ICplxTrans(cell_inst.trans)
+        )
+        key = (
+            cell_inst.cell_index,
+            trans.angle,
+            trans.is_mirror(),
+            trans.mag,
+            inst._instance.prop_id,
+        )
+        groups[key].append(inst)
+
+    for (cell_index, angle, mirror, mag, prop_id), insts in groups.items():
+        if len(insts) < min_count:
+            continue
+        by_disp = {}
+        for inst in insts:
+            cell_inst = inst._instance.cell_inst
+            disp = (
+                cell_inst.cplx_trans.disp
+                if cell_inst.is_complex()
+                else cell_inst.trans.disp
+            )
+            by_disp.setdefault(disp, inst)
+        if len(by_disp) != len(insts):
+            # overlapping duplicates can not be part of an array
+            continue
+
+        for origin, a, na, b, nb in _lattices(list(by_disp), min_count):
+            if na * nb == 1:
+                continue
+            trans = kdb.ICplxTrans(mag, angle, mirror, origin)
+            cell_inst = (
+                kdb.CellInstArray(cell_index, trans.s_trans(), a, b, na, nb)
+                if trans.is_ortho() and mag == 1
+                else kdb.CellInstArray(cell_index, trans, a, b, na, nb)
+            )
+            for i in range(na):
+                for j in range(nb):
+                    inst = by_disp[origin + a * i + b * j]
+                    inst._instance.delete()
+                    del component.insts[inst]
+            new_inst = (
+                cell.insert(cell_inst, prop_id) if prop_id else cell.insert(cell_inst)
+            )
+            component.insts.append(kf.Instance(component.kcl, new_inst))
+            report.arrays += 1
+
+    report.instances_after = cell.child_instances()
+    return report
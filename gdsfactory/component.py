@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import pathlib
+import tempfile
 import warnings
 from collections.abc import Callable, Iterable, Iterator
 from typing import TYPE_CHECKING, Any, Literal
@@ -12,19 +14,28 @@ import klayout.db as db  # noqa: F401
 import klayout.lay as lay
 import numpy as np
 from kfactory import Instance, kdb, logger
-from kfactory.kcell import cell, save_layout_options
+from kfactory.kcell import cell
 
 from gdsfactory.config import GDSDIR_TEMP
 from gdsfactory.functions import get_polygons, get_polygons_points
+from gdsfactory.layout_format import (
+    LayoutFormat,
+    get_layout_format,
+    get_save_options,
+)
+from gdsfactory.layout_format import suffixes as layout_suffixes
 from gdsfactory.port import pprint_ports, select_ports, to_dict
 from gdsfactory.serialization import clean_value_json
 
 if TYPE_CHECKING:
+    from gdsfactory.area_report import AreaReport
+    from gdsfactory.compact_instances import CompactReport
     from gdsfactory.typings import (
         CrossSection,
         CrossSectionSpec,
         Layer,
         LayerSpec,
+        LayerSpecs,
         LayerStack,
         LayerViews,
         PathType,
@@ -85,6 +96,21 @@ def copy(region: kdb.Region) -> kdb.Region:
     return region.dup()
 
 
+def _copy_layers(
+    source: kdb.Cell,
+    target: kdb.Cell,
+    layer_mapping: kdb.LayerMapping,
+    clones: dict[int, int],
+) -> None:
+    """Copies the mapped layers of source and its instances of cloned cells."""
+    target.copy_shapes(source, layer_mapping)
+    for inst in source.each_inst():
+        if inst.cell_index in clones:
+            cell_inst = inst.cell_inst.dup()
+            cell_inst.cell_index = clones[inst.cell_index]
+            target.insert(cell_inst, inst.prop_id)
+
+
 _deprecated_attributes = {
     "center",
     "mirror",
@@ -752,6 +778,25 @@ class ComponentBase:
         r.merge()
         return sum(p.area2() / 2 * self.kcl.dbu**2 for p in r.each())
 
+    def area_report(
+        self,
+        layers: LayerSpecs | None = None,
+        tile_size: float | None = None,
+        threads: int | None = None,
+    ) -> AreaReport:
+        """Returns the merged area of many layers and their density per tile.
+
+        All layers are measured in one tiled, multithreaded pass.
+
+        Args:
+            layers: layers to measure. Defaults to all layers with shapes.
+            tile_size: tile edge in um. If set, returns the density of each tile.
+            threads: number of threads. Defaults to the number of CPUs.
+        """
+        from gdsfactory.area_report import area_report
+
+        return area_report(self, layers=layers, tile_size=tile_size, threads=threads)
+
     def copy_child_info(self, component: Component) -> None:
         """Copy and settings info from child component into parent.
 
@@ -768,14 +813,18 @@ class ComponentBase:
         gdspath: PathType | None = None,
         gdsdir: PathType | None = None,
         save_options: kdb.SaveLayoutOptions | None = None,
+        format: LayoutFormat | None = None,
         **kwargs,
     ) -> pathlib.Path:
-        """Write component to GDS and returns gdspath.
+        """Write component to GDS, gzipped GDS or OASIS and returns gdspath.
 
         Args:
-            gdspath: GDS file path to write to.
-            gdsdir: directory for the GDS file. Defaults to /tmp/randomFile/gdsfactory.
-            save_options: klayout save options.
+            gdspath: file path to write to. The suffix sets the format:
+                .gds, .gds.gz or .oas.
+            gdsdir: directory for the file. Defaults to /tmp/randomFile/gdsfactory.
+            save_options: klayout save options. See
+                :func:`gdsfactory.layout_format.get_save_options` for OASIS options.
+            format: gds, gds.gz or oas. Defaults to the gdspath suffix, or gds.
             kwargs: deprecated.
         """
         if gdspath and gdsdir:
@@ -784,17 +833,18 @@ class ComponentBase:
                 "gdspath will take precedence and gdsdir will be ignored.",
                 stacklevel=3,
             )
+        format = get_layout_format(gdspath, format)
         gdsdir = gdsdir or GDSDIR_TEMP
         gdsdir = pathlib.Path(gdsdir)
         gdsdir.mkdir(parents=True, exist_ok=True)
-        gdspath = gdspath or gdsdir / f"{self.name[:kf.config.max_cellname_length]}.gds"
+        name = self.name[: kf.config.max_cellname_length]
+        gdspath = gdspath or gdsdir / f"{name}{layout_suffixes[format]}"
         gdspath = pathlib.Path(gdspath)
 
         if not gdspath.parent.is_dir():
             gdspath.parent.mkdir(parents=True, exist_ok=True)
 
-        if save_options is None:
-            save_options = save_layout_options()
+        save_options = get_save_options(format, save_options)
 
         if kwargs:
             for k in kwargs:
@@ -802,39 +852,113 @@ class ComponentBase:
         self.write(filename=gdspath, save_options=save_options)
         return pathlib.Path(gdspath)
 
+    def to_bytes(
+        self,
+        format: LayoutFormat = "gds",
+        save_options: kdb.SaveLayoutOptions | None = None,
+    ) -> bytes:
+        """Returns the component and its children as GDS, gzipped GDS or OASIS bytes.
+
+        Args:
+            format: gds, gds.gz or oas.
+            save_options: klayout save options.
+        """
+        save_options = get_save_options(format, save_options)
+        # goes through KCell.write so the metadata matches write_gds
+        with tempfile.TemporaryDirectory() as dirpath:
+            path = pathlib.Path(dirpath) / f"layout{layout_suffixes[format]}"
+            self.write(filename=path, save_options=save_options)
+            return path.read_bytes()
+
     def extract(
         self,
         layers: list[LayerSpec],
+        hierarchical: bool = False,
     ) -> Component:
         """Extracts a list of layers and adds them to a new Component.
 
         Args:
             layers: list of layers to extract.
+            hierarchical: if True, keeps the instances of the cells with shapes on
+                the layers instead of flattening them. Those cells are copied as
+                `{cell_name}_E{hash}` with only the extracted layers. Copies of
+                locked cells are reused, unlocked cells are copied on every call.
         """
         from gdsfactory import get_layer
 
+        layer_indexes = [get_layer(layer) for layer in layers]
         c = Component()
+        # bulk inserts need the instance trees of unlocked cells to be sorted
+        self._kdb_cell.layout().update()
 
-        for layer in layers:
-            layer_index = get_layer(layer)
-            for r in self._kdb_cell.begin_shapes_rec(layer_index):
-                c.shapes(layer_index).insert(r)
-
+        if not hierarchical:
+            for layer_index in layer_indexes:
+                c._kdb_cell.shapes(layer_index).insert(
+                    self._kdb_cell.begin_shapes_rec(layer_index)
+                )
+            return c
+
+        layout = self._kdb_cell.layout()
+        layer_mapping = kdb.LayerMapping()
+        for layer_index in layer_indexes:
+            layer_mapping.map(layer_index, layer_index)
+        info = str([self.kcl.get_info(layer_index) for layer_index in layer_indexes])
+        suffix = "_E" + hashlib.md5(info.encode()).hexdigest()[:8]
+
+        called = set(self._kdb_cell.called_cells())
+        cells = [
+            ci
+            for ci in layout.each_cell_bottom_up()
+            if ci in called
+            and any(
+                not layout.cell(ci).bbox(layer_index).empty()
+                for layer_index in layer_indexes
+            )
+        ]
+        clones: dict[int, int] = {}
+        for ci in cells:
+            cell = layout.cell(ci)
+            name = f"{cell.name}{suffix}"
+            existing = layout.cell(name)
+            # only locked cells can not change after their copy was made
+            kcell = self.kcl.kcells.get(ci)
+            if existing is not None and kcell is not None and kcell._locked:
+                clones[ci] = existing.cell_index()
+                continue
+            i = 0
+            while layout.cell(name) is not None:
+                i += 1
+                name = f"{cell.name}{suffix}_{i}"
+            clone = Component(name=name)
+            _copy_layers(cell, clone._kdb_cell, layer_mapping, clones)
+            clone._locked = True
+            clones[ci] = clone.cell_index()
+
+        _copy_layers(self._kdb_cell, c._kdb_cell, layer_mapping, clones)
         return c
 
     def remove_layers(
         self,
         layers: list[LayerSpec],
         recursive: bool = True,
+        copy_on_write: bool = False,
     ) -> Component:
         """Removes a list of layers and returns the same Component.
 
         Args:
             layers: list of layers to remove.
             recursive: if True, removes layers recursively.
+            copy_on_write: if True and recursive, edits copies of the child cells
+                instead of clearing the layers in every cell of the layout.
+                Locked components are copied too and the copy is returned.
         """
         from gdsfactory import get_layer
 
+        if recursive and copy_on_write:
+            from gdsfactory.scoped_layers import remove_layers
+
+            return remove_layers(self, layers)
+
         layers = [get_layer(layer) for layer in layers]
         for layer_index in layers:
             if recursive:
@@ -844,16 +968,27 @@ class ComponentBase:
         return self
 
     def remap_layers(
-        self, layer_map: dict[LayerSpec, LayerSpec], recursive: bool = False
+        self,
+        layer_map: dict[LayerSpec, LayerSpec],
+        recursive: bool = False,
+        copy_on_write: bool = False,
     ) -> Component:
         """Remaps a list of layers and returns the same Component.
 
         Args:
             layer_map: dictionary of layers to remap.
             recursive: if True, remaps layers recursively.
+            copy_on_write: if True and recursive, edits copies of the child cells
+                instead of the cells shared with other components.
+                Locked components are copied too and the copy is returned.
         """
         from gdsfactory import get_layer
 
+        if recursive and copy_on_write:
+            from gdsfactory.scoped_layers import remap_layers
+
+            return remap_layers(self, layer_map)
+
         for layer, new_layer in layer_map.items():
             src_layer_index = get_layer(layer)
             dst_layer_index = get_layer(new_layer)
@@ -865,16 +1000,27 @@ class ComponentBase:
         return self
 
     def copy_layers(
-        self, layer_map: dict[LayerSpec, LayerSpec], recursive: bool = False
+        self,
+        layer_map: dict[LayerSpec, LayerSpec],
+        recursive: bool = False,
+        copy_on_write: bool = False,
     ) -> Component:
         """Remaps a list of layers and returns the same Component.
 
         Args:
             layer_map: dictionary of layers to remap.
             recursive: if True, remaps layers recursively.
+            copy_on_write: if True and recursive, edits copies of the child cells
+                instead of the cells shared with other components.
+                Locked components are copied too and the copy is returned.
         """
         from gdsfactory import get_layer
 
+        if recursive and copy_on_write:
+            from gdsfactory.scoped_layers import copy_layers
+
+            return copy_layers(self, layer_map)
+
         for layer, new_layer in layer_map.items():
             src_layer_index = get_layer(layer)
             dst_layer_index = get_layer(new_layer)
@@ -1028,7 +1174,8 @@ class ComponentBase:
     def over_under(self, layer: LayerSpec, distance: int = 1) -> None:
         """Flattens and performs over-under on a layer in the Component.
 
-        For big components use tiled version.
+        For big components use :func:`gdsfactory.over_under.over_under`, which
+        is tiled, multithreaded and keeps the hierarchy.
 
         Args:
             layer: layer to perform over-under on.
@@ -1043,6 +1190,18 @@ class ComponentBase:
         self.shapes(layer).clear()
         self.shapes(layer).insert(region)
 
+    def compact_instances(self, min_count: int = 2) -> CompactReport:
+        """Replaces instances on a regular lattice with instance arrays.
+
+        Raises LockedError for locked components, compact a `dup()` instead.
+
+        Args:
+            min_count: minimum number of instances to replace with an array.
+        """
+        from gdsfactory.compact_instances import compact_instances
+
+        return compact_instances(self, min_count=min_count)
+
     def to_dict(self, with_ports: bool = False) -> dict[str, Any]:
         """Returns a dictionary representation of the Component."""
         d = {
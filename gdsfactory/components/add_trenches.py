@@ -6,6 +6,8 @@ import gdsfactory as gf
 from gdsfactory.components.bbox import bbox
 from gdsfactory.components.bend_euler import bend_euler
 from gdsfactory.components.coupler import coupler
+from gdsfactory.components.ring_double import ring_double
+from gdsfactory.components.ring_single import ring_single
 from gdsfactory.typings import ComponentSpec, CrossSectionSpec, LayerSpec
 
 
@@ -62,6 +64,10 @@ def add_trenches(
 
 
 add_trenches90 = partial(add_trenches, component=bend_euler, top=0, left=0, right=None)
+bend_euler_trenches = partial(add_trenches90, component=bend_euler)
+coupler_trenches = partial(add_trenches, component=coupler)
+ring_single_trenches = partial(add_trenches, component=ring_single)
+ring_double_trenches = partial(add_trenches, component=ring_double)
 
 if __name__ == "__main__":
     c = add_trenches90()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from functools import cache
+
 import numpy as np
 
 import gdsfactory as gf
 from gdsfactory import cell
 from gdsfactory.component import Component
 from gdsfactory.components.bezier import bezier, bezier_curve
-from gdsfactory.functions import curvature
+from gdsfactory.functions import centered_diff, centered_diff2
 from gdsfactory.typings import CrossSectionSpec
 
 
@@ -58,6 +60,8 @@ def get_min_sbend_size(
         cross_section: spec.
         num_points: number of points to iterate over between max_size and 0.1 * max_size.
         kwargs: cross_section settings.
+
+    Results are cached per known size and cross-section radius.
     """
     size = list(size)
     cross_section_f = gf.get_cross_section(cross_section, **kwargs)
@@ -76,28 +80,43 @@ def get_min_sbend_size(
     if min_radius is None:
         raise ValueError("The min radius for the specified layer is not known!")
 
-    min_size = np.inf
+    return _get_min_sbend_size(ind, float(known_s), float(min_radius), num_points)
+
 
+@cache
+def _get_min_sbend_size(
+    ind: int, known_s: float, min_radius: float, num_points: int
+) -> float:
+    """Returns the minimum sbend size, evaluating all candidate sizes at once.
+
+    The bezier control points scale linearly with the size, so the curve of
+    every candidate is the unit curve scaled along one axis.
+    """
     # Guess sizes, iterate over them until we cannot achieve the min radius
     # the max size corresponds to an ellipsoid
     max_size = 2.5 * np.sqrt(np.abs(min_radius * known_s))
     sizes = np.linspace(max_size, 0.1 * max_size, num_points)
 
-    for s in sizes:
-        sz = size
-        sz[ind] = s
-        dx, dy = size
-        control_points = ((0, 0), (dx / 2, 0), (dx / 2, dy), (dx, dy))
-        npoints = 201
-        t = np.linspace(0, 1, npoints)
-        path_points = bezier_curve(t, control_points)
-        curv = curvature(path_points, t)
-        min_bend_radius = 1 / max(np.abs(curv))
-        if min_bend_radius < min_radius:
-            min_size = s
-            break
-
-    return min_size
+    npoints = 201
+    t = np.linspace(0, 1, npoints)
+    unit_points = bezier_curve(t, ((0, 0), (0.5, 0), (0.5, 1), (1, 1)))
+    dt = centered_diff(t)
+    dp = centered_diff(unit_points) / dt[:, None]
+    dp2 = centered_diff2(unit_points) / dt[:, None] ** 2
+
+    scale = np.full((num_points, 2), known_s, dtype=float)
+    scale[:, ind] = sizes
+    sx = scale[:, :1]
+    sy = scale[:, 1:]
+    dx = sx * dp[:, 0]
+    dy = sy * dp[:, 1]
+    dx2 = sx * dp2[:, 0]
+    dy2 = sy * dp2[:, 1]
+    curv = (dx * dy2 - dx2 * dy) / (dx**2 + dy**2) ** (3 / 2)
+    min_bend_radius = 1 / np.max(np.abs(curv), axis=1)
+
+    too_small = np.flatnonzero(min_bend_radius < min_radius)
+    return float(sizes[too_small[0]]) if too_small.size else np.inf
 
 
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+"""Registry of the component factories in gdsfactory.components."""
+
+from __future__ import annotations
+
+from gdsfactory import components
+from gdsfactory.get_factories import get_cells
+
+cells = get_cells(components)
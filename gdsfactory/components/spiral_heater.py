@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+from functools import cache
+
 import numpy as np
+from kfactory import kdb
+from kfactory.routing.manhattan import route_manhattan
 
 import gdsfactory as gf
 from gdsfactory.component import Component
 from gdsfactory.components.bend_euler import bend_euler
 from gdsfactory.components.bend_s import bend_s, get_min_sbend_size
+from gdsfactory.components.bezier import bezier_curve
 from gdsfactory.components.straight import straight
+from gdsfactory.cross_section import CrossSection
 from gdsfactory.routing.route_single import route_single
 from gdsfactory.typings import ComponentFactory, ComponentSpec, CrossSectionSpec, Floats
 
@@ -223,6 +229,136 @@ def spiral_racetrack_fixed_length(
     return c
 
 
+def _connect(
+    port: kdb.Trans, component: Component, port1: str = "o1", port2: str = "o2"
+) -> tuple[kdb.Trans, kdb.Trans]:
+    """Returns the instance transformation and output port of a connected component."""
+    trans = port * kdb.Trans.R180 * component.ports[port1].trans.inverted()
+    return trans, trans * component.ports[port2].trans
+
+
+class _SpiralLengthModel:
+    """Length of `spiral_racetrack_fixed_length` as a function of the straight length.
+
+    Port positions are walked through the bend templates with the same
+    transformations `connect` uses, the s-bend length comes from its bezier curve
+    and the output route from the manhattan route backbone, so evaluating the
+    model does not create any cells.
+    """
+
+    def __init__(
+        self,
+        in_out_port_spacing: float,
+        min_radius: float,
+        spacings: tuple[float, ...],
+        bend_factory: ComponentFactory,
+        bend_s_factory: ComponentFactory,
+        cross_section: CrossSection,
+        cross_section_s_bend: CrossSection,
+        n_bend_points: int = 99,
+    ) -> None:
+        """Builds the bend templates."""
+        self.in_out_port_spacing = in_out_port_spacing
+        self.dy = -min_radius * 2 + 1 * spacings[0]
+        self.bend_s_factory = bend_s_factory
+        self.cross_section_s_bend = cross_section_s_bend
+        self.n_bend_points = n_bend_points
+        self.dbu = gf.kcl.dbu
+        self.bends = [
+            bend_factory(
+                angle=180,
+                radius=min_radius + np.sum(spacings[:i]),
+                p=0,
+                cross_section=cross_section,
+                npoints=n_bend_points,
+            )
+            for i in range(len(spacings))
+        ]
+        self.bend90 = bend_factory(
+            angle=90,
+            radius=min_radius + np.sum(spacings),
+            p=0,
+            cross_section=cross_section,
+            npoints=n_bend_points,
+        )
+        self.bends_length = 2 * sum(bend.info["length"] for bend in self.bends)
+
+        route_bend = gf.get_component(
+            bend_factory,
+            cross_section=cross_section_s_bend,
+            radius=cross_section_s_bend.radius,
+        )
+        d = route_bend.ports["o2"].trans.disp - route_bend.ports["o1"].trans.disp
+        self.route_bend_radius = max(abs(d.x), abs(d.y))
+
+    def bend_s_length(self, straight_length: float) -> float:
+        """Returns the length of the inner s-bend."""
+        if self.bend_s_factory is not bend_s:
+            return self.bend_s_factory(
+                (straight_length, self.dy),
+                cross_section=self.cross_section_s_bend,
+                npoints=self.n_bend_points,
+            ).info["length"]
+        dx = straight_length
+        control_points = ((0, 0), (dx / 2, 0), (dx / 2, self.dy), (dx, self.dy))
+        t = np.linspace(0, 1, self.n_bend_points)
+        points = bezier_curve(t, control_points)
+        return float(np.round(np.sum(np.hypot(*np.diff(points, axis=0).T)), 3))
+
+    def __call__(self, straight_length: float) -> float:
+        """Returns the total spiral length for a straight length."""
+        dbu = self.dbu
+        straight_dbu = round(straight_length / dbu)
+        straight_trans = kdb.Trans(straight_dbu, 0)
+        box = kdb.Box()
+        ports = []
+        for port in (
+            kdb.Trans(kdb.Trans.R180, kdb.Vector(0, 0)),
+            kdb.Trans(kdb.Trans.R0, kdb.Vector(straight_dbu, round(self.dy / dbu))),
+        ):
+            for bend in self.bends:
+                trans, port = _connect(port, bend)
+                box += bend.bbox().transformed(trans)
+                port = port * straight_trans
+                box += port.disp.to_p()
+            ports.append(port)
+
+        o1 = ports[0]
+        trans, o2 = _connect(ports[1], self.bend90)
+        box += self.bend90.bbox().transformed(trans)
+
+        if o1.disp.x > o2.disp.x:
+            o1 = kdb.Trans.M90 * o1
+            o2 = kdb.Trans.M90 * o2
+            box = box.transformed(kdb.Trans.M90)
+        o2.mirror = False
+
+        in_wg_length = (o1.disp.x - box.left) * dbu
+        o2_temp = kdb.Trans(
+            kdb.Trans.R180,
+            kdb.Vector(
+                round((o1.disp.x * dbu + self.in_out_port_spacing) / dbu), o1.disp.y
+            ),
+        )
+        pts = route_manhattan(o2, o2_temp, self.route_bend_radius, 0, 0)
+        route_length = sum(
+            (p2 - p1).length() for p1, p2 in zip(pts[:-1], pts[1:])
+        ) - 2 * self.route_bend_radius * (len(pts) - 2)
+
+        return (
+            self.bend_s_length(straight_length)
+            + self.bends_length
+            + 2 * len(self.bends) * straight_length
+            + in_wg_length
+            + route_length * dbu
+        )
+
+
+@cache
+def _get_spiral_length_model(*args) -> _SpiralLengthModel:
+    return _SpiralLengthModel(*args)
+
+
 def _req_straight_len(
     length: float = 1000,
     in_out_port_spacing: float = 100,
@@ -235,6 +371,72 @@ def _req_straight_len(
 ) -> float:
     """Returns geometrical parameters to make a spiral of a given length.
 
+    Solves a length model of the spiral (see `_SpiralLengthModel`) for the straight
+    length with Brent's method. Only the bend templates are built, and they are
+    cached per cross-section and radius.
+
+    Args:
+        length: total length of the spiral from input to output ports in um.
+        in_out_port_spacing: spacing between input and output ports of the spiral in um.
+        min_radius: smallest radius in um.
+        spacings: spacings between adjacent waveguides.
+        bend_factory: factory to generate the bend segments.
+        bend_s_factory: factory to generate the s-bend segments.
+        cross_section: cross-section of the waveguides.
+        cross_section_s_bend: s bend cross section
+    """
+    from scipy.optimize import brentq
+
+    xs = gf.get_cross_section(cross_section)
+    xs_s_bend = gf.get_cross_section(cross_section_s_bend)
+
+    # Figure out the min straight for the spiral so that the inner
+    # s bend has min radius within the bend radius of the waveguide
+    min_straigth_length = get_min_sbend_size(
+        [None, -min_radius * 2 + 1 * spacings[0]], xs_s_bend
+    )
+
+    if min_straigth_length > 0.8 * in_out_port_spacing:
+        raise ValueError(
+            "The maximum straight length makes the inner s bend too tight. Increase the in-out port spacing."
+        )
+
+    model = _get_spiral_length_model(
+        in_out_port_spacing,
+        min_radius,
+        tuple(spacings),
+        bend_factory,
+        bend_s_factory,
+        xs,
+        xs_s_bend,
+    )
+    a, b = min_straigth_length, 0.9 * in_out_port_spacing
+    length_a, length_b = model(a), model(b)
+    if not length_a <= length <= length_b:
+        raise ValueError(
+            f"length={length} is out of the range [{length_a}, {length_b}] "
+            f"for in_out_port_spacing={in_out_port_spacing}"
+        )
+    straight_length = float(brentq(lambda x: model(x) - length, a, b, xtol=1e-4))
+
+    return straight_length
+
+
+def _req_straight_len_brute_force(
+    length: float = 1000,
+    in_out_port_spacing: float = 100,
+    min_radius: float = 5,
+    spacings: Floats = (1.0, 1.0),
+    bend_factory: ComponentFactory = bend_euler,
+    bend_s_factory: ComponentFactory = bend_s,
+    cross_section: CrossSectionSpec = "strip",
+    cross_section_s_bend: CrossSectionSpec = "strip",
+) -> float:
+    """Returns the straight length for a spiral of a given length by brute force.
+
+    Builds 100 spirals and interpolates their lengths. Slow, use it to verify
+    :func:`_req_straight_len`.
+
     Args:
         length: total length of the spiral from input to output ports in um.
         in_out_port_spacing: spacing between input and output ports of the spiral in um.
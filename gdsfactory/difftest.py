@@ -1,14 +1,17 @@
 """GDS regression test. Inspired by lytest."""
 
 import filecmp
+import json
 import pathlib
 import shutil
 
 from kfactory import KCell, KCLayout, kdb, logger
 
 import gdsfactory as gf
+from gdsfactory.cell_hash import get_tree_hashes
 from gdsfactory.component import Component
 from gdsfactory.config import CONF, PATH
+from gdsfactory.layout_format import LayoutFormat, suffixes
 from gdsfactory.name import clean_name, get_name_short
 
 
@@ -17,6 +20,126 @@ class GeometryDifference(Exception):
 
 
 PathType = pathlib.Path | str
+TreeHashes = dict[str, tuple[str, str]]
+
+
+def same_geometry(
+    ref_hashes: TreeHashes,
+    run_hashes: TreeHashes,
+    ref_top: str,
+    run_top: str,
+    ignore_cell_name_differences: bool = False,
+) -> bool:
+    """Returns True if two cell trees hash the same.
+
+    Args:
+        ref_hashes: cell name -> (hash, own hash) of the reference tree.
+        run_hashes: cell name -> (hash, own hash) of the run tree.
+        ref_top: reference top cell name.
+        run_top: run top cell name.
+        ignore_cell_name_differences: only compare the top cell hashes.
+    """
+    if ref_hashes[ref_top][0] != run_hashes[run_top][0]:
+        return False
+    if ignore_cell_name_differences:
+        return True
+    return ref_top == run_top and ref_hashes == run_hashes
+
+
+def get_changed_cells(
+    ref_hashes: TreeHashes,
+    run_hashes: TreeHashes,
+    ref_top: str,
+    run_top: str,
+    run_layout: kdb.Layout,
+) -> list[str]:
+    """Returns the topmost run cells whose own content changed.
+
+    A cell changed if it is new or its shapes or instances differ from the
+    reference cell with the same name. Changes inside a child are covered by the
+    XOR of its changed parents, so a child is only left out when every one of its
+    parents is changed or itself covered.
+
+    Args:
+        ref_hashes: cell name -> (hash, own hash) of the reference tree.
+        run_hashes: cell name -> (hash, own hash) of the run tree.
+        ref_top: reference top cell name.
+        run_top: run top cell name.
+        run_layout: layout with the run cells.
+    """
+    changed = set()
+    for name, (_, own) in run_hashes.items():
+        ref_name = ref_top if name == run_top else name
+        if ref_name not in ref_hashes or ref_hashes[ref_name][1] != own:
+            changed.add(name)
+
+    # top-down, so the parents of a cell are decided before the cell
+    covered: set[str] = set()
+    for ci in run_layout.each_cell_top_down():
+        cell = run_layout.cell(ci)
+        if cell.name not in run_hashes or cell.name == run_top:
+            continue
+        parents = [
+            run_layout.cell(p).name
+            for p in cell.each_parent_cell()
+            if run_layout.cell(p).name in run_hashes
+        ]
+        if parents and all(p in changed or p in covered for p in parents):
+            covered.add(cell.name)
+    return sorted(changed - covered)
+
+
+def _xor_region(
+    ref_cell: kdb.Cell | None,
+    ref_layer: int | None,
+    run_cell: kdb.Cell | None,
+    run_layer: int | None,
+    tile_size: float | None = None,
+    threads: int | None = None,
+) -> kdb.Region:
+    """Returns the XOR of one layer of two cell trees."""
+    ref_iter = (
+        ref_cell.begin_shapes_rec(ref_layer)
+        if ref_cell is not None and ref_layer is not None
+        else None
+    )
+    run_iter = (
+        run_cell.begin_shapes_rec(run_layer)
+        if run_cell is not None and run_layer is not None
+        else None
+    )
+    if tile_size is None or ref_iter is None or run_iter is None:
+        region_ref = kdb.Region(ref_iter) if ref_iter is not None else kdb.Region()
+        region_run = kdb.Region(run_iter) if run_iter is not None else kdb.Region()
+        return region_ref ^ region_run
+
+    region_xor = kdb.Region()
+    tp = kdb.TilingProcessor()
+    tp.input("a", ref_iter)
+    tp.input("b", run_iter)
+    tp.output("o", region_xor)
+    tp.dbu = ref_cell.layout().dbu
+    tp.tile_size(tile_size, tile_size)
+    if threads is not None:
+        tp.threads = threads
+    tp.queue("_output(o, a ^ b)")
+    tp.execute("XOR")
+    region_xor.merge()
+    return region_xor
+
+
+def _occurrences(top: kdb.Cell, cell: kdb.Cell) -> list[kdb.ICplxTrans]:
+    """Returns the transformations of every occurrence of cell inside top."""
+    if cell.cell_index() == top.cell_index():
+        return [kdb.ICplxTrans()]
+    it = top.begin_instances_rec()
+    it.targets = [cell.cell_index()]
+    transformations = []
+    while not it.at_end():
+        if it.inst_cell().cell_index() == cell.cell_index():
+            transformations.append(it.trans() * it.inst_trans())
+        it.next()
+    return transformations
 
 
 def diff(
@@ -28,6 +151,8 @@ def diff(
     ignore_cell_name_differences: bool | None = None,
     ignore_label_differences: bool | None = None,
     show: bool = False,
+    tile_size: float | None = None,
+    threads: int | None = None,
 ) -> bool:
     """Returns True if files are different, prints differences and shows them in klayout.
 
@@ -40,6 +165,13 @@ def diff(
         ignore_cell_name_differences: if True, ignores any cell name differences. If None (default), defers to the value set in CONF.difftest_ignore_cell_name_differences
         ignore_label_differences: if True, ignores any label differences when run in XOR mode. If None (default) defers to the value set in CONF.difftest_ignore_label_differences
         show: shows diff in klayout.
+        tile_size: runs the XOR in tiles of this size (um) using a TilingProcessor.
+            None runs it in one go.
+        threads: number of threads for the tiled XOR.
+
+    The cell trees are hashed first (see :mod:`gdsfactory.cell_hash`). Files with the
+    same geometry return early, and the XOR only runs on the topmost cells whose
+    content changed.
     """
     ref = read_top_cell(ref_file)
     run = read_top_cell(run_file)
@@ -58,6 +190,17 @@ def diff(
             f"dbu is different in ref {ref.kcl.dbu} {ref_file!r} and run {run.kcl.dbu} {run_file!r} files"
         )
 
+    ref_hashes = get_tree_hashes(ref._kdb_cell)
+    run_hashes = get_tree_hashes(run._kdb_cell)
+    if same_geometry(
+        ref_hashes,
+        run_hashes,
+        ref.name,
+        run.name,
+        ignore_cell_name_differences=ignore_cell_name_differences,
+    ):
+        return False
+
     equivalent = True
     ld = kdb.LayoutDiff()
 
@@ -152,22 +295,46 @@ def diff(
             # assume equivalence until we find XOR differences, determined significant by the settings
             diff = KCell(f"{test_name}_xor")
 
+            changed_cells = get_changed_cells(
+                ref_hashes, run_hashes, ref.name, run.name, run.kcl.layout
+            )
+            logger.info(f"Changed cells: {', '.join(changed_cells)}")
+            xor_cells: dict[str, KCell] = {}
+
             for layer in c.kcl.layer_infos():
+                in_run = layer in run.kcl.layer_infos()
+                in_ref = layer in ref.kcl.layer_infos()
+                if not in_run and not in_ref:
+                    continue
+                layer_id = c.kcl.layer(layer)
+                layer_run = run.kcl.layer(layer) if in_run else None
+                layer_ref = ref.kcl.layer(layer) if in_ref else None
+                is_different = False
+                is_sliver = True
+
+                for name in changed_cells:
+                    run_cell = run.kcl.layout.cell(name)
+                    ref_name = ref.name if name == run.name else name
+                    ref_cell = ref.kcl.layout.cell(ref_name)
+                    region_xor = _xor_region(
+                        ref_cell,
+                        layer_ref,
+                        run_cell,
+                        layer_run,
+                        tile_size=tile_size,
+                        threads=threads,
+                    )
+                    if region_xor.is_empty():
+                        continue
+                    is_different = True
+                    is_sliver = is_sliver and region_xor.sized(-1).is_empty()
+                    if name not in xor_cells:
+                        xor_cells[name] = KCell(f"{test_name}_xor_{name}")
+                    xor_cells[name].shapes(layer_id).insert(region_xor)
+
                 # exists in both
-                if layer in run.kcl.layer_infos() and layer in ref.kcl.layer_infos():
-                    layer_ref = ref.layer(layer)
-                    layer_run = run.layer(layer)
-
-                    region_run = kdb.Region(run.begin_shapes_rec(layer_run))
-                    region_ref = kdb.Region(ref.begin_shapes_rec(layer_ref))
-                    region_diff = region_run ^ region_ref
-
-                    if not region_diff.is_empty():
-                        layer_id = c.layer(layer)
-                        region_xor = region_ref ^ region_run
-                        diff.shapes(layer_id).insert(region_xor)
-                        xor_w_tolerance = region_xor.sized(-1)
-                        is_sliver = xor_w_tolerance.is_empty()
+                if in_run and in_ref:
+                    if is_different:
                         message = f"{test_name}: XOR difference on layer {layer}"
                         if is_sliver:
                             message += " (sliver)"
@@ -177,21 +344,20 @@ def diff(
                             equivalent = False
                         print(message)
                 # only in run
-                elif layer in run.kcl.layer_infos():
-                    layer_id = run.layer(layer)
-                    region = kdb.Region(run.begin_shapes_rec(layer_id))
-                    diff.shapes(c.kcl.layer(layer)).insert(region)
+                elif in_run:
                     print(f"{test_name}: layer {layer} only exists in updated cell")
                     equivalent = False
-
                 # only in ref
-                elif layer in ref.kcl.layer_infos():
-                    layer_id = ref.layer(layer)
-                    region = kdb.Region(ref.begin_shapes_rec(layer_id))
-                    diff.shapes(c.kcl.layer(layer)).insert(region)
+                else:
                     print(f"{test_name}: layer {layer} missing from updated cell")
                     equivalent = False
 
+            for name, xor_cell in xor_cells.items():
+                for trans in _occurrences(run._kdb_cell, run.kcl.layout.cell(name)):
+                    diff._kdb_cell.insert(
+                        kdb.CellInstArray(xor_cell.cell_index(), trans)
+                    )
+
             _ = c << diff
             if equivalent:
                 print("No significant XOR differences between layouts!")
@@ -205,6 +371,40 @@ def diff(
     return False
 
 
+def get_ref_hashes(ref_file: pathlib.Path) -> tuple[str, TreeHashes]:
+    """Returns the top cell name and cell hashes of a reference GDS.
+
+    The hashes are cached next to the reference in a `.hashes.json` file and
+    recomputed when the reference file changes.
+
+    Args:
+        ref_file: reference GDS file.
+    """
+    hashes_file = ref_file.with_suffix(".hashes.json")
+    stat = ref_file.stat()
+    if hashes_file.exists():
+        data = json.loads(hashes_file.read_text())
+        if (
+            data.get("size") == stat.st_size
+            and data.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return data["top"], {k: tuple(v) for k, v in data["cells"].items()}
+
+    ref = read_top_cell(ref_file)
+    hashes = get_tree_hashes(ref._kdb_cell)
+    data = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "top": ref.name,
+        "cells": hashes,
+    }
+    try:
+        hashes_file.write_text(json.dumps(data, indent=0))
+    except OSError:
+        logger.warning(f"Could not write {str(hashes_file)!r}")
+    return ref.name, hashes
+
+
 def difftest(
     component: gf.Component,
     test_name: str | None = None,
@@ -212,6 +412,7 @@ def difftest(
     xor: bool = True,
     dirpath_run: pathlib.Path = PATH.gds_run,
     ignore_sliver_differences: bool | None = None,
+    format: LayoutFormat = "gds",
 ) -> None:
     """Avoids GDS regressions tests on the GeometryDifference.
 
@@ -219,6 +420,10 @@ def difftest(
     between new component and the GDS reference stored in dirpath and
     raises GeometryDifference if there are differences and show differences in KLayout.
 
+    The component is first compared to the reference by geometry hash
+    (see :func:`get_ref_hashes`), so byte differences that do not change the
+    geometry, such as metadata, pass without running the XOR.
+
     If it runs for the fist time it just stores the GDS reference.
 
     Args:
@@ -229,6 +434,7 @@ def difftest(
         dirpath_run: directory to store gds file generated by the test.
         ignore_sliver_differences: if True, ignores any sliver differences in the XOR result.
             If None (default), defers to the value set in CONF.difftest_ignore_sliver_differences
+        format: file format of the reference and run files: gds, gds.gz or oas.
     """
     test_name = test_name or (
         f"{component.function_name}_{component.name}"
@@ -243,8 +449,8 @@ def difftest(
 
     filename = get_name_short(clean_name(test_name), max_cellname_length=32)
 
-    ref_file = dirpath_ref / f"{filename}.gds"
-    run_file = dirpath_run / f"{filename}.gds"
+    ref_file = dirpath_ref / f"{filename}{suffixes[format]}"
+    run_file = dirpath_run / f"{filename}{suffixes[format]}"
 
     component = gf.get_component(component)
     run_file = component.write_gds(gdspath=run_file)
@@ -255,6 +461,17 @@ def difftest(
             f"Reference GDS file for {test_name!r} not found. Writing to {ref_file!r}"
         )
 
+    ref_top, ref_hashes = get_ref_hashes(ref_file)
+    run_hashes = get_tree_hashes(component._kdb_cell)
+    if same_geometry(
+        ref_hashes,
+        run_hashes,
+        ref_top,
+        component.name,
+        ignore_cell_name_differences=CONF.difftest_ignore_cell_name_differences,
+    ):
+        return
+
     if filecmp.cmp(ref_file, run_file, shallow=False):
         return
 
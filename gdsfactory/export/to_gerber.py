@@ -7,12 +7,17 @@ See Also:
 - https://github.com/jamesbowman/cuflow/blob/master/gerber.py
 """
 
+from __future__ import annotations
+
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Literal
+from typing import IO, Literal
 
-from pydantic import BaseModel, Field
+import numpy as np
+from kfactory import kdb
+from pydantic import BaseModel
 
-from gdsfactory import Component
+from gdsfactory.component import Component
 
 
 class GerberLayer(BaseModel):
@@ -35,39 +40,64 @@ class BoardOptions(BaseModel):
 
 
 resolutions = {1e-3: 3, 1e-4: 4, 1e-5: 5, 1e-6: 6}
+_units_per_um = {"mm": 1e-3, "in": 1 / 25400}
+_chunk_points = 100_000
 
 
-def number(n) -> str:
-    i = int(round(n * 10000))
-    return "%07d" % i
-
-
-def points(pp: list):
-    out = ""
-    d = "D02"
-    for x, y in pp:
-        out += f"X{number(x)}Y{number(y)}{d}*\n"
-        d = "D01"
-    return out
+def iter_polygons(component: Component, layer: tuple[int, int]) -> Iterator[np.ndarray]:
+    """Yields the merged polygons of a layer as (N, 2) integer arrays in dbu.
 
+    Holes are joined to the hull with cut-ins, which the Gerber spec allows in
+    regions, so each polygon is a single closed contour.
 
-def rect(x0, y0, x1, y1):
-    return "D10*\n" + points([(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)])
+    Args:
+        component: to export.
+        layer: GDS layer.
+    """
+    from gdsfactory.pdk import get_layer
 
+    region = kdb.Region(component.begin_shapes_rec(get_layer(layer)))
+    for polygon in region.merged().each():
+        if polygon.holes():
+            polygon = polygon.resolved_holes()
+        hull = [(p.x, p.y) for p in polygon.each_point_hull()]
+        yield np.array(hull + hull[:1], dtype=np.int64)
 
-def linestring(pp):
-    return "D10*\n" + points(pp)
 
+def write_regions(f: IO[str], polygons: Iterator[np.ndarray], scale: float) -> None:
+    """Writes polygons as G36/G37 regions, formatting coordinates in bulk.
 
-def polygon(pp):
-    return "G36*\n" + points(pp) + "G37*\n" + "\n"
+    Args:
+        f: file to write to.
+        polygons: closed contours in dbu.
+        scale: Gerber integer units per dbu.
+    """
+    chunk: list[np.ndarray] = []
+    size = 0
+    for points in polygons:
+        chunk.append(points)
+        size += len(points)
+        if size >= _chunk_points:
+            _write_chunk(f, chunk, scale)
+            chunk, size = [], 0
+    if chunk:
+        _write_chunk(f, chunk, scale)
+
+
+def _write_chunk(f: IO[str], chunk: list[np.ndarray], scale: float) -> None:
+    xy = np.rint(np.concatenate(chunk) * scale).astype(np.int64)
+    template = "".join(
+        "G36*\nX%dY%dD02*\n" + "X%dY%dD01*\n" * (len(points) - 1) + "G37*\n"
+        for points in chunk
+    )
+    f.write(template % tuple(xy.ravel().tolist()))
 
 
 def to_gerber(
     component: Component,
     dirpath: Path,
     layermap_to_gerber_layer: dict[tuple[int, int], GerberLayer],
-    options: GerberOptions = Field(default_factory=dict),
+    options: GerberOptions | None = None,
 ) -> None:
     """Writes each layer to a different Gerber file.
 
@@ -81,47 +111,37 @@ def to_gerber(
             resolution: float = 1e-6
             int_size: int = 4
     """
-    # Split references into polygons and circles (components will need to be recursively iterated through)
-    # for ref in component.references:
-    #     if ref.parent_cell.name.startswith("circle"):
-    #         radius = ref.parent_cell.settings["radius"]
-    #         center = ref.center
-    # Each layer and a list of the polygons (as lists of points) on that layer
-    layer_to_polygons = component.get_polygons_points()
+    options = options or GerberOptions()
+    dirpath = Path(dirpath)
+    digits = resolutions[options.resolution]
+    scale = component.kcl.dbu * _units_per_um[options.mode] * 10**digits
+    header = options.header or [
+        "Gerber file generated by gdsfactory",
+        f"Component: {component.name}",
+    ]
 
     for layer_tup, layer in layermap_to_gerber_layer.items():
         filename = (dirpath / layer.name.replace(" ", "_")).with_suffix(".gbr")
 
-        with open(filename, "w+") as f:
-            header = options.header or [
-                "Gerber file generated by gdsfactory",
-                f"Component: {component.name}",
-            ]
-
+        with open(filename, "w") as f:
             # Write file spec info
             f.write("%TF.FileFunction," + ",".join(layer.function) + "*%\n")
             f.write(f"%TF.FilePolarity,{layer.polarity}*%\n")
-
-            digits = resolutions[options.resolution]
-            f.write(f"%FSLA{options.int_size}{digits}Y{options.int_size}{digits}X*%\n")
+            f.write(f"%FSLAX{options.int_size}{digits}Y{options.int_size}{digits}*%\n")
 
             # Write header comments
             f.writelines([f"G04 {line}*\n" for line in header])
 
             # Setup units/mode
-            units = options.mode.upper()
-            f.write(f"%MO{units}*%\n")
-            f.write("%LPD*%")
-
+            f.write(f"%MO{options.mode.upper()}*%\n")
+            f.write("%LPD*%\n")
             f.write("G01*\n")
 
             # Aperture definition
             f.write("%ADD10C,0.050000*%\n")
 
             # Only supports polygons for now
-            if layer_tup in layer_to_polygons.keys():
-                for poly in layer_to_polygons[layer_tup.layer]:
-                    f.write(polygon(poly))
+            write_regions(f, iter_polygons(component, layer_tup), scale)
 
             # File end
             f.write("M02*\n")
@@ -0,0 +1,7 @@
+from gdsfactory.fill.fill_density import FillReport, fill_density, fill_square
+
+__all__ = [
+    "FillReport",
+    "fill_density",
+    "fill_square",
+]
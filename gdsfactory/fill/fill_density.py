@@ -0,0 +1,190 @@
+"""Density driven dummy fill.
+
+Measures the density of the target layers per tile, finds the free area of the
+tiles below the minimum density, away from the existing shapes and exclusion
+layers, and fills it with arrays of a fill cell.
+
+.. code::
+
+    import gdsfactory as gf
+
+    c = gf.Component()
+    c << gf.components.mzi()
+    report = gf.fill.fill_density(c, layers=("WG",), density_min=0.3, tile_size=20)
+    print(report)
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from kfactory import kdb
+from kfactory.kcell import LockedError
+
+from gdsfactory.area_report import AreaReport, area_report
+from gdsfactory.cell import cell
+from gdsfactory.component import Component
+from gdsfactory.typings import ComponentSpec, LayerSpecs
+
+
+@cell
+def fill_square(size: float = 1.0, layers: LayerSpecs = ("WG",)) -> Component:
+    """Returns a square with its bottom left corner at the origin on each layer.
+
+    Args:
+        size: edge in um.
+        layers: layers to draw the square on.
+    """
+    c = Component()
+    for layer in layers:
+        c.add_polygon([(0, 0), (size, 0), (size, size), (0, size)], layer=layer)
+    return c
+
+
+@dataclass
+class FillReport:
+    """Result of :func:`fill_density`.
+
+    Attributes:
+        before: area and density per tile before the fill.
+        after: area and density per tile after the fill.
+        tiles: number of tiles below the minimum density.
+        instances: number of fill cells placed.
+        fill: cell with the fill instances, None if nothing was filled.
+    """
+
+    before: AreaReport
+    after: AreaReport
+    tiles: int = 0
+    instances: int = 0
+    fill: Component | None = None
+
+    def __str__(self) -> str:
+        """Returns a table with the density range per layer before and after."""
+        lines = [
+            f"{self.instances} fill cells in {self.tiles} tiles",
+            f"{'layer':<10} {'before':>15} {'after':>15}",
+        ]
+        for layer, before in self.before.density.items():
+            after = self.after.density[layer]
+            lines.append(
+                f"{str(layer):<10} {before.min():>6.3f}-{before.max():<8.3f}"
+                f" {after.min():>6.3f}-{after.max():<8.3f}"
+            )
+        return "\n".join(lines)
+
+
+def fill_density(
+    component: Component,
+    layers: LayerSpecs,
+    density_min: float,
+    tile_size: float = 100.0,
+    exclude_layers: LayerSpecs = (),
+    keep_out: float = 1.0,
+    fill_cell: ComponentSpec | None = None,
+    spacing: float = 1.0,
+    threads: int | None = None,
+) -> FillReport:
+    """Fills the tiles where a target layer is below the minimum density.
+
+    The fill goes into a new cell `{component.name}_fill` instanced in component,
+    with a `_1`, `_2`, ... suffix if the component was filled before. Fill cells
+    are placed on a grid aligned to the tile grid, so the fill of neighbouring
+    tiles lines up, as `kdb.CellInstArray` arrays.
+
+    density_min is a trigger, not a target: every free area of a tile below it is
+    filled, so the density of that tile can end up well above density_min. The
+    density the fill itself adds is set by the fill cell and spacing, about
+    `size**2 / (size + spacing)**2` for the default square. Check `after` in the
+    report.
+
+    Cached components are locked and can not be filled. Fill a copy, for
+    example `gf.components.mzi().dup()`, or a component that instances it.
+
+    Args:
+        component: to fill.
+        layers: layers to measure the density of.
+        density_min: minimum area fraction of each target layer per tile.
+        tile_size: density window edge in um.
+        exclude_layers: layers to keep the fill away from, besides the target layers.
+        keep_out: distance in um between the fill and existing shapes.
+        fill_cell: cell to place. Defaults to a 1 um square on the target layers.
+        spacing: spacing in um between fill cells.
+        threads: number of threads. Defaults to the number of CPUs.
+    """
+    from gdsfactory.pdk import get_component, get_layer
+
+    if component._locked:
+        raise LockedError(component)
+
+    before = area_report(component, layers=layers, tile_size=tile_size, threads=threads)
+    under = np.logical_or.reduce(
+        [density < density_min for density in before.density.values()]
+    )
+    if not under.any():
+        return FillReport(before=before, after=before)
+
+    kcl = component.kcl
+    dbu = kcl.dbu
+    cell = component._kdb_cell
+    fill_cell = get_component(fill_cell or fill_square(layers=tuple(layers)))
+
+    size = round(tile_size / dbu)
+    x0, y0 = (round(v / dbu) for v in before.origin)
+    tiles = kdb.Region()
+    for iy, ix in zip(*np.nonzero(under)):
+        left = x0 + int(ix) * size
+        bottom = y0 + int(iy) * size
+        tiles.insert(kdb.Box(left, bottom, left + size, bottom + size))
+    # the last row and column of tiles can extend beyond the component
+    tiles = tiles.merged() & kdb.Region(cell.bbox())
+
+    # free area of the tiles below target, computed tile by tile
+    blocking = [get_layer(layer) for layer in [*layers, *exclude_layers]]
+    free = kdb.Region()
+    tp = kdb.TilingProcessor()
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.tile_origin(*before.origin)
+    tp.tiles(*under.shape[::-1])
+    tp.tile_border(keep_out, keep_out)
+    tp.threads = threads or os.cpu_count() or 1
+    tp.input("tiles", tiles)
+    for i, layer_index in enumerate(blocking):
+        tp.input(f"b{i}", cell.begin_shapes_rec(layer_index))
+    tp.output("o", free)
+    blocked = " + ".join(f"b{i}" for i in range(len(blocking)))
+    tp.queue(f"_output(o, tiles - ({blocked}).sized({round(keep_out / dbu)}))")
+    tp.execute(f"fill {component.name}")
+    free.merge()
+
+    name = f"{component.name}_fill"
+    n = 0
+    while kcl.layout.cell(name if n == 0 else f"{name}_{n}") is not None:
+        n += 1
+    fill = Component(name if n == 0 else f"{name}_{n}")
+    fill_bbox = fill_cell._kdb_cell.bbox()
+    half = round(spacing / dbu / 2)
+    fill._kdb_cell.fill_region(
+        free,
+        fill_cell.cell_index(),
+        fill_bbox.enlarged(half, half),
+        kdb.Point(x0, y0),
+    )
+    fill._locked = True
+    instances = sum(
+        inst.na * inst.nb if inst.is_regular_array() else 1
+        for inst in fill._kdb_cell.each_inst()
+    )
+    component.create_inst(fill)
+
+    after = area_report(component, layers=layers, tile_size=tile_size, threads=threads)
+    return FillReport(
+        before=before,
+        after=after,
+        tiles=int(under.sum()),
+        instances=instances,
+        fill=fill,
+    )
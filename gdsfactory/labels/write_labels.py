@@ -10,6 +10,7 @@ from pathlib import Path
 import klayout.db as pya
 
 from gdsfactory import logger
+from gdsfactory.read.import_gds import get_load_layout_options
 from gdsfactory.typings import PathType
 
 
@@ -31,10 +32,10 @@ def find_labels(
         y: y position (um).
         angle: in degrees.
     """
-    # Load the layout
+    # Load the layout, skipping all shapes that are not on the label layer
     gdspath = str(gdspath)
     layout = pya.Layout()
-    layout.read(gdspath)
+    layout.read(gdspath, get_load_layout_options(layers=[layer_label]))
 
     # Get the top cell and the units, and find out the index of the layer
     topcell = layout.top_cell()
@@ -73,12 +74,15 @@ def write_labels(
         prefix: filter labels with this prefix.
 
     """
-    labels = list(find_labels(gdspath, layer_label=layer_label, prefix=prefix))
+    labels = find_labels(gdspath, layer_label=layer_label, prefix=prefix)
     gdspath = pathlib.Path(gdspath)
     filepath = Path(filepath or gdspath.with_suffix(".csv"))
 
+    n = 0
     with open(filepath, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerows(labels)
-    logger.info(f"Wrote {len(labels)} labels to CSV {filepath.absolute()}")
+        for label in labels:
+            writer.writerow(label)
+            n += 1
+    logger.info(f"Wrote {n} labels to CSV {filepath.absolute()}")
     return filepath
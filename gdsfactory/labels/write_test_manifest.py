@@ -2,12 +2,28 @@
 
 import csv
 import json
+import math
 import pathlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
 
 import gdsfactory as gf
 from gdsfactory.samples.sample_reticle import sample_reticle
 from gdsfactory.typings import Iterable
 
+manifest_columns = (
+    "cell",
+    "x",
+    "y",
+    "info",
+    "ports",
+    "analysis",
+    "analysis_parameters",
+)
+
 
 def write_test_manifest(
     component: gf.Component,
@@ -70,6 +86,249 @@ def write_test_manifest(
             )
 
 
+@dataclass
+class _CellManifest:
+    """Per cell data, serialized once and reused for every instance of the cell."""
+
+    name: str
+    info: str
+    port_heads: list[str]
+    port_mids: list[str]
+    port_tails: list[str]
+    port_x: np.ndarray
+    port_y: np.ndarray
+    port_orientation: np.ndarray
+
+
+def _get_cell_manifest(cell: gf.Component) -> _CellManifest:
+    port_heads, port_mids, port_tails = [], [], []
+    port_x, port_y, port_orientation = [], [], []
+    for p in cell.ports:
+        d = gf.port.to_dict(p)
+        name = json.dumps(d["name"])
+        port_heads.append(f'{name}: {{"name": {name}, "center": [')
+        port_mids.append(f'], "width": {json.dumps(d["width"])}, "orientation": ')
+        port_tails.append(
+            f', "layer": {json.dumps(d["layer"])}, '
+            f'"port_type": {json.dumps(d["port_type"])}}}'
+        )
+        port_x.append(d["center"][0])
+        port_y.append(d["center"][1])
+        port_orientation.append(d["orientation"])
+    return _CellManifest(
+        name=cell.name,
+        info=json.dumps(cell.info.model_dump()),
+        port_heads=port_heads,
+        port_mids=port_mids,
+        port_tails=port_tails,
+        port_x=np.array(port_x, dtype=float),
+        port_y=np.array(port_y, dtype=float),
+        port_orientation=np.array(port_orientation, dtype=float),
+    )
+
+
+def _ports_json(
+    m: _CellManifest,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    angle: np.ndarray,
+    mirror: np.ndarray,
+    mag: np.ndarray,
+    decimals: int,
+) -> list[str]:
+    """Returns the ports JSON of a cell for many instance transformations at once."""
+    if not m.port_heads:
+        return ["{}"] * len(dx)
+
+    # columns: ports, rows: instances
+    a = np.deg2rad(angle)[:, None]
+    sign = np.where(mirror, -1.0, 1.0)[:, None]
+    px = m.port_x[None, :] * mag[:, None]
+    py = m.port_y[None, :] * mag[:, None] * sign
+    x = np.round(dx[:, None] + px * np.cos(a) - py * np.sin(a), decimals)
+    y = np.round(dy[:, None] + px * np.sin(a) + py * np.cos(a), decimals)
+    orientation = np.mod(angle[:, None] + sign * m.port_orientation[None, :], 360)
+
+    parts = list(zip(m.port_heads, m.port_mids, m.port_tails))
+    rows = []
+    for xs, ys, os in zip(x.tolist(), y.tolist(), orientation.tolist()):
+        ports = ", ".join(
+            f"{head}{xi!r}, {yi!r}{mid}{oi!r}{tail}"
+            for (head, mid, tail), xi, yi, oi in zip(parts, xs, ys, os)
+        )
+        rows.append(f"{{{ports}}}")
+    return rows
+
+
+def iter_test_manifest(
+    component: gf.Component,
+    search_strings: Iterable[str] | None = None,
+    analysis: str = "[power_envelope]",
+    analysis_parameters: str = '[{"n": 10, "wvl_of_interest_nm": 1550}]',
+    batch_size: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Yields the test manifest as DataFrames of up to `batch_size` rows.
+
+    Same columns as :func:`write_test_manifest`. The info and ports of each cell are
+    serialized once, and the port coordinates of all instances of a cell in a batch
+    are transformed together with NumPy. Port coordinates are rounded to the
+    database unit.
+
+    Args:
+        component: the component to write the test manifest for.
+        search_strings: the search_strings of the cells to include in the test manifest.
+            If None, all cells one level below top cell are included.
+        analysis: list of analysis to run on the cells.
+        analysis_parameters: list of parameters to use for the analysis.
+        batch_size: maximum number of rows per DataFrame.
+    """
+    search_strings = list(search_strings or [])
+    c = component
+
+    if not search_strings:
+        for cell_index in c.each_child_cell():
+            search_strings.append(c.kcl[cell_index].name)
+
+    decimals = max(0, round(-math.log10(c.kcl.dbu)))
+    cells: dict[int, _CellManifest] = {}
+
+    it = c._kdb_cell.begin_instances_rec()
+    it.targets = "{" + ",".join(search_strings) + "}"
+
+    batch: list[tuple[int, int, int, float, float, float, bool, float]] = []
+    for _it in it.each():
+        cell_index = _it.inst_cell().cell_index()
+        disp = (_it.trans() * _it.inst_trans()).disp
+        dtrans = _it.dtrans() * _it.inst_dtrans()
+        batch.append(
+            (
+                cell_index,
+                disp.x,
+                disp.y,
+                dtrans.disp.x,
+                dtrans.disp.y,
+                dtrans.angle,
+                dtrans.is_mirror(),
+                dtrans.mag,
+            )
+        )
+        if cell_index not in cells:
+            cells[cell_index] = _get_cell_manifest(c.kcl[cell_index])
+        if len(batch) == batch_size:
+            yield _manifest_batch(batch, cells, analysis, analysis_parameters, decimals)
+            batch = []
+    if batch:
+        yield _manifest_batch(batch, cells, analysis, analysis_parameters, decimals)
+
+
+def _manifest_batch(
+    batch: list[tuple],
+    cells: dict[int, _CellManifest],
+    analysis: str,
+    analysis_parameters: str,
+    decimals: int,
+) -> pd.DataFrame:
+    cell_index, x, y, dx, dy, angle, mirror, mag = (np.array(v) for v in zip(*batch))
+    ports = np.empty(len(batch), dtype=object)
+    names = np.empty(len(batch), dtype=object)
+    infos = np.empty(len(batch), dtype=object)
+
+    for ci in np.unique(cell_index):
+        m = cells[int(ci)]
+        idx = np.flatnonzero(cell_index == ci)
+        names[idx] = m.name
+        infos[idx] = m.info
+        ports[idx] = _ports_json(
+            m, dx[idx], dy[idx], angle[idx], mirror[idx], mag[idx], decimals
+        )
+
+    return pd.DataFrame(
+        {
+            "cell": names,
+            "x": x,
+            "y": y,
+            "info": infos,
+            "ports": ports,
+            "analysis": analysis,
+            "analysis_parameters": analysis_parameters,
+        },
+        columns=manifest_columns,
+    )
+
+
+def write_test_manifest_batches(
+    component: gf.Component,
+    filepath: str | pathlib.Path,
+    search_strings: Iterable[str] | None = None,
+    analysis: str = "[power_envelope]",
+    analysis_parameters: str = '[{"n": 10, "wvl_of_interest_nm": 1550}]',
+    batch_size: int = 100_000,
+) -> int:
+    """Writes the test manifest in batches to a CSV or Parquet file.
+
+    Uses :func:`iter_test_manifest`, so only one batch is in memory at a time.
+    Parquet output requires `pyarrow`.
+
+    Args:
+        component: the component to write the test manifest for.
+        filepath: .csv or .parquet file to write.
+        search_strings: the search_strings of the cells to include in the test manifest.
+            If None, all cells one level below top cell are included.
+        analysis: list of analysis to run on the cells.
+        analysis_parameters: list of parameters to use for the analysis.
+        batch_size: number of rows written at a time.
+
+    Returns:
+        number of rows written.
+    """
+    filepath = pathlib.Path(filepath)
+    batches = iter_test_manifest(
+        component,
+        search_strings=search_strings,
+        analysis=analysis,
+        analysis_parameters=analysis_parameters,
+        batch_size=batch_size,
+    )
+    n = 0
+
+    if filepath.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Writing parquet requires pyarrow. Run `pip install pyarrow`."
+            ) from e
+
+        schema = pa.schema(
+            [
+                ("cell", pa.string()),
+                ("x", pa.int64()),
+                ("y", pa.int64()),
+                ("info", pa.string()),
+                ("ports", pa.string()),
+                ("analysis", pa.string()),
+                ("analysis_parameters", pa.string()),
+            ]
+        )
+        with pq.ParquetWriter(filepath, schema) as writer:
+            for df in batches:
+                writer.write_table(
+                    pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                )
+                n += len(df)
+            if n == 0:
+                writer.write_table(schema.empty_table())
+        return n
+
+    with open(filepath, "w", newline="") as f:
+        f.write(",".join(manifest_columns) + "\n")
+        for df in batches:
+            df.to_csv(f, header=False, index=False)
+            n += len(df)
+    return n
+
+
 if __name__ == "__main__":
     import pandas as pd
 
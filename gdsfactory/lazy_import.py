@@ -0,0 +1,55 @@
+"""Import package attributes on first access.
+
+Importing every submodule and component factory up front makes `import gdsfactory`
+slow. A LazyModule package lists its attributes as `name: (module, attribute)` in
+`_lazy_imports` and imports them when they are first accessed.
+
+.. code::
+
+    _lazy_imports = {"straight": ("gdsfactory.components.straight", "straight")}
+    sys.modules[__name__].__class__ = LazyModule
+"""
+
+from __future__ import annotations
+
+import importlib
+import types
+from typing import Any
+
+LazyImports = dict[str, tuple[str, str | None]]
+
+
+class LazyModule(types.ModuleType):
+    """Module that imports the attributes in `_lazy_imports` on first access."""
+
+    def _lazy(self) -> LazyImports:
+        return self.__dict__.get("_lazy_imports", {})
+
+    def __getattr__(self, name: str) -> Any:
+        """Imports and caches a lazy attribute."""
+        lazy = self._lazy()
+        if name not in lazy:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        module_name, attribute = lazy[name]
+        module = importlib.import_module(module_name)
+        value = module if attribute is None else getattr(module, attribute)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Keeps lazy attributes that share their name with a submodule.
+
+        Importing a submodule binds it on its package, which would replace a
+        function with the module of the same name (e.g. `straight`).
+        """
+        lazy = self._lazy()
+        if isinstance(value, types.ModuleType) and lazy.get(name, (None, None))[1]:
+            module_name, attribute = lazy[name]
+            if value.__name__ != module_name:
+                return
+            value = getattr(value, attribute)
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> list[str]:
+        """Returns loaded and lazy attributes."""
+        return sorted(set(super().__dir__()) | set(self._lazy()))
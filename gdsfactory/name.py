@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import re
 from typing import Any
@@ -96,6 +97,45 @@ def print_first_letters_warning(**kwargs) -> None:
         )
 
 
+_replace_map = {
+    " ": "_",
+    "!": "",
+    "?": "",
+    "#": "_",
+    "%": "_",
+    "(": "",
+    ")": "",
+    "*": "_",
+    ",": "_",
+    "-": "m",
+    ".": "p",
+    "/": "_",
+    ":": "_",
+    "=": "",
+    "@": "_",
+    "[": "",
+    "]": "",
+    "{": "",
+    "}": "",
+    "$": "",
+}
+
+
+@functools.lru_cache(maxsize=2**16)
+def _clean_name(
+    name: str, remove_dots: bool, allowed_characters: tuple[str, ...]
+) -> str:
+    # Default allowed characters, including underscore
+    allowed = r"a-zA-Z0-9_" + "".join(re.escape(char) for char in allowed_characters)
+    replace_map = dict(_replace_map, **{".": ""}) if remove_dots else _replace_map
+
+    # Replace characters using the replace_map
+    def replace_match(match):
+        return replace_map.get(match.group(0), "")
+
+    return re.sub(f"[^{allowed}]", replace_match, name)
+
+
 def clean_name(
     name: str,
     remove_dots: bool = False,
@@ -103,7 +143,7 @@ def clean_name(
 ) -> str:
     """Return a string with correct characters for a cell name.
 
-    By default, the characters [a-zA-Z0-9] are allowed.
+    By default, the characters [a-zA-Z0-9] are allowed. Results are cached.
 
     Args:
         name (str): The name to clean.
@@ -113,50 +153,7 @@ def clean_name(
     Returns:
         str: The cleaned name.
     """
-    # Default allowed characters, including underscore
-    allowed = r"a-zA-Z0-9_"
-
-    allowed_characters = allowed_characters or []
-
-    # Add additional allowed characters
-    for char in allowed_characters:
-        allowed += re.escape(char)
-
-    # Pattern for characters to be replaced
-    pattern = f"[^{allowed}]"
-
-    # Replacements map
-    replace_map = {
-        " ": "_",
-        "!": "",
-        "?": "",
-        "#": "_",
-        "%": "_",
-        "(": "",
-        ")": "",
-        "*": "_",
-        ",": "_",
-        "-": "m",
-        ".": "p",
-        "/": "_",
-        ":": "_",
-        "=": "",
-        "@": "_",
-        "[": "",
-        "]": "",
-        "{": "",
-        "}": "",
-        "$": "",
-    }
-
-    if remove_dots:
-        replace_map["."] = ""
-
-    # Replace characters using the replace_map
-    def replace_match(match):
-        return replace_map.get(match.group(0), "")
-
-    return re.sub(pattern, replace_match, name)
+    return _clean_name(name, remove_dots, tuple(allowed_characters or ()))
 
 
 def clean_value(value: Any) -> str:
@@ -0,0 +1,229 @@
+"""Tiled over/under, under/over and min feature cleanup without flattening.
+
+`Component.over_under` flattens the component and sizes the whole layer in one
+thread. These functions read the layer through the hierarchy with a
+`kdb.TilingProcessor`, process the tiles in parallel and write the merged result
+into a layer of the top cell, or into a new cell. Child cells are never modified.
+The result is flat: merged polygons without hierarchy. Locked components, such as
+cached cells, can only write into a new cell with cell_name.
+
+.. code::
+
+    import gdsfactory as gf
+    from gdsfactory.over_under import over_under
+
+    c = gf.components.mzi()
+    over_under(c, layer=(1, 0), distance=50, layer_out=(2, 0))
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+
+from kfactory import kdb
+from kfactory.kcell import LockedError
+
+from gdsfactory.component import Component
+from gdsfactory.typings import LayerSpec
+
+
+def get_sized_region(
+    component: Component,
+    layer: LayerSpec,
+    sizes: Sequence[int],
+    tile_size: float | None = 1000.0,
+    threads: int | None = None,
+    mag: int = 1,
+) -> kdb.Region:
+    """Returns the merged polygons of a layer sized successively by sizes.
+
+    Shapes are collected through the whole hierarchy without flattening.
+
+    Args:
+        component: to read the layer from.
+        layer: layer to size.
+        sizes: sizing distances in dbu / mag, applied in order (positive grows).
+        tile_size: tile edge in um. None processes the layer as a single region.
+        threads: number of threads. Defaults to the number of CPUs.
+        mag: the layer is magnified by mag before sizing and shrunk back after,
+            so mag=2 sizes by half dbu steps.
+    """
+    from gdsfactory.pdk import get_layer
+
+    iterator = component.begin_shapes_rec(get_layer(layer))
+    if tile_size is None:
+        region = kdb.Region(iterator)
+        if mag != 1:
+            region = region.transformed(kdb.ICplxTrans(float(mag)))
+        for size in sizes:
+            region = region.sized(size)
+        if mag != 1:
+            region = region.transformed(kdb.ICplxTrans(1 / mag))
+        return region.merged()
+
+    dbu = component.kcl.dbu
+    # shapes up to the total sizing distance outside a tile change its result
+    border = 2 * sum(abs(size) for size in sizes) * dbu / mag
+    output = kdb.Region()
+    tp = kdb.TilingProcessor()
+    tp.input("a", iterator)
+    tp.output("o", output)
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.tile_border(border, border)
+    tp.threads = threads or os.cpu_count() or 1
+    sized = "a" + "".join(f".sized({size})" for size in sizes)
+    if mag != 1:
+        sized = (
+            f"a.transformed(ICplxTrans.new({float(mag)}))"
+            + sized[1:]
+            + f".transformed(ICplxTrans.new({1 / mag}))"
+        )
+    # results are clipped to the tile, the border only provides the context
+    tp.queue(f"_output(o, {sized})")
+    tp.execute(f"sizing {component.name}")
+    return output.merged()
+
+
+def _write_region(
+    component: Component,
+    region: kdb.Region,
+    layer: LayerSpec,
+    layer_out: LayerSpec | None,
+    cell_name: str | None,
+) -> Component:
+    from gdsfactory.pdk import get_layer
+
+    layer_index = get_layer(layer)
+    layer_out_index = get_layer(layer_out) if layer_out is not None else layer_index
+
+    if cell_name is not None:
+        c = Component(cell_name)
+        c._kdb_cell.shapes(layer_out_index).insert(region)
+        return c
+
+    if component._locked:
+        raise LockedError(component)
+
+    cell = component._kdb_cell
+    if layer_out_index == layer_index:
+        layout = cell.layout()
+        if any(
+            not layout.cell(ci).bbox(layer_index).empty()
+            for ci in cell.each_child_cell()
+        ):
+            raise ValueError(
+                f"{component.name!r} has shapes on {layer} in child cells, which "
+                "would be kept. Write the result into another layer_out or into a "
+                "new cell with cell_name."
+            )
+        cell.shapes(layer_index).clear()
+    cell.shapes(layer_out_index).insert(region)
+    return component
+
+
+def over_under(
+    component: Component,
+    layer: LayerSpec,
+    distance: int = 1,
+    layer_out: LayerSpec | None = None,
+    cell_name: str | None = None,
+    tile_size: float | None = 1000.0,
+    threads: int | None = None,
+) -> Component:
+    """Grows and shrinks a layer by distance, which fills gaps and notches.
+
+    Returns the component with the flat result added to layer_out, or a new
+    Component named cell_name with only the flat result. Raises LockedError for
+    locked components unless cell_name is set.
+
+    Args:
+        component: to read the layer from.
+        layer: layer to perform over-under on.
+        distance: distance in dbu.
+        layer_out: layer for the result. Defaults to layer, which replaces it
+            when the layer is only drawn in the top cell.
+        cell_name: if set, writes the result into a new Component.
+        tile_size: tile edge in um. None processes the layer as a single region.
+        threads: number of threads. Defaults to the number of CPUs.
+    """
+    region = get_sized_region(
+        component, layer, [distance, -distance], tile_size=tile_size, threads=threads
+    )
+    return _write_region(component, region, layer, layer_out, cell_name)
+
+
+def under_over(
+    component: Component,
+    layer: LayerSpec,
+    distance: int = 1,
+    layer_out: LayerSpec | None = None,
+    cell_name: str | None = None,
+    tile_size: float | None = 1000.0,
+    threads: int | None = None,
+) -> Component:
+    """Shrinks and grows a layer by distance, which removes slivers and spikes.
+
+    Returns the component with the flat result added to layer_out, or a new
+    Component named cell_name with only the flat result. Raises LockedError for
+    locked components unless cell_name is set.
+
+    Args:
+        component: to read the layer from.
+        layer: layer to perform under-over on.
+        distance: distance in dbu.
+        layer_out: layer for the result. Defaults to layer, which replaces it
+            when the layer is only drawn in the top cell.
+        cell_name: if set, writes the result into a new Component.
+        tile_size: tile edge in um. None processes the layer as a single region.
+        threads: number of threads. Defaults to the number of CPUs.
+    """
+    region = get_sized_region(
+        component, layer, [-distance, distance], tile_size=tile_size, threads=threads
+    )
+    return _write_region(component, region, layer, layer_out, cell_name)
+
+
+def fix_min_width_space(
+    component: Component,
+    layer: LayerSpec,
+    min_width: float | None = None,
+    min_space: float | None = None,
+    layer_out: LayerSpec | None = None,
+    cell_name: str | None = None,
+    tile_size: float | None = 1000.0,
+    threads: int | None = None,
+) -> Component:
+    """Removes features narrower than min_width and fills gaps below min_space.
+
+    Under-over by half the min_width removes the narrow features, then over-under
+    by half the min_space closes the narrow gaps. The sizing runs in half dbu
+    steps, so every feature or gap at least 1 dbu below the minimum is fixed and
+    the ones exactly at the minimum are kept. The result is flat, see
+    :func:`over_under`.
+
+    Args:
+        component: to read the layer from.
+        layer: layer to clean up.
+        min_width: minimum feature width in um.
+        min_space: minimum spacing in um.
+        layer_out: layer for the result. Defaults to layer, which replaces it
+            when the layer is only drawn in the top cell.
+        cell_name: if set, writes the result into a new Component.
+        tile_size: tile edge in um. None processes the layer as a single region.
+        threads: number of threads. Defaults to the number of CPUs.
+    """
+    dbu = component.kcl.dbu
+    # in half dbu: shrinking by w - 1 removes widths up to w - 1 dbu
+    sizes: list[int] = []
+    if min_width:
+        d = round(min_width / dbu) - 1
+        sizes += [-d, d]
+    if min_space:
+        d = round(min_space / dbu) - 1
+        sizes += [d, -d]
+    region = get_sized_region(
+        component, layer, sizes, tile_size=tile_size, threads=threads, mag=2
+    )
+    return _write_region(component, region, layer, layer_out, cell_name)
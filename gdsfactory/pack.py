@@ -6,7 +6,7 @@ Adapted from PHIDL https://github.com/amccaugh/phidl/ by Adam McCaughan
 from __future__ import annotations
 
 import warnings
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 
@@ -22,6 +22,7 @@ def _pack_single_bin(
     max_size: tuple[float, float],
     sort_by_area: bool,
     density: float,
+    allow_rotation: bool = False,
 ) -> tuple[dict[int, tuple[Number, Number, Number, Number]], dict[Any, Any]]:
     """Packs a dict of rectangles {id:(w,h)} and tries to.
 
@@ -35,6 +36,7 @@ def _pack_single_bin(
         max_size: tuple of max X, Y size.
         sort_by_area: sorts components by area.
         density: of packing, closer to 1 packs tighter (more compute heavy).
+        allow_rotation: allows rotating rectangles by 90 degrees.
 
     Returns:
         packed rectangles dict {id:(x,y,w,h)}. dict of remaining unpacked rectangles.
@@ -59,7 +61,7 @@ def _pack_single_bin(
             pack_algo=rectpack.MaxRectsBlsf,
             sort_algo=rp_sort,
             bin_algo=rectpack.PackingBin.BBF,
-            rotation=False,
+            rotation=allow_rotation,
         )
 
         # Add each rectangle to the pack, create a single bin, and pack
@@ -87,6 +89,148 @@ def _pack_single_bin(
     return packed_rect_dict, unpacked_rect_dict
 
 
+def _skyline_pack(
+    sizes: np.ndarray, width: float, height: float, allow_rotation: bool
+) -> np.ndarray:
+    """Packs rectangles in order into a bin with the bottom-left skyline heuristic.
+
+    The skyline is stored as arrays of segment start x and height, so finding the
+    position of each rectangle is a vectorized range-max over the segments.
+
+    Args:
+        sizes: (n, 2) array of rectangle widths and heights.
+        width: bin width.
+        height: bin height.
+        allow_rotation: also tries each rectangle rotated by 90 degrees.
+
+    Returns:
+        (n, 4) array of x, y, w, h. Rectangles that do not fit are NaN.
+    """
+    placed = np.full((len(sizes), 4), np.nan)
+    xs = np.array([0.0])
+    ys = np.array([0.0])
+
+    for n, size in enumerate(sizes):
+        best = None
+        orientations = (size, size[::-1]) if allow_rotation else (size,)
+        for w, h in orientations:
+            # segments covered by a rectangle of width w starting at each segment
+            last = np.searchsorted(xs, xs + w, side="left")
+            indices = np.empty(2 * len(xs), dtype=np.int64)
+            indices[0::2] = np.arange(len(xs))
+            indices[1::2] = last
+            top = np.maximum.reduceat(np.append(ys, 0), indices)[0::2]
+            fits = (xs + w <= width) & (top + h <= height)
+            if not fits.any():
+                continue
+            candidates = np.flatnonzero(fits)
+            i = candidates[np.lexsort((xs[candidates], top[candidates] + h))[0]]
+            if best is None or (top[i] + h, xs[i]) < (best[1] + best[3], best[0]):
+                best = (xs[i], top[i], w, h)
+
+        if best is None:
+            continue
+        x, y, w, h = best
+        placed[n] = best
+
+        # replace the skyline segments under the rectangle
+        start = np.searchsorted(xs, x, side="left")
+        end = np.searchsorted(xs, x + w, side="left")
+        tail = []
+        if end == len(xs) or xs[end] != x + w:
+            # the last covered segment continues after the rectangle
+            tail = [(x + w, ys[end - 1])] if x + w < width else []
+        new_xs = np.concatenate([xs[:start], [x], [t[0] for t in tail], xs[end:]])
+        new_ys = np.concatenate([ys[:start], [y + h], [t[1] for t in tail], ys[end:]])
+        keep = np.ones(len(new_xs), dtype=bool)
+        keep[1:] = new_ys[1:] != new_ys[:-1]
+        xs, ys = new_xs[keep], new_ys[keep]
+
+    return placed
+
+
+def _pack_single_bin_skyline(
+    rect_dict: dict[int, tuple[Number, Number]],
+    aspect_ratio: tuple[Number, Number],
+    max_size: tuple[float, float],
+    sort_by_area: bool,
+    density: float,
+    allow_rotation: bool = False,
+) -> tuple[dict[int, tuple[Number, Number, Number, Number]], dict[Any, Any]]:
+    """Packs a dict of rectangles {id:(w,h)} with a skyline packer.
+
+    Same as :func:`_pack_single_bin`, but the bin size is found by growing it
+    geometrically until everything fits and then bisecting down to a relative
+    tolerance of `density`, instead of growing it by `density` every iteration.
+    The rectangles are sorted once.
+
+    Args:
+        rect_dict: dict of rectangles {id: (w, h)} to pack.
+        aspect_ratio: x, y.
+        max_size: tuple of max X, Y size.
+        sort_by_area: sorts components by area.
+        density: relative tolerance of the bin size search.
+        allow_rotation: allows rotating rectangles by 90 degrees.
+
+    Returns:
+        packed rectangles dict {id:(x,y,w,h)}. dict of remaining unpacked rectangles.
+    """
+    ids = np.array(list(rect_dict.keys()))
+    sizes = np.array(list(rect_dict.values()), dtype=np.float64)
+    if sort_by_area:
+        order = np.argsort(-sizes[:, 0] * sizes[:, 1], kind="stable")
+        ids, sizes = ids[order], sizes[order]
+
+    total_area = np.sum(sizes[:, 0] * sizes[:, 1])
+    aspect_ratio = np.asarray(aspect_ratio) / np.linalg.norm(aspect_ratio)
+    max_size = np.asarray(max_size, dtype=np.float64)
+    box_size = aspect_ratio * np.sqrt(total_area)
+
+    def pack_scaled(scale: float) -> np.ndarray:
+        w, h = np.clip(box_size * scale, None, max_size)
+        return _skyline_pack(sizes, w, h, allow_rotation)
+
+    # the bin can not be smaller than the total area or the largest rectangle
+    low = 1 / np.sqrt(np.prod(aspect_ratio))
+    if not allow_rotation:
+        low = max(low, *(sizes.max(axis=0) / box_size))
+
+    # grow until everything fits or the bin reaches max_size
+    high = low
+    placed = pack_scaled(high)
+    while np.isnan(placed[:, 0]).any():
+        if np.all(box_size * high >= max_size):
+            break
+        low, high = high, high * 2
+        placed = pack_scaled(high)
+
+    # bisect down to the smallest bin that fits
+    if high > low and not np.isnan(placed[:, 0]).any():
+        while high > low * density:
+            mid = (low + high) / 2
+            placed_mid = pack_scaled(mid)
+            if np.isnan(placed_mid[:, 0]).any():
+                low = mid
+            else:
+                high, placed = mid, placed_mid
+
+    packed_rect_dict = {
+        int(rid): tuple(rect.tolist())
+        for rid, rect in zip(ids, placed)
+        if not np.isnan(rect[0])
+    }
+    unpacked_rect_dict = {
+        k: v for k, v in rect_dict.items() if k not in packed_rect_dict
+    }
+    return packed_rect_dict, unpacked_rect_dict
+
+
+_pack_engines = {
+    "rectpack": _pack_single_bin,
+    "skyline": _pack_single_bin_skyline,
+}
+
+
 def pack(
     component_list: list[ComponentSpec],
     spacing: float = 10.0,
@@ -107,6 +251,8 @@ def pack(
     v_mirror: bool = False,
     add_ports_prefix: bool = True,
     add_ports_suffix: bool = False,
+    engine: Literal["rectpack", "skyline"] = "rectpack",
+    allow_rotation: bool = False,
 ) -> list[Component]:
     """Pack a list of components into as few Components as possible.
 
@@ -131,6 +277,11 @@ def pack(
         v_mirror: vertical mirror using x axis (1, y) (0, y).
         add_ports_prefix: adds port names with prefix.
         add_ports_suffix: adds port names with suffix.
+        engine: rectangle packer. "rectpack" uses the rectpack MaxRects packer and
+            grows the bin by `density` until everything fits. "skyline" uses a
+            built-in NumPy skyline packer and bisects the bin size, which is much
+            faster for many components.
+        allow_rotation: allows the packer to rotate components by 90 degrees.
 
     .. plot::
         :include-source:
@@ -159,6 +310,10 @@ def pack(
             "The density argument must be >= 1.01"
         )
 
+    if engine not in _pack_engines:
+        raise ValueError(f"engine={engine!r} not in {list(_pack_engines)}")
+    pack_single_bin = _pack_engines[engine]
+
     # Sanitize max_size variable
     max_size = [np.inf if v is None else v for v in max_size]
     max_size = np.asarray(max_size, dtype=np.float64)  # In case it's integers
@@ -172,7 +327,10 @@ def pack(
         size = np.array([D.dxsize, D.dysize])
         w, h = (size + spacing) / precision
         w, h = int(w), int(h)
-        if (w > max_size[0]) or (h > max_size[1]):
+        fits = w <= max_size[0] and h <= max_size[1]
+        if allow_rotation:
+            fits = fits or (h <= max_size[0] and w <= max_size[1])
+        if not fits:
             raise ValueError(
                 f"pack() failed because Component {D.name!r} has x or y "
                 "dimension larger than `max_size` and cannot be packed.\n"
@@ -180,14 +338,16 @@ def pack(
             )
         rect_dict[n] = (w, h)
 
+    sizes = dict(rect_dict)
     packed_list = []
     while rect_dict:
-        (packed_rect_dict, rect_dict) = _pack_single_bin(
+        (packed_rect_dict, rect_dict) = pack_single_bin(
             rect_dict,
             aspect_ratio=aspect_ratio,
             max_size=max_size,
             sort_by_area=sort_by_area,
             density=density,
+            allow_rotation=allow_rotation,
         )
         packed_list.append(packed_rect_dict)
 
@@ -205,6 +365,8 @@ def pack(
             )  # ref(rotation=rotation, h_mirror=h_mirror, v_mirror=v_mirror)
             if rotation:
                 d.drotate(rotation)
+            if (w, h) != sizes[n]:
+                d.drotate(90)
             if h_mirror:
                 d.mirror_x()
             if v_mirror:
@@ -26,6 +26,7 @@ from gdsfactory.component_layout import (
     _rotate_points,
 )
 from gdsfactory.cross_section import CrossSection, Section, Transition
+from gdsfactory.tracing import traced
 from gdsfactory.typings import (
     ComponentSpec,
     Coordinates,
@@ -767,6 +768,7 @@ def _get_named_sections(sections: tuple[Section, ...]) -> dict[str, Section]:
     return named_sections
 
 
+@traced(category="extrude")
 def extrude(
     p: Path,
     cross_section: CrossSectionSpec | None = None,
@@ -19,9 +19,9 @@ from pydantic import BaseModel, ConfigDict, Field
 from gdsfactory import logger
 from gdsfactory.config import CONF
 from gdsfactory.generic_tech import get_generic_pdk
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 from gdsfactory.symbols import floorplan_with_block_letters
 from gdsfactory.technology import LayerStack, LayerViews, klayout_tech
+from gdsfactory.tracing import traced
 from gdsfactory.typings import (
     CellSpec,
     Component,
@@ -217,6 +217,7 @@ class Pdk(BaseModel):
         self,
         dirpath: PathType | None = None,
         update: bool = False,
+        lazy: bool = True,
         **kwargs,
     ) -> None:
         """Load *.pic.yml YAML files and register them as cells.
@@ -224,12 +225,19 @@ class Pdk(BaseModel):
         Args:
             dirpath: directory to recursive search for YAML cells.
             update: does not raise ValueError if cell already registered.
+            lazy: only records the files and parses each one on its first use.
+                Parsed cells are cached until the file changes.
             kwargs: cell_name: cell function. To update cells dict.
 
         Keyword Args:
             cell_name: cell function. To update cells dict.
 
         """
+        from gdsfactory.read.from_yaml_template import (
+            LazyYamlCell,
+            cell_from_yaml_template,
+        )
+
         message = "Updated" if update else "Registered"
 
         if dirpath:
@@ -238,14 +246,21 @@ class Pdk(BaseModel):
             if not dirpath.is_dir():
                 raise ValueError(f"{dirpath!r} needs to be a directory.")
 
+            names = []
             for filepath in dirpath.glob("**/*.pic.yml"):
                 name = filepath.stem.split(".")[0]
                 if not update and name in self.cells:
                     raise ValueError(
                         f"ERROR: Cell name {name!r} from {filepath} already registered."
                     )
-                self.cells[name] = cell_from_yaml_template(filepath, name=name)
-                logger.info(f"{message} cell {name!r}")
+                self.cells[name] = (
+                    LazyYamlCell(filepath, name=name)
+                    if lazy
+                    else cell_from_yaml_template(filepath, name=name)
+                )
+                names.append(name)
+            logger.info(f"{message} {len(names)} cells from {dirpath}")
+            logger.debug(f"{message} {names}")
 
         for k, v in kwargs.items():
             if not update and k in self.cells:
@@ -578,6 +593,7 @@ def get_cell(cell: CellSpec, **kwargs) -> ComponentFactory:
     return get_active_pdk().get_cell(cell, **kwargs)
 
 
+@traced(category="cross_section")
 def get_cross_section(
     cross_section: CrossSectionSpec, **kwargs
 ) -> CrossSection | Transition:
@@ -42,6 +42,7 @@ from rich.console import Console
 from rich.table import Table
 
 from gdsfactory.cross_section import CrossSectionSpec
+from gdsfactory.port_table import _directions, get_port_table
 
 if typing.TYPE_CHECKING:
     from gdsfactory.component import Component
@@ -245,34 +246,8 @@ def sort_ports_clockwise(ports: kf.Ports) -> kf.Ports:
             8   7
 
     """
-    port_list = ports
-    direction_ports: PortsMap = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in port_list:
-        angle = p.angle * 90
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
-
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    ports = west_ports + north_ports + east_ports + south_ports
-    return list(ports)
+    table = get_port_table(ports)
+    return table.take(table.sort_clockwise(clockwise=True))
 
 
 def sort_ports_counter_clockwise(ports: kf.Ports) -> kf.Ports:
@@ -289,34 +264,8 @@ def sort_ports_counter_clockwise(ports: kf.Ports) -> kf.Ports:
             7   8
 
     """
-    port_list = list(ports)
-    direction_ports: PortsMap = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in port_list:
-        angle = p.angle * 90
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
-
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    ports = east_ports + north_ports + west_ports + south_ports
-    return list(ports)
+    table = get_port_table(ports)
+    return table.take(table.sort_clockwise(clockwise=False))
 
 
 def select_ports(
@@ -354,34 +303,22 @@ def select_ports(
     if isinstance(ports, kf.Instance):
         ports = ports.ports
 
-    if layer:
-        from gdsfactory.pdk import get_layer
-
-        layer = get_layer(layer)
-        ports = [p for p in ports if get_layer(p.layer) == layer]
-
-    if prefix:
-        ports = [p for p in ports if p.name.startswith(prefix)]
-    if suffix:
-        ports = [p for p in ports if p.name.endswith(suffix)]
-    if orientation is not None:
-        ports = [p for p in ports if np.isclose(p.dangle, orientation)]
-
-    if layers_excluded:
-        ports = [p for p in ports if p.layer not in layers_excluded]
-    if width:
-        ports = [p for p in ports if p.width == width]
-    if port_type:
-        ports = [p for p in ports if p.port_type == port_type]
-    if names:
-        ports = [p for p in ports if p.name in names]
-
+    table = get_port_table(ports)
+    indexes = np.flatnonzero(
+        table.mask(
+            layer=layer,
+            prefix=prefix,
+            suffix=suffix,
+            orientation=orientation,
+            width=width,
+            layers_excluded=layers_excluded,
+            port_type=port_type,
+            names=names,
+        )
+    )
     if sort_ports:
-        if clockwise:
-            ports = sort_ports_clockwise(ports)
-        else:
-            ports = sort_ports_counter_clockwise(ports)
-    return ports
+        indexes = table.sort_clockwise(indexes, clockwise=clockwise)
+    return table.take(indexes)
 
 
 select_ports_optical = partial(select_ports, port_type="optical")
@@ -424,22 +361,10 @@ def get_ports_facing(ports: list[Port], direction: str = "W") -> list[Port]:
     if isinstance(ports, dict):
         ports = list(ports)
     elif isinstance(ports, Component | ComponentReference):
-        ports = list(ports.ports)
-
-    direction_ports: dict[str, list[Port]] = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in ports:
-        angle = p.orientation % 360 if p.orientation is not None else 0
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
+        ports = ports.ports
 
-    return direction_ports[direction]
+    table = get_port_table(ports)
+    return table.take(table.facing(direction))
 
 
 def deco_rename_ports(component_factory: Callable) -> Callable:
@@ -587,24 +512,15 @@ def rename_ports_by_orientation(
     ports = component.ports
     ports = select_ports(ports, **kwargs)
 
-    ports_on_layer = [p for p in ports if p.layer not in layers_excluded]
+    table = get_port_table(ports)
+    indexes = np.flatnonzero(table.mask(layers_excluded=layers_excluded))
+    directions = table.directions()
 
-    for p in ports_on_layer:
+    for i in indexes:
+        p = table.ports[i]
         # Make sure we can backtrack the parent component from the port
         p.parent = component
-
-        if p.orientation is not None:
-            angle = p.orientation % 360
-            if angle <= 45 or angle >= 315:
-                direction_ports["E"].append(p)
-            elif angle <= 135 and angle >= 45:
-                direction_ports["N"].append(p)
-            elif angle <= 225 and angle >= 135:
-                direction_ports["W"].append(p)
-            else:
-                direction_ports["S"].append(p)
-        else:
-            direction_ports["S"].append(p)
+        direction_ports[_directions[directions[i]]].append(p)
 
     function(direction_ports, prefix=prefix)
     return component
@@ -0,0 +1,210 @@
+"""Columnar view of ports for vectorized queries.
+
+Selecting and sorting thousands of ports one Python object at a time is slow.
+A PortTable stores the port attributes as NumPy arrays so filters, sorts and
+nearest neighbour queries are vectorized.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING
+
+import kfactory as kf
+import numpy as np
+
+if TYPE_CHECKING:
+    from gdsfactory.typings import LayerSpec
+
+_directions = ("E", "N", "W", "S")
+
+
+class PortTable:
+    """Columnar snapshot of a list of ports.
+
+    Attributes:
+        ports: the ports, in their original order.
+        x: x coordinates in dbu.
+        y: y coordinates in dbu.
+        angle: orientation in degrees.
+        width: widths in dbu.
+        layer: layer indexes.
+        port_type: port type codes, indexes into `port_types`.
+        port_types: port type names.
+        name: port name codes, indexes into `names`.
+        names: port names.
+    """
+
+    def __init__(self, ports: Iterable[kf.Port]) -> None:
+        """Builds the columns from ports."""
+        from gdsfactory.pdk import get_layer
+
+        self.ports = list(ports)
+        n = len(self.ports)
+        self.x = np.empty(n, dtype=np.int64)
+        self.y = np.empty(n, dtype=np.int64)
+        self.angle = np.empty(n, dtype=np.float64)
+        self.width = np.empty(n, dtype=np.int64)
+        self.layer = np.empty(n, dtype=np.int64)
+        self.port_type = np.empty(n, dtype=np.int64)
+        self.name = np.empty(n, dtype=np.int64)
+        self.port_types: list[str] = []
+        self.names: list[str | None] = []
+
+        port_type_codes: dict[str, int] = {}
+        name_codes: dict[str | None, int] = {}
+        layer_indexes: dict[object, int] = {}
+        for i, p in enumerate(self.ports):
+            if p._dcplx_trans is None:
+                disp = p.trans.disp
+                self.x[i] = disp.x
+                self.y[i] = disp.y
+                self.angle[i] = p.trans.angle * 90
+            else:
+                self.x[i] = round(p.dx / p.kcl.dbu)
+                self.y[i] = round(p.dy / p.kcl.dbu)
+                self.angle[i] = p.dangle % 360
+            self.width[i] = p.width
+            if p.layer not in layer_indexes:
+                layer_indexes[p.layer] = get_layer(p.layer)
+            self.layer[i] = layer_indexes[p.layer]
+            self.port_type[i] = port_type_codes.setdefault(
+                p.port_type, len(port_type_codes)
+            )
+            self.name[i] = name_codes.setdefault(p.name, len(name_codes))
+        self.port_types = list(port_type_codes)
+        self.names = list(name_codes)
+
+    def __len__(self) -> int:
+        """Returns the number of ports."""
+        return len(self.ports)
+
+    def take(self, indexes: Iterable[int]) -> list[kf.Port]:
+        """Returns the ports at indexes."""
+        return [self.ports[i] for i in indexes]
+
+    def mask(
+        self,
+        layer: LayerSpec | None = None,
+        prefix: str | None = None,
+        suffix: str | None = None,
+        orientation: float | None = None,
+        width: float | None = None,
+        layers_excluded: Sequence[LayerSpec] | None = None,
+        port_type: str | None = None,
+        names: Sequence[str] | None = None,
+    ) -> np.ndarray:
+        """Returns a boolean mask of the ports matching all filters.
+
+        Args:
+            layer: port layer.
+            prefix: port name prefix.
+            suffix: port name suffix.
+            orientation: orientation in degrees.
+            width: port width in dbu.
+            layers_excluded: layers to exclude.
+            port_type: port type (optical, electrical, vertical_te).
+            names: port names.
+        """
+        from gdsfactory.pdk import get_layer
+
+        mask = np.ones(len(self), dtype=bool)
+        if layer:
+            mask &= self.layer == get_layer(layer)
+        if prefix or suffix or names:
+            names_mask = np.ones(len(self.names), dtype=bool)
+            for i, name in enumerate(self.names):
+                if name is None:
+                    names_mask[i] = False
+                    continue
+                if prefix and not name.startswith(prefix):
+                    names_mask[i] = False
+                elif suffix and not name.endswith(suffix):
+                    names_mask[i] = False
+                elif names and name not in names:
+                    names_mask[i] = False
+            mask &= names_mask[self.name]
+        if orientation is not None:
+            mask &= np.isclose(self.angle, orientation)
+        if layers_excluded:
+            excluded = [get_layer(layer) for layer in layers_excluded]
+            mask &= ~np.isin(self.layer, excluded)
+        if width:
+            mask &= self.width == width
+        if port_type:
+            if port_type not in self.port_types:
+                mask[:] = False
+            else:
+                mask &= self.port_type == self.port_types.index(port_type)
+        return mask
+
+    def select(self, **kwargs) -> list[kf.Port]:
+        """Returns the ports matching all filters, see :meth:`mask`."""
+        return self.take(np.flatnonzero(self.mask(**kwargs)))
+
+    def directions(self) -> np.ndarray:
+        """Returns the direction each port is facing as 0=E, 1=N, 2=W, 3=S."""
+        angle = self.angle % 360
+        return np.select(
+            [(angle <= 45) | (angle >= 315), angle <= 135, angle <= 225],
+            [0, 1, 2],
+            3,
+        )
+
+    def facing(self, direction: str) -> np.ndarray:
+        """Returns the indexes of the ports facing a direction (E, N, W, S)."""
+        return np.flatnonzero(self.directions() == _directions.index(direction))
+
+    def sort_clockwise(
+        self, indexes: np.ndarray | None = None, clockwise: bool = True
+    ) -> np.ndarray:
+        """Returns port indexes sorted clockwise, starting from the bottom left.
+
+        Args:
+            indexes: ports to sort. Defaults to all ports.
+            clockwise: if False, sorts counter-clockwise starting from the bottom right.
+        """
+        if indexes is None:
+            indexes = np.arange(len(self))
+        direction = self.directions()[indexes]
+        x = self.x[indexes]
+        y = self.y[indexes]
+        if clockwise:
+            # west: south to north, north: west to east,
+            # east: north to south, south: east to west
+            rank = np.array([2, 1, 0, 3])[direction]
+            key = np.choose(direction, [-y, x, y, -x])
+        else:
+            # east: south to north, north: east to west,
+            # west: north to south, south: west to east
+            rank = np.array([0, 1, 2, 3])[direction]
+            key = np.choose(direction, [y, -x, -y, x])
+        return indexes[np.lexsort((key, rank))]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> np.ndarray:
+        """Returns the indexes of the k ports closest to a point.
+
+        Args:
+            x: x coordinate in um.
+            y: y coordinate in um.
+            k: number of ports.
+        """
+        if not self.ports:
+            return np.array([], dtype=np.int64)
+        dbu = self.ports[0].kcl.dbu
+        distance = np.hypot(self.x - x / dbu, self.y - y / dbu)
+        k = min(k, len(self))
+        indexes = np.argpartition(distance, k - 1)[:k]
+        return indexes[np.argsort(distance[indexes], kind="stable")]
+
+
+def get_port_table(ports: Iterable[kf.Port]) -> PortTable:
+    """Returns a PortTable for ports.
+
+    Tables are not cached: ports are mutable and kfactory has no change counter,
+    so checking a cached table costs as much as building a new one.
+
+    Args:
+        ports: ports to tabulate.
+    """
+    return PortTable(ports)
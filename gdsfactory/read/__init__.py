@@ -1,6 +1,8 @@
 from gdsfactory.read.from_gdspaths import (
     from_gdsdir,
     from_gdspaths,
+    merge_gdsdir,
+    merge_gdspaths,
 )
 from gdsfactory.read.from_np import (
     from_image,
@@ -12,6 +14,9 @@ from gdsfactory.read.from_updk import (
 from gdsfactory.read.from_yaml import (
     from_yaml,
 )
+from gdsfactory.read.from_yaml_incremental import (
+    IncrementalYamlBuilder,
+)
 from gdsfactory.read.from_yaml_template import (
     cell_from_yaml_template,
 )
@@ -24,6 +29,7 @@ from gdsfactory.read.labels import (
 )
 
 __all__ = [
+    "IncrementalYamlBuilder",
     "add_port_markers",
     "cell_from_yaml_template",
     "from_gdsdir",
@@ -33,5 +39,7 @@ __all__ = [
     "from_updk",
     "from_yaml",
     "import_gds",
+    "merge_gdsdir",
+    "merge_gdspaths",
     "read_labels_yaml",
 ]
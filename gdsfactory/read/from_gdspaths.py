@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
 import pathlib
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import klayout.db as kdb
 
 from gdsfactory import logger
+from gdsfactory.cell_hash import get_cell_hashes
 from gdsfactory.component import Component
+from gdsfactory.layout_format import get_layout_format, get_save_options, suffixes
 from gdsfactory.read.import_gds import import_gds
 from gdsfactory.typings import ComponentOrPath, PathType
 
@@ -35,6 +46,227 @@ def from_gdsdir(dirpath: PathType) -> Component:
     return from_gdspaths(list(dirpath.glob("*.gds")))
 
 
+@dataclass
+class MergeFileReport:
+    """Timing and cell statistics for one merged file.
+
+    Attributes:
+        gdspath: merged file.
+        read_time: seconds to read and hash the file in the worker.
+        merge_time: seconds to copy the file into the merged layout.
+        cells: number of cells in the file.
+        deduplicated: cells that were identical to an existing cell of the same name.
+        renamed: original name -> new name for cells whose name was taken by a
+            different cell.
+    """
+
+    gdspath: pathlib.Path
+    read_time: float = 0.0
+    merge_time: float = 0.0
+    cells: int = 0
+    deduplicated: int = 0
+    renamed: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class MergeReport:
+    """Result of :func:`merge_gdspaths`.
+
+    Attributes:
+        gdspath: merged output file.
+        files: per file report, in input order.
+        total_time: seconds for the whole merge, including writing.
+    """
+
+    gdspath: pathlib.Path
+    files: list[MergeFileReport] = field(default_factory=list)
+    total_time: float = 0.0
+
+    def __str__(self) -> str:
+        """Returns one line per file and a total."""
+        lines = [
+            f"{f.gdspath.name}: read {f.read_time:.3f}s, merge {f.merge_time:.3f}s, "
+            f"{f.cells} cells, {f.deduplicated} deduplicated, {len(f.renamed)} renamed"
+            for f in self.files
+        ]
+        lines.append(
+            f"merged {len(self.files)} files into {self.gdspath} "
+            f"in {self.total_time:.3f}s"
+        )
+        return "\n".join(lines)
+
+
+def _read_and_hash(
+    gdspath: str, tmpdir: str
+) -> tuple[str, dict[str, str], list[str], float]:
+    """Reads a file in a worker process and hashes its cells.
+
+    Returns the path of an OASIS copy of the file (fast to read back),
+    the cell name -> geometry hash map, the top cell names and the elapsed time.
+    """
+    t0 = time.perf_counter()
+    layout = kdb.Layout()
+    layout.read(gdspath)
+    hashes = get_cell_hashes(layout)
+    cell_hashes = {layout.cell(ci).name: h for ci, h in hashes.items()}
+    top_cells = [cell.name for cell in layout.top_cells()]
+
+    options = kdb.SaveLayoutOptions()
+    options.format = "OASIS"
+    options.oasis_compression_level = 0
+    fd, oaspath = tempfile.mkstemp(suffix=".oas", dir=tmpdir)
+    os.close(fd)
+    layout.write(oaspath, options)
+    return oaspath, cell_hashes, top_cells, time.perf_counter() - t0
+
+
+def _copy_cells(
+    source: kdb.Layout,
+    target: kdb.Layout,
+    cell_hashes: dict[str, str],
+    target_hashes: dict[str, str],
+    report: MergeFileReport,
+) -> dict[int, int]:
+    """Copies all cells of source into target bottom-up.
+
+    Returns the source -> target cell index map.
+    """
+    cell_map: dict[int, int] = {}
+    for ci in source.each_cell_bottom_up():
+        cell = source.cell(ci)
+        name = cell.name
+        h = cell_hashes[name]
+        report.cells += 1
+
+        if target_hashes.get(name) == h:
+            cell_map[ci] = target.cell(name).cell_index()
+            report.deduplicated += 1
+            continue
+
+        if name in target_hashes:
+            new_name = f"{name}_{h[:8]}"
+            if target_hashes.get(new_name) == h:
+                cell_map[ci] = target.cell(new_name).cell_index()
+                report.deduplicated += 1
+                report.renamed[name] = new_name
+                continue
+            report.renamed[name] = new_name
+            name = new_name
+
+        target_cell = target.create_cell(name)
+        target_hashes[name] = h
+        cell_map[ci] = target_cell.cell_index()
+
+        target_cell.copy_shapes(cell)
+        for inst in cell.each_inst():
+            cell_inst = inst.cell_inst.dup()
+            cell_inst.cell_index = cell_map[cell_inst.cell_index]
+            target_cell.insert(cell_inst)
+    return cell_map
+
+
+def merge_gdspaths(
+    gdspaths: Sequence[PathType],
+    gdspath: PathType = "merged.gds",
+    top_cell_name: str = "merged",
+    max_workers: int | None = None,
+) -> MergeReport:
+    """Merges GDS files into a single GDS without creating Components.
+
+    Files are read and hashed in a process pool and streamed into one layout in
+    input order. Cells with the same name are deduplicated when their geometry
+    hash (see :mod:`gdsfactory.cell_hash`) is the same, and renamed to
+    `{name}_{hash[:8]}` when it is different. The top cells of every file are
+    instantiated at the origin of a new top cell.
+
+    Args:
+        gdspaths: files to merge.
+        gdspath: output file. The suffix sets the format: .gds, .gds.gz or .oas.
+        top_cell_name: name of the new top cell.
+        max_workers: number of reader processes. Defaults to the number of CPUs.
+
+    Returns:
+        MergeReport with per file timing.
+    """
+    t0 = time.perf_counter()
+    gdspath = pathlib.Path(gdspath)
+    report = MergeReport(gdspath=gdspath)
+    target = kdb.Layout()
+    target_hashes: dict[str, str] = {}
+    target_top_cell = None
+
+    with (
+        tempfile.TemporaryDirectory() as tmpdir,
+        ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor,
+    ):
+        results = executor.map(
+            _read_and_hash, [str(p) for p in gdspaths], [tmpdir] * len(gdspaths)
+        )
+        for path, (oaspath, cell_hashes, top_cells, read_time) in zip(
+            gdspaths, results
+        ):
+            t1 = time.perf_counter()
+            file_report = MergeFileReport(
+                gdspath=pathlib.Path(path), read_time=read_time
+            )
+            source = kdb.Layout()
+            source.read(oaspath)
+            pathlib.Path(oaspath).unlink()
+
+            if target_top_cell is None:
+                target.dbu = source.dbu
+                target_top_cell = target.create_cell(top_cell_name)
+                target_hashes[top_cell_name] = ""
+            elif source.dbu != target.dbu:
+                raise ValueError(
+                    f"{path} has dbu={source.dbu}, expected dbu={target.dbu}"
+                )
+
+            cell_map = _copy_cells(
+                source, target, cell_hashes, target_hashes, file_report
+            )
+            for name in top_cells:
+                ci = cell_map[source.cell(name).cell_index()]
+                target_top_cell.insert(kdb.CellInstArray(ci, kdb.Trans()))
+
+            file_report.merge_time = time.perf_counter() - t1
+            report.files.append(file_report)
+            logger.info(
+                f"Merged {path!r} in {file_report.read_time + file_report.merge_time:.3f}s"
+            )
+
+    if target_top_cell is None:
+        raise ValueError("No files to merge.")
+
+    gdspath.parent.mkdir(parents=True, exist_ok=True)
+    options = get_save_options(get_layout_format(gdspath), kdb.SaveLayoutOptions())
+    target.write(str(gdspath), options)
+    report.total_time = time.perf_counter() - t0
+    return report
+
+
+def merge_gdsdir(
+    dirpath: PathType,
+    gdspath: PathType = "merged.gds",
+    max_workers: int | None = None,
+) -> MergeReport:
+    """Merges all GDS, gzipped GDS and OASIS files from a directory into one file.
+
+    See :func:`merge_gdspaths`.
+    """
+    dirpath = pathlib.Path(dirpath)
+    assert dirpath.exists(), f"{dirpath} does not exist"
+    gdspaths = sorted(
+        path
+        for suffix in suffixes.values()
+        for path in dirpath.glob(f"*{suffix}")
+        if path.resolve() != pathlib.Path(gdspath).resolve()
+    )
+    return merge_gdspaths(gdspaths, gdspath=gdspath, max_workers=max_workers)
+
+
 if __name__ == "__main__":
     from gdsfactory.config import diff_path
 
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import struct
+from typing import Literal
+
 import numpy as np
+from kfactory import kdb
 
 from gdsfactory import cell
 from gdsfactory.boolean import boolean
@@ -16,10 +20,194 @@ def compute_area_signed(pr) -> float:
     indicates a counter-clockwise oriented ring.
 
     """
-    xs, ys = map(list, zip(*pr))
-    xs.append(xs[1])
-    ys.append(ys[1])
-    return sum(xs[i] * (ys[i + 1] - ys[i - 1]) for i in range(1, len(pr))) / 2.0
+    pr = np.asarray(pr, dtype=float)
+    xs = np.append(pr[:, 0], pr[1, 0])
+    ys = np.append(pr[:, 1], pr[1, 1])
+    n = len(pr)
+    return float(np.sum(xs[1:n] * (ys[2 : n + 1] - ys[: n - 1]))) / 2.0
+
+
+def bitmap_to_boxes(bitmap: np.ndarray) -> np.ndarray:
+    """Returns the rectangles covering the True pixels of a bitmap.
+
+    Runs of True pixels along the second axis are found by run-length encoding
+    and identical runs on consecutive rows are joined into one rectangle.
+
+    Args:
+        bitmap: 2D boolean array indexed [x, y].
+
+    Returns:
+        (N, 4) array of x0, y0, x1, y1 in pixels, with x1 and y1 exclusive.
+    """
+    padded = np.pad(bitmap.astype(np.int8), ((0, 0), (1, 1)))
+    edges = np.diff(padded, axis=1)
+    rows, y0 = np.nonzero(edges == 1)
+    _, y1 = np.nonzero(edges == -1)
+    if not len(rows):
+        return np.empty((0, 4), dtype=np.int64)
+
+    order = np.lexsort((rows, y1, y0))
+    rows, y0, y1 = rows[order], y0[order], y1[order]
+    new = np.ones(len(rows), dtype=bool)
+    new[1:] = (y0[1:] != y0[:-1]) | (y1[1:] != y1[:-1]) | (rows[1:] != rows[:-1] + 1)
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:], len(rows)) - 1
+    return np.stack(
+        [rows[starts], y0[starts], rows[ends] + 1, y1[starts]], axis=1
+    ).astype(np.int64)
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Returns the points of an open polyline kept by Douglas-Peucker.
+
+    Args:
+        points: (N, 2) array.
+        tolerance: maximum distance between the polyline and the result.
+    """
+    n = len(points)
+    if n < 3:
+        return points
+    points_float = points.astype(float)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a = points_float[start]
+        d = points_float[end] - a
+        v = points_float[start + 1 : end] - a
+        norm = np.hypot(*d)
+        if norm:
+            distance = np.abs(d[0] * v[:, 1] - d[1] * v[:, 0]) / norm
+        else:
+            distance = np.hypot(v[:, 0], v[:, 1])
+        k = int(np.argmax(distance))
+        if distance[k] > tolerance:
+            i = start + 1 + k
+            keep[i] = True
+            stack += [(start, i), (i, end)]
+    return points[keep]
+
+
+def _simplify_ring(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplifies a closed ring, split at its first point and the farthest one."""
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    if far == 0:
+        return points[:1]
+    first = douglas_peucker(points[: far + 1], tolerance)
+    second = douglas_peucker(np.vstack([points[far:], points[:1]]), tolerance)
+    return np.vstack([first[:-1], second[:-1]])
+
+
+def simplify_region(region: kdb.Region, tolerance: int) -> kdb.Region:
+    """Returns region with hulls and holes simplified by Douglas-Peucker.
+
+    Args:
+        region: to simplify.
+        tolerance: maximum deviation in dbu.
+    """
+    result = kdb.Region()
+    for polygon in region.each_merged():
+        hull = _simplify_ring(
+            np.array([(p.x, p.y) for p in polygon.each_point_hull()]), tolerance
+        )
+        if len(hull) < 3:
+            continue
+        simplified = kdb.Polygon([kdb.Point(*p) for p in hull.tolist()])
+        for h in range(polygon.holes()):
+            hole = _simplify_ring(
+                np.array([(p.x, p.y) for p in polygon.each_point_hole(h)]),
+                tolerance,
+            )
+            if len(hole) >= 3:
+                simplified.insert_hole([kdb.Point(*p) for p in hole.tolist()])
+        result.insert(simplified)
+    return result.merged()
+
+
+# one GDS BOUNDARY element per box: BOUNDARY, LAYER, DATATYPE, XY, ENDEL records
+_gds_box = np.dtype(
+    [
+        ("boundary", ">u2", 2),
+        ("layer", ">u2", 3),
+        ("datatype", ">u2", 3),
+        ("xy_header", ">u2", 2),
+        ("xy", ">i4", 10),
+        ("endel", ">u2", 2),
+    ]
+)
+
+
+def _gds_real8(value: float) -> bytes:
+    """Returns value as a GDS excess-64 base-16 real."""
+    exponent = 64
+    while value >= 1:
+        value /= 16
+        exponent += 1
+    while value < 1 / 16:
+        value *= 16
+        exponent -= 1
+    return bytes([exponent]) + round(value * 2**56).to_bytes(7, "big")
+
+
+_gds_header = b"".join(
+    [
+        struct.pack(">HHh", 6, 0x0002, 600),
+        struct.pack(">HH12h", 28, 0x0102, *[0] * 12),
+        struct.pack(">HH4s", 8, 0x0206, b"BOX\0"),
+        struct.pack(">HH", 20, 0x0305) + _gds_real8(1e-3) + _gds_real8(1e-9),
+        struct.pack(">HH12h", 28, 0x0502, *[0] * 12),
+        struct.pack(">HH4s", 8, 0x0606, b"BOX\0"),
+    ]
+)
+_gds_footer = struct.pack(">HHHH", 4, 0x0700, 4, 0x0400)
+
+
+def boxes_to_region(boxes: np.ndarray) -> kdb.Region:
+    """Returns a Region with the boxes of an (N, 4) array of x0, y0, x1, y1 in dbu.
+
+    Inserting boxes one at a time costs a Python call each. Instead the boxes are
+    written as a GDS stream with NumPy and read by klayout in one call.
+
+    Args:
+        boxes: integer box corners.
+    """
+    records = np.zeros(len(boxes), dtype=_gds_box)
+    records["boundary"] = (4, 0x0800)
+    records["layer"] = (6, 0x0D02, 1)
+    records["datatype"] = (6, 0x0E02, 0)
+    records["xy_header"] = (44, 0x1003)
+    records["endel"] = (4, 0x1100)
+    x0, y0, x1, y1 = np.asarray(boxes, dtype=np.int64).T
+    records["xy"] = np.stack([x0, y0, x1, y0, x1, y1, x0, y1, x0, y0], axis=1)
+
+    layout = kdb.Layout()
+    layout.read_bytes(_gds_header + records.tobytes() + _gds_footer)
+    return kdb.Region(layout.top_cell().shapes(layout.layer(1, 0)))
+
+
+def _from_np_rle(
+    ndarray: np.ndarray,
+    nm_per_pixel: float,
+    threshold: float,
+    invert: bool,
+    tile_rows: int,
+    dbu: float,
+) -> kdb.Region:
+    pitch = nm_per_pixel * 1e-3 / dbu
+    # pixel centers land where find_contours puts them on the padded image
+    offset = round(1.5 * pitch)
+    region = kdb.Region()
+    for row in range(0, ndarray.shape[0], tile_rows):
+        boxes = bitmap_to_boxes(ndarray[row : row + tile_rows] > threshold)
+        boxes[:, [0, 2]] += row
+        boxes = np.rint(boxes * pitch).astype(np.int64) + offset
+        region.insert(boxes_to_region(boxes))
+    region = region.merged()
+    # like the contour method, only the areas enclosed by the mask
+    return region if invert else region.holes().merged()
 
 
 def from_np(
@@ -28,18 +216,68 @@ def from_np(
     layer: tuple[int, int] = (1, 0),
     threshold: float = 0.99,
     invert: bool = True,
+    method: Literal["contour", "rle"] = "contour",
+    tile_rows: int = 1024,
+    simplify: float | None = None,
 ) -> Component:
     """Returns Component from a np.ndarray.
 
-    Extracts contours skimage.measure.find_contours using `threshold`.
+    The contour method extracts contours with skimage.measure.find_contours
+    using `threshold`. The rle method turns the pixels above `threshold` into
+    rectangles, processing `tile_rows` rows at a time, and merges them, which
+    is much faster for large images and keeps holes. Both methods return the
+    same areas, the contours follow the interpolated threshold and the
+    rectangles the pixel edges.
 
     Args:
         ndarray: 2D ndarray representing the device layout.
         nm_per_pixel: scale_factor.
         layer: layer tuple to output gds.
         threshold: value along which to find contours in the array.
-        invert: invert the mask.
+        invert: if True returns the areas above threshold. If False returns the
+            areas below threshold that are enclosed by areas above it.
+        method: contour or rle.
+        tile_rows: rows of the image converted at a time with the rle method.
+        simplify: Douglas-Peucker tolerance in um, None keeps all vertices.
     """
+    from gdsfactory.pdk import get_layer
+
+    if method == "rle":
+        c = Component()
+        region = _from_np_rle(
+            np.asarray(ndarray),
+            nm_per_pixel=nm_per_pixel,
+            threshold=threshold,
+            invert=invert,
+            tile_rows=tile_rows,
+            dbu=c.kcl.dbu,
+        )
+    else:
+        c = _from_np_contour(
+            ndarray,
+            nm_per_pixel=nm_per_pixel,
+            layer=layer,
+            threshold=threshold,
+            invert=invert,
+        )
+        if simplify is None:
+            return c
+        region = kdb.Region(c.begin_shapes_rec(get_layer(layer)))
+        c = Component()
+
+    if simplify:
+        region = simplify_region(region, round(simplify / c.kcl.dbu))
+    c.add_polygon(region, layer=layer)
+    return c
+
+
+def _from_np_contour(
+    ndarray,
+    nm_per_pixel: int,
+    layer: tuple[int, int],
+    threshold: float,
+    invert: bool,
+) -> Component:
     from skimage import measure
 
     c = Component()
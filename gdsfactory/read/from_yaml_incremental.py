@@ -0,0 +1,382 @@
+"""Incremental builds of *.pic.yml netlists.
+
+:func:`gdsfactory.read.from_yaml` rebuilds every instance and route from scratch.
+For large top-level netlists that are edited interactively (``gf watch``) most of
+that work is identical between two saves. :class:`IncrementalYamlBuilder` keeps
+the previous netlist and the instances each YAML entry produced, diffs the new
+netlist against it, and only rebuilds the instances and routes that changed.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+import kfactory as kf
+
+from gdsfactory.add_pins import add_instance_label
+from gdsfactory.component import Component, ComponentReference
+from gdsfactory.read.from_yaml import (
+    _activate_pdk_by_name,
+    _add_labels,
+    _add_ports,
+    _add_routes,
+    _get_dependency_graph,
+    _get_references,
+    _load_yaml_str,
+    _parse_maybe_arrayed_instance,
+    _place_and_connect,
+    _split_route_link,
+)
+from gdsfactory.read.from_yaml_template import (
+    _evaluate_yaml_template,
+    _split_yaml_definition,
+    get_default_settings_dict,
+)
+from gdsfactory.schematic import Netlist
+
+__all__ = ["IncrementalYamlBuilder", "NetlistDiff", "diff_netlists"]
+
+
+@dataclass
+class NetlistDiff:
+    """Differences between two netlists.
+
+    Attributes:
+        added: instance names only present in the new netlist.
+        removed: instance names only present in the old netlist.
+        changed: instances whose component, settings or array parameters changed.
+        placed: instances whose placement or connections changed.
+        routes_added: route bundles only present in the new netlist.
+        routes_removed: route bundles only present in the old netlist.
+        routes_changed: route bundles whose links, settings or strategy changed.
+        ports_changed: True if the exposed ports changed.
+    """
+
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    changed: set[str] = field(default_factory=set)
+    placed: set[str] = field(default_factory=set)
+    routes_added: set[str] = field(default_factory=set)
+    routes_removed: set[str] = field(default_factory=set)
+    routes_changed: set[str] = field(default_factory=set)
+    ports_changed: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.added
+            or self.removed
+            or self.changed
+            or self.placed
+            or self.routes_added
+            or self.routes_removed
+            or self.routes_changed
+            or self.ports_changed
+        )
+
+
+def _connections_by_instance(net: Netlist) -> dict[str, dict[str, str]]:
+    connections: dict[str, dict[str, str]] = {}
+    for ip1, ip2 in net.connections.items():
+        for ip in (ip1, ip2):
+            i, _ = ip.split(",")
+            i, _, _ = _parse_maybe_arrayed_instance(i)
+            connections.setdefault(i, {})[ip1] = ip2
+    return connections
+
+
+def diff_netlists(old: Netlist, new: Netlist) -> NetlistDiff:
+    """Returns the differences between two netlists.
+
+    Args:
+        old: previous netlist.
+        new: new netlist.
+    """
+    d = NetlistDiff()
+    d.added = set(new.instances) - set(old.instances)
+    d.removed = set(old.instances) - set(new.instances)
+    d.changed = {
+        name
+        for name in set(new.instances) & set(old.instances)
+        if new.instances[name].model_dump() != old.instances[name].model_dump()
+    }
+
+    old_connections = _connections_by_instance(old)
+    new_connections = _connections_by_instance(new)
+    for name in set(new.instances) & set(old.instances):
+        old_pl = old.placements.get(name)
+        new_pl = new.placements.get(name)
+        if (old_pl and old_pl.model_dump()) != (new_pl and new_pl.model_dump()):
+            d.placed.add(name)
+        elif old_connections.get(name) != new_connections.get(name):
+            d.placed.add(name)
+
+    d.routes_added = set(new.routes) - set(old.routes)
+    d.routes_removed = set(old.routes) - set(new.routes)
+    d.routes_changed = {
+        name
+        for name in set(new.routes) & set(old.routes)
+        if new.routes[name].model_dump() != old.routes[name].model_dump()
+    }
+    d.ports_changed = new.ports != old.ports
+    return d
+
+
+@dataclass
+class IncrementalUpdate:
+    """Summary of one incremental build.
+
+    Attributes:
+        full: True if the component was rebuilt from scratch.
+        instances_built: names of instances that were (re)created.
+        instances_moved: names of instances whose transformation changed.
+        instances_removed: names of instances that were deleted.
+        routes_built: names of route bundles that were (re)routed.
+        routes_removed: names of route bundles that were deleted.
+        elapsed: build time in seconds.
+    """
+
+    full: bool = False
+    instances_built: set[str] = field(default_factory=set)
+    instances_moved: set[str] = field(default_factory=set)
+    instances_removed: set[str] = field(default_factory=set)
+    routes_built: set[str] = field(default_factory=set)
+    routes_removed: set[str] = field(default_factory=set)
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        mode = "full" if self.full else "incremental"
+        return (
+            f"{mode} build in {self.elapsed:.3f}s: "
+            f"{len(self.instances_built)} instances built, "
+            f"{len(self.instances_moved)} moved, "
+            f"{len(self.instances_removed)} removed, "
+            f"{len(self.routes_built)} routes built, "
+            f"{len(self.routes_removed)} removed"
+        )
+
+
+class IncrementalYamlBuilder:
+    """Builds a Component from a YAML netlist, reusing the previous build.
+
+    Each build records the instances every YAML instance and route bundle produced.
+    On the next build the netlist is diffed against the previous one and only
+    instances with a different component or settings are recreated. All placements
+    are replayed (cheap), and only route bundles whose links touch a rebuilt or moved
+    instance, or whose definition changed, are routed again.
+
+    Route bundles whose routing strategy writes polygons or raw instances directly
+    into the top cell can not be tracked. Their geometry can not be removed on its
+    own, so netlists with such bundles are rebuilt from scratch on every build.
+
+    Args:
+        name: component name. Defaults to the netlist name.
+        routing_strategy: dict of routing functions. Defaults to the PDK ones.
+        label_instance_function: to label each instance.
+
+    .. code::
+
+        builder = IncrementalYamlBuilder()
+        c = builder.build("top.pic.yml")
+        # edit top.pic.yml
+        c = builder.build("top.pic.yml")
+        print(builder.last_update)
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        routing_strategy: dict[str, Callable] | None = None,
+        label_instance_function: Callable = add_instance_label,
+    ) -> None:
+        """Initialize the incremental builder."""
+        self.name = name
+        self.routing_strategy = routing_strategy
+        self.label_instance_function = label_instance_function
+        self.component: Component | None = None
+        self.netlist: Netlist | None = None
+        self.last_update = IncrementalUpdate()
+        self._pdk_name: str | None = None
+        self._refs: dict[str, ComponentReference] = {}
+        self._route_insts: dict[str, list[kf.Instance]] = {}
+        self._route_dicts: dict[str, dict[str, Any]] = {}
+        self._opaque_routes: set[str] = set()
+
+    def reset(self) -> None:
+        """Forgets the previous build. The next build is a full one."""
+        self.component = None
+        self.netlist = None
+        self._refs = {}
+        self._route_insts = {}
+        self._route_dicts = {}
+        self._opaque_routes = set()
+
+    def build(
+        self,
+        yaml_str: str | pathlib.Path | IO[Any] | dict[str, Any],
+        **settings: Any,
+    ) -> Component:
+        """Returns the Component for a YAML netlist, rebuilding only what changed.
+
+        Args:
+            yaml_str: YAML string, dict or *.pic.yml file. Files can be jinja templates
+                with a `default_settings` block.
+            settings: overrides for the `default_settings` of a templated file.
+        """
+        t0 = time.perf_counter()
+        dct = self._load(yaml_str, settings)
+        pdk_name = dct.get("pdk", "")
+        pdk = _activate_pdk_by_name(pdk_name)
+        net = Netlist.model_validate(dct)
+
+        if (
+            self.component is None
+            or self.netlist is None
+            or pdk_name != self._pdk_name
+            or self._opaque_routes
+        ):
+            update = self._build_full(net, pdk)
+        else:
+            update = self._build_incremental(net, pdk)
+
+        self.netlist = net
+        self._pdk_name = pdk_name
+        c = self.component
+        assert c is not None
+        c.name = self.name or net.name or c.name
+        update.elapsed = time.perf_counter() - t0
+        self.last_update = update
+        return c
+
+    def _load(
+        self, yaml_str: str | pathlib.Path | IO[Any] | dict[str, Any], settings: dict
+    ) -> dict[str, Any]:
+        if isinstance(yaml_str, str | pathlib.Path) and str(yaml_str).endswith(
+            ".pic.yml"
+        ):
+            yaml_body, default_settings_def = _split_yaml_definition(yaml_str)
+            default_settings = get_default_settings_dict(default_settings_def)
+            yaml_str = _evaluate_yaml_template(yaml_body, default_settings, settings)
+        return _load_yaml_str(yaml_str)
+
+    def _build_full(self, net: Netlist, pdk) -> IncrementalUpdate:
+        self.reset()
+        c = Component()
+        self.component = c
+        g = _get_dependency_graph(net)
+        self._refs = _get_references(c, pdk, net.instances)
+        _place_and_connect(g, self._refs, net.connections, net.placements)
+        for bundle_name in net.routes:
+            self._route(net, bundle_name)
+        self._finish(net)
+        return IncrementalUpdate(
+            full=True,
+            instances_built=set(self._refs),
+            routes_built=set(net.routes),
+        )
+
+    def _build_incremental(self, net: Netlist, pdk) -> IncrementalUpdate:
+        c = self.component
+        old = self.netlist
+        assert c is not None and old is not None
+        d = diff_netlists(old, net)
+        update = IncrementalUpdate()
+
+        for name in d.removed | d.changed:
+            self._delete_insts([self._refs.pop(name)._kfinst])
+        update.instances_removed = set(d.removed)
+
+        rebuild = {name: net.instances[name] for name in d.added | d.changed}
+        self._refs.update(_get_references(c, pdk, rebuild))
+        update.instances_built = set(rebuild)
+
+        # placements are relative, so replay all of them from the identity
+        old_trans = {name: ref.dcplx_trans for name, ref in self._refs.items()}
+        for ref in self._refs.values():
+            ref.dcplx_trans = kf.kdb.DCplxTrans()
+        g = _get_dependency_graph(net)
+        _place_and_connect(g, self._refs, net.connections, net.placements)
+        update.instances_moved = {
+            name
+            for name, ref in self._refs.items()
+            if name not in rebuild and ref.dcplx_trans != old_trans[name]
+        }
+
+        # polygons and labels in the top cell are regenerated from scratch
+        c._kdb_cell.clear_shapes()
+
+        touched = update.instances_built | update.instances_moved | d.removed
+        for bundle_name in d.routes_removed:
+            self._delete_insts(self._route_insts.pop(bundle_name))
+            self._route_dicts.pop(bundle_name)
+        update.routes_removed = set(d.routes_removed)
+
+        for bundle_name in net.routes:
+            if (
+                bundle_name in d.routes_added
+                or bundle_name in d.routes_changed
+                or self._bundle_instances(net, bundle_name) & touched
+            ):
+                self._delete_insts(self._route_insts.pop(bundle_name, []))
+                self._route(net, bundle_name)
+                update.routes_built.add(bundle_name)
+
+        self._finish(net)
+        return update
+
+    def _finish(self, net: Netlist) -> None:
+        c = self.component
+        assert c is not None
+        c.routes = {  # type: ignore[attr-defined]
+            route_name: route
+            for bundle_name in net.routes
+            for route_name, route in self._route_dicts[bundle_name].items()
+        }
+        c.ports = kf.Ports(kcl=c.kcl)
+        _add_ports(c, self._refs, net.ports)
+        _add_labels(c, self._refs, self.label_instance_function)
+
+    def _route(self, net: Netlist, bundle_name: str) -> None:
+        """Routes one bundle and records the instances it created."""
+        c = self.component
+        assert c is not None
+        n_insts = len(c.insts)
+        n_kdb_insts = c._kdb_cell.child_instances()
+        n_shapes = self._count_shapes()
+        _add_routes(
+            c, self._refs, {bundle_name: net.routes[bundle_name]}, self.routing_strategy
+        )
+        new_insts = list(c.insts)[n_insts:]
+        if (
+            c._kdb_cell.child_instances() - n_kdb_insts != len(new_insts)
+            or self._count_shapes() != n_shapes
+        ):
+            self._opaque_routes.add(bundle_name)
+        self._route_insts[bundle_name] = new_insts
+        self._route_dicts[bundle_name] = dict(getattr(c, "routes", {}))
+
+    def _count_shapes(self) -> int:
+        c = self.component
+        assert c is not None
+        return sum(c._kdb_cell.shapes(li).size() for li in c.kcl.layer_indexes())
+
+    def _delete_insts(self, insts: list[kf.Instance]) -> None:
+        c = self.component
+        assert c is not None
+        for inst in insts:
+            inst._instance.delete()
+            del c.insts[inst]
+
+    @staticmethod
+    def _bundle_instances(net: Netlist, bundle_name: str) -> set[str]:
+        names = set()
+        for ip1, ip2 in net.routes[bundle_name].links.items():
+            for ip in (ip1, ip2):
+                i, _ = _split_route_link(ip)
+                i, _, _ = _parse_maybe_arrayed_instance(i)
+                names.add(i)
+        return names
@@ -11,7 +11,9 @@ from kfactory import cell
 from gdsfactory.component import Component
 from gdsfactory.read.from_yaml import from_yaml
 
-__all__ = ["cell_from_yaml_template"]
+__all__ = ["LazyYamlCell", "cell_from_yaml_template"]
+
+_yaml_cells: dict[tuple[pathlib.Path, str], tuple[tuple[int, int], Callable]] = {}
 
 
 def split_default_settings_from_yaml(yaml_lines: Iterable[str]) -> tuple[str, str]:
@@ -88,6 +90,48 @@ def cell_from_yaml_template(
     )
 
 
+class LazyYamlCell:
+    """Cell function of a *.pic.yml file that is only parsed on first use.
+
+    The parsed cell function is cached by file and cell name, and parsed again when
+    the file modification time or size changes.
+
+    Args:
+        filepath: the filepath of the pic yaml template.
+        name: the name of the component to create.
+    """
+
+    def __init__(self, filepath: str | pathlib.Path, name: str) -> None:
+        """Records the file without reading it."""
+        self.filepath = pathlib.Path(filepath).absolute()
+        self.__name__ = name
+
+    @property
+    def function(self) -> Callable[..., Component]:
+        """Returns the cell function, parsing the file if it is new or changed."""
+        key = (self.filepath, self.__name__)
+        stat = self.filepath.stat()
+        version = stat.st_mtime_ns, stat.st_size
+        cached = _yaml_cells.get(key)
+        if cached is None or cached[0] != version:
+            cached = version, cell_from_yaml_template(self.filepath, name=self.__name__)
+            _yaml_cells[key] = cached
+        return cached[1]
+
+    @property
+    def __signature__(self) -> Signature:
+        """Returns the signature of the cell function."""
+        return signature(self.function)
+
+    def __call__(self, **kwargs) -> Component:
+        """Returns the component."""
+        return self.function(**kwargs)
+
+    def __repr__(self) -> str:
+        """Returns the cell name and file."""
+        return f"LazyYamlCell({self.__name__!r}, {str(self.filepath)!r})"
+
+
 def get_default_settings_dict(default_settings):
     settings = {}
     for k, v in default_settings.items():
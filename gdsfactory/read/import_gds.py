@@ -1,41 +1,126 @@
 from __future__ import annotations
 
+import hashlib
 import warnings
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import kfactory as kf
-from kfactory import KCLayout
+from kfactory import KCLayout, kdb
 
 from gdsfactory.component import Component
+from gdsfactory.layout_format import read_layout_bytes
+
+if TYPE_CHECKING:
+    from gdsfactory.typings import LayerSpec
+
+_import_gds_cache: dict[tuple[Any, ...], Component] = {}
+
+
+def clear_import_gds_cache() -> None:
+    """Clears the import_gds cache."""
+    _import_gds_cache.clear()
+
+
+def get_load_layout_options(
+    layers: Sequence[LayerSpec] | None = None,
+) -> kdb.LoadLayoutOptions:
+    """Returns the options to read a layout, optionally only reading some layers.
+
+    Shapes on layers that are not in `layers` are skipped by the reader,
+    so they never take memory or time.
+
+    Args:
+        layers: layers to read. None reads all layers.
+    """
+    from gdsfactory.pdk import get_layer
+
+    options = kf.kcell.load_layout_options()
+    if layers is not None:
+        layer_map = kdb.LayerMap()
+        for i, layer in enumerate(layers):
+            info = kf.kcl.get_info(get_layer(layer))
+            layer_info = kdb.LayerInfo(info.layer, info.datatype)
+            layer_map.map(layer_info, i, layer_info)
+        options.layer_map = layer_map
+        options.create_other_layers = False
+    return options
+
+
+def _layer_key(
+    layers: Sequence[LayerSpec] | None,
+) -> tuple[tuple[int, int], ...] | None:
+    from gdsfactory.pdk import get_layer
+
+    if layers is None:
+        return None
+    infos = (kf.kcl.get_info(get_layer(layer)) for layer in layers)
+    return tuple(sorted({(info.layer, info.datatype) for info in infos}))
 
 
 def import_gds(
-    gdspath: str | Path,
+    gdspath: str | Path | bytes,
     cellname: str | None = None,
     post_process: Callable[[Component], Component] | None = None,
+    layers: Sequence[LayerSpec] | None = None,
+    cache: bool = False,
     **kwargs,
 ) -> Component:
     """Reads a GDS file and returns a Component.
 
     Args:
-        gdspath: path to GDS file.
+        gdspath: path to a GDS, gzipped GDS or OASIS file, or the file content.
         cellname: name of the cell to return. Defaults to top cell.
+            Only the cell and its children are copied into the Component layout.
         post_process: function to run after reading the GDS file.
+        layers: only read these layers. Defaults to all layers.
+        cache: returns the same Component for repeated imports with the same
+            (gdspath, file modification time, cellname, layers, post_process).
+            The file is only read once. Each call returns a copy of the cached
+            top cell, sharing its child cells.
         kwargs: deprecated and ignored.
     """
     if kwargs:
         for k in kwargs:
             warnings.warn(f"kwargs {k!r} is deprecated and ignored")
 
-    temp_kcl = KCLayout(name=str(gdspath))
-    temp_kcl.read(gdspath)
+    options = get_load_layout_options(layers)
+    key = None
+    if cache:
+        if isinstance(gdspath, bytes):
+            source: tuple[Any, ...] = (hashlib.sha256(gdspath).hexdigest(),)
+        else:
+            gdspath = Path(gdspath).resolve()
+            source = (str(gdspath), gdspath.stat().st_mtime_ns)
+        key = (*source, cellname, _layer_key(layers), post_process)
+        c = _import_gds_cache.get(key)
+        if c is not None and not c._kdb_cell._destroyed():
+            return _dup(c)
+
+    if isinstance(gdspath, bytes):
+        temp_kcl = KCLayout(name=f"bytes_{hashlib.sha256(gdspath).hexdigest()[:8]}")
+        read_layout_bytes(temp_kcl.layout, gdspath, options)
+    else:
+        temp_kcl = KCLayout(name=str(gdspath))
+        temp_kcl.read(gdspath, options=options)
     cellname = cellname or temp_kcl.top_cell().name
     kcell = temp_kcl[cellname]
     c = kcell_to_component(kcell)
 
     if post_process:
         post_process(c)
+
+    if key is not None:
+        c._locked = True
+        _import_gds_cache[key] = c
+        return _dup(c)
+    return c
+
+
+def _dup(component: Component) -> Component:
+    c = component.dup()
+    c.name = component.name
     return c
 
 
@@ -59,7 +144,7 @@ def import_gds_with_conflicts(
     """Reads a GDS file and returns a Component.
 
     Args:
-        gdspath: path to GDS file.
+        gdspath: path to a GDS, gzipped GDS or OASIS file, or the file content.
         cellname: name of the cell to return. Defaults to top cell.
         name: optional name.
         kwargs: deprecated and ignored.
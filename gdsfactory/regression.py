@@ -0,0 +1,434 @@
+"""Parallel, cached regression of all the cells of a PDK.
+
+`tests/components/test_components.py` builds each cell and runs `difftest` and
+`data_regression` serially. `run_regression` builds the cells of `Pdk.cells` in a
+process pool, writes a GDS and a settings YAML file per cell and compares them
+with a reference directory using the geometry hashes of `gdsfactory.cell_hash`.
+
+Cells whose function source file did not change since the last passing run are
+skipped. The source and geometry hashes are kept in a `regression.json` manifest
+next to the results.
+
+.. code::
+
+    import gdsfactory as gf
+
+    report = gf.regression.run_regression(dirpath_ref=gf.PATH.gds_ref)
+    print(report)
+    report.write_junit("regression.xml")
+
+Or from the command line::
+
+    gf build-all --ref gds_ref --junit-xml regression.xml
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Literal
+
+import yaml
+
+from gdsfactory.config import __version__
+from gdsfactory.typings import PathType
+
+if TYPE_CHECKING:
+    from gdsfactory.pdk import Pdk
+
+Status = Literal["passed", "failed", "new", "skipped", "error"]
+manifest_name = "regression.json"
+
+
+@dataclass
+class CellResult:
+    """Regression result of one cell.
+
+    Attributes:
+        name: cell name in `Pdk.cells`.
+        status: passed, failed (differs from the reference), new (no reference),
+            skipped (source unchanged since the last passing run) or error.
+        time: build and compare time in seconds.
+        message: reason of the failure, or traceback of the error.
+        source_hash: hash of the source file of the cell function.
+        geometry_hash: geometry hash of the cell and its children.
+    """
+
+    name: str
+    status: Status
+    time: float = 0.0
+    message: str = ""
+    source_hash: str | None = None
+    geometry_hash: str | None = None
+
+
+@dataclass
+class RegressionReport:
+    """Result of :func:`run_regression`.
+
+    Attributes:
+        results: one result per cell, sorted by name.
+        total_time: wall time in seconds.
+    """
+
+    results: list[CellResult] = field(default_factory=list)
+    total_time: float = 0.0
+
+    @property
+    def failed(self) -> list[CellResult]:
+        """Returns the cells that differ from their reference or failed to build."""
+        return [r for r in self.results if r.status in ("failed", "error")]
+
+    def count(self, status: Status) -> int:
+        """Returns the number of cells with a status."""
+        return sum(r.status == status for r in self.results)
+
+    def write_junit(self, filepath: PathType, name: str = "regression") -> pathlib.Path:
+        """Writes a JUnit XML report.
+
+        New cells are reported as skipped, as they have no reference to compare to.
+
+        Args:
+            filepath: XML file to write.
+            name: test suite name.
+        """
+        filepath = pathlib.Path(filepath)
+        suite = ET.Element(
+            "testsuite",
+            name=name,
+            tests=str(len(self.results)),
+            failures=str(self.count("failed")),
+            errors=str(self.count("error")),
+            skipped=str(self.count("skipped") + self.count("new")),
+            time=f"{self.total_time:.3f}",
+        )
+        for r in self.results:
+            case = ET.SubElement(
+                suite, "testcase", classname=name, name=r.name, time=f"{r.time:.3f}"
+            )
+            if r.status == "failed":
+                ET.SubElement(case, "failure", message=r.message).text = r.message
+            elif r.status == "error":
+                message = r.message.strip().splitlines()[-1] if r.message else ""
+                ET.SubElement(case, "error", message=message).text = r.message
+            elif r.status in ("skipped", "new"):
+                ET.SubElement(case, "skipped", message=r.message)
+        root = ET.Element("testsuites")
+        root.append(suite)
+        ET.indent(root)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        ET.ElementTree(root).write(filepath, encoding="utf-8", xml_declaration=True)
+        return filepath
+
+    def __str__(self) -> str:
+        """Returns a summary with the failed cells."""
+        counts = ", ".join(
+            f"{self.count(status)} {status}"
+            for status in ("passed", "failed", "new", "skipped", "error")
+        )
+        lines = [f"{len(self.results)} cells in {self.total_time:.1f}s: {counts}"]
+        lines += [
+            f"{r.status.upper():<7} {r.name}: {r.message.strip().splitlines()[-1]}"
+            for r in self.failed
+            if r.message
+        ]
+        return "\n".join(lines)
+
+
+def get_source_hash(function: Callable) -> str | None:
+    """Returns a hash of the source file and bound arguments of a cell function.
+
+    Partials are unwrapped and their arguments hashed too. Returns None if the
+    source is not available, for example for functions defined in a notebook.
+
+    Args:
+        function: cell function, partial or `LazyYamlCell`.
+    """
+    from gdsfactory.read.from_yaml_template import LazyYamlCell
+    from gdsfactory.serialization import clean_value_json
+
+    h = hashlib.sha256()
+    while isinstance(function, partial):
+        bound = clean_value_json({"args": function.args, "kwargs": function.keywords})
+        h.update(json.dumps(bound, sort_keys=True).encode())
+        function = function.func
+
+    if isinstance(function, LazyYamlCell):
+        filepath = function.filepath
+    else:
+        function = inspect.unwrap(function)
+        try:
+            filepath = pathlib.Path(inspect.getsourcefile(function) or "")
+        except TypeError:
+            return None
+        h.update(getattr(function, "__qualname__", "").encode())
+    if not filepath.is_file():
+        return None
+    h.update(filepath.read_bytes())
+    return h.hexdigest()
+
+
+def _reference_stamp(dirpath_ref: pathlib.Path | None, name: str) -> list[int] | None:
+    """Returns size and modification time of the reference files of a cell."""
+    if dirpath_ref is None:
+        return None
+    stamp = []
+    for suffix in (".gds", ".yml"):
+        filepath = dirpath_ref / f"{name}{suffix}"
+        if filepath.exists():
+            stat = filepath.stat()
+            stamp += [stat.st_size, stat.st_mtime_ns]
+    return stamp or None
+
+
+def _init_worker(pdk: str) -> None:
+    """Activates the PDK in a worker process."""
+    from gdsfactory.read.from_yaml import _activate_pdk_by_name
+
+    _activate_pdk_by_name(pdk)
+
+
+def _worker_cells() -> list[str]:
+    """Returns the cell names of the PDK of a worker process."""
+    from gdsfactory.pdk import get_active_pdk
+
+    return list(get_active_pdk().cells)
+
+
+def get_pdk_module_name(pdk: Pdk) -> str | None:
+    """Returns the name of an imported module that defines pdk as PDK.
+
+    Returns generic for the generic PDK and None if pdk was not found, for
+    example for a PDK created in a notebook.
+
+    Args:
+        pdk: PDK to look up.
+    """
+    from gdsfactory.generic_tech import get_generic_pdk
+
+    if pdk is get_generic_pdk():
+        return "generic"
+    for name, module in list(sys.modules.items()):
+        if name != "__main__" and vars(module).get("PDK") is pdk:
+            return name
+    return None
+
+
+def _is_importable(function: Callable | None) -> bool:
+    """Returns False for cells that only exist in this process."""
+    from gdsfactory.read.from_yaml_template import LazyYamlCell
+
+    while isinstance(function, partial):
+        function = function.func
+    if function is None or isinstance(function, LazyYamlCell):
+        return False
+    function = inspect.unwrap(function)
+    return getattr(function, "__module__", "__main__") != "__main__"
+
+
+def build_cell(
+    name: str,
+    dirpath: PathType,
+    dirpath_ref: PathType | None = None,
+    ignore_cell_name_differences: bool = False,
+) -> CellResult:
+    """Builds a cell of the active PDK, writes it and compares it to its reference.
+
+    Writes `{name}.gds` and the settings in `{name}.yml` into dirpath. Errors are
+    returned as a result with status error and the traceback as message.
+
+    Args:
+        name: cell name in `Pdk.cells`.
+        dirpath: directory to write the GDS and settings to.
+        dirpath_ref: directory with the reference `{name}.gds` and `{name}.yml`.
+        ignore_cell_name_differences: only compare the geometry of the top cell.
+    """
+    from gdsfactory.cell_hash import get_tree_hashes
+    from gdsfactory.difftest import get_ref_hashes, same_geometry
+    from gdsfactory.pdk import get_active_pdk
+    from gdsfactory.serialization import clean_value_json
+
+    t0 = time.time()
+    dirpath = pathlib.Path(dirpath)
+    try:
+        component = get_active_pdk().get_component(name)
+        component.write_gds(dirpath / f"{name}.gds")
+        settings = yaml.safe_dump(clean_value_json(component.to_dict()))
+        (dirpath / f"{name}.yml").write_text(settings)
+        run_hashes = get_tree_hashes(component._kdb_cell)
+        result = CellResult(
+            name=name, status="passed", geometry_hash=run_hashes[component.name][0]
+        )
+
+        if dirpath_ref is None:
+            result.status = "new"
+            result.message = "no reference directory"
+        elif not (pathlib.Path(dirpath_ref) / f"{name}.gds").exists():
+            result.status = "new"
+            result.message = f"no reference {name}.gds"
+        else:
+            dirpath_ref = pathlib.Path(dirpath_ref)
+            ref_top, ref_hashes = get_ref_hashes(dirpath_ref / f"{name}.gds")
+            ref_settings = dirpath_ref / f"{name}.yml"
+            if not same_geometry(
+                ref_hashes,
+                run_hashes,
+                ref_top,
+                component.name,
+                ignore_cell_name_differences=ignore_cell_name_differences,
+            ):
+                result.status = "failed"
+                result.message = f"geometry of {component.name!r} changed"
+            elif ref_settings.exists() and ref_settings.read_text() != settings:
+                result.status = "failed"
+                result.message = f"settings of {component.name!r} changed"
+    except Exception:
+        result = CellResult(name=name, status="error", message=traceback.format_exc())
+    result.time = time.time() - t0
+    return result
+
+
+def run_regression(
+    cells: Iterable[str] | None = None,
+    dirpath: PathType = "build/regression",
+    dirpath_ref: PathType | None = None,
+    skip: Iterable[str] = (),
+    max_workers: int | None = None,
+    force: bool = False,
+    pdk: str | None = None,
+    ignore_cell_name_differences: bool = False,
+    junit_xml: PathType | None = None,
+) -> RegressionReport:
+    """Builds the cells of the active PDK in parallel and compares them to references.
+
+    Worker processes import and activate the PDK by module name. Cells that only
+    exist in this process, such as YAML cells, notebook functions or cells
+    registered after the PDK was imported, are built in this process.
+
+    A cell is skipped when the source file of its function, its reference files
+    and the gdsfactory version are the same as in the last run where it passed.
+    Changes in other modules the cell depends on are not detected: use force
+    after changing shared code such as cross-sections.
+
+    Args:
+        cells: names of the cells to build. Defaults to all `Pdk.cells`.
+        dirpath: directory for the GDS, settings and the `regression.json` manifest.
+        dirpath_ref: directory with the reference `{name}.gds` and `{name}.yml`.
+        skip: names of cells to leave out.
+        max_workers: number of worker processes. Defaults to the number of CPUs.
+            0 builds in the current process.
+        force: rebuilds all cells, even the unchanged ones.
+        pdk: importable module with a PDK, or generic, to activate here and in
+            the worker processes. Defaults to the active PDK.
+        ignore_cell_name_differences: only compare the geometry of the top cells.
+        junit_xml: optional JUnit XML file to write the report to.
+    """
+    from gdsfactory.pdk import get_active_pdk
+    from gdsfactory.read.from_yaml import _activate_pdk_by_name
+
+    t0 = time.time()
+    active_pdk = _activate_pdk_by_name(pdk) if pdk else get_active_pdk()
+    dirpath = pathlib.Path(dirpath)
+    dirpath.mkdir(parents=True, exist_ok=True)
+    dirpath_ref = pathlib.Path(dirpath_ref) if dirpath_ref is not None else None
+    names = sorted(set(cells or active_pdk.cells) - set(skip))
+
+    manifest_path = dirpath / manifest_name
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("version") != __version__:
+        manifest = {"version": __version__, "cells": {}}
+
+    results: dict[str, CellResult] = {}
+    stamps: dict[str, list[int] | None] = {}
+    to_build: list[str] = []
+    for name in names:
+        function = active_pdk.cells.get(name)
+        source_hash = get_source_hash(function) if function else None
+        stamps[name] = _reference_stamp(dirpath_ref, name)
+        previous = manifest["cells"].get(name, {})
+        if (
+            not force
+            and source_hash is not None
+            and previous.get("status") == "passed"
+            and previous.get("source_hash") == source_hash
+            and previous.get("reference") == stamps[name]
+            and (dirpath / f"{name}.gds").exists()
+        ):
+            results[name] = CellResult(
+                name=name,
+                status="skipped",
+                message="source unchanged",
+                source_hash=source_hash,
+                geometry_hash=previous.get("geometry_hash"),
+            )
+        else:
+            results[name] = CellResult(
+                name=name, status="error", source_hash=source_hash
+            )
+            to_build.append(name)
+
+    args = (dirpath, dirpath_ref, ignore_cell_name_differences)
+    local = [
+        name for name in to_build if not _is_importable(active_pdk.cells.get(name))
+    ]
+    remote = [name for name in to_build if name not in local]
+    built = []
+    if remote and max_workers != 0:
+        module = pdk or get_pdk_module_name(active_pdk)
+        if module is None:
+            raise ValueError(
+                f"PDK {active_pdk.name!r} is not defined as PDK in an imported "
+                "module, so worker processes can not activate it. Pass the module "
+                "name as pdk, or max_workers=0 to build in this process."
+            )
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(module,),
+        ) as executor:
+            # cells registered at runtime are missing from the worker PDK
+            worker_cells = set(executor.submit(_worker_cells).result())
+            local += [name for name in remote if name not in worker_cells]
+            futures = [
+                executor.submit(build_cell, name, *args)
+                for name in remote
+                if name in worker_cells
+            ]
+            built += [build_cell(name, *args) for name in local]
+            built += [future.result() for future in as_completed(futures)]
+    else:
+        built += [build_cell(name, *args) for name in to_build]
+
+    for result in built:
+        result.source_hash = results[result.name].source_hash
+        results[result.name] = result
+
+    for name, result in results.items():
+        if result.status != "skipped":
+            manifest["cells"][name] = {
+                "status": result.status,
+                "source_hash": result.source_hash,
+                "geometry_hash": result.geometry_hash,
+                "reference": stamps[name],
+            }
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    report = RegressionReport(
+        results=[results[name] for name in names], total_time=time.time() - t0
+    )
+    if junit_xml:
+        report.write_junit(junit_xml)
+    return report
@@ -22,6 +22,7 @@ from gdsfactory.components.straight import straight as straight_function
 from gdsfactory.components.wire import wire_corner
 from gdsfactory.port import Port
 from gdsfactory.routing.sort_ports import get_port_x, get_port_y
+from gdsfactory.tracing import traced
 from gdsfactory.typings import (
     Component,
     ComponentSpec,
@@ -79,6 +80,7 @@ def get_min_spacing(
     return (max_j - min_j) * separation + 2 * radius + 1.0
 
 
+@traced(category="route")
 def route_bundle(
     component: Component,
     ports1: list[Port],
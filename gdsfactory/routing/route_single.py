@@ -36,6 +36,7 @@ from gdsfactory.component import Component
 from gdsfactory.components.bend_euler import bend_euler
 from gdsfactory.components.straight import straight as straight_function
 from gdsfactory.port import Port
+from gdsfactory.tracing import traced
 from gdsfactory.typings import (
     ComponentSpec,
     Coordinates,
@@ -45,6 +46,7 @@ from gdsfactory.typings import (
 )
 
 
+@traced(category="route")
 def route_single(
     component: Component,
     port1: Port,
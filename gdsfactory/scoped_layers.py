@@ -0,0 +1,182 @@
+"""Hierarchy-scoped, copy-on-write layer removal, remapping and copying.
+
+`Component.remove_layers(recursive=True)` clears the layer in every cell of the
+layout and `remap_layers(recursive=True)` edits the shared child cells in place,
+which changes every other component using them. Here the child cells that draw
+on an edited layer, and their parents up to the component, are copied once into
+variants, the instances are rewired to the variants and the layer edits run in
+bulk on the component and its variants only.
+
+.. code::
+
+    import gdsfactory as gf
+    from gdsfactory.scoped_layers import remove_layers
+
+    c = gf.components.mzi().dup()
+    remove_layers(c, layers=["WG"])  # gf.components.bend_euler() keeps its WG
+    c2 = remove_layers(gf.components.mzi(), layers=["WG"])  # a copy of the mzi
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from kfactory import kdb
+
+from gdsfactory.component import Component
+from gdsfactory.typings import LayerSpec, LayerSpecs
+
+
+def edit_layers(
+    component: Component,
+    remove: LayerSpecs = (),
+    remap: dict[LayerSpec, LayerSpec] | None = None,
+    copy: dict[LayerSpec, LayerSpec] | None = None,
+) -> Component:
+    """Edits layers of a component and its hierarchy without touching shared cells.
+
+    Copies are applied first, then remaps and then removals. Child cells with
+    shapes on an edited layer, and the cells instancing them, are replaced by
+    variants named `{cell_name}_L{hash}`. Variants of locked cells are reused by
+    later edits with the same layers, unlocked cells may have changed and are
+    copied again on every call. The component itself is edited in place unless it is
+    locked, for example a cached cell. Then a locked variant of it is returned.
+
+    Args:
+        component: to edit.
+        remove: layers to remove.
+        remap: maps source layers to the layers their shapes are moved to.
+        copy: maps source layers to the layers their shapes are copied to.
+    """
+    from gdsfactory.pdk import get_layer
+
+    remove_indexes = [get_layer(layer) for layer in remove]
+    remap_indexes = [(get_layer(s), get_layer(d)) for s, d in (remap or {}).items()]
+    copy_indexes = [(get_layer(s), get_layer(d)) for s, d in (copy or {}).items()]
+    sources = (
+        set(remove_indexes)
+        | {s for s, _ in remap_indexes}
+        | {s for s, _ in copy_indexes}
+    )
+    if not sources:
+        return component
+
+    kcl = component.kcl
+    layout = component._kdb_cell.layout()
+    info = (
+        f"{[kcl.get_info(i) for i in remove_indexes]}"
+        f"{[(kcl.get_info(s), kcl.get_info(d)) for s, d in remap_indexes]}"
+        f"{[(kcl.get_info(s), kcl.get_info(d)) for s, d in copy_indexes]}"
+    )
+    suffix = "_L" + hashlib.md5(info.encode()).hexdigest()[:8]
+
+    # bottom-up, so that the variants of the children exist before their parents
+    called = set(component._kdb_cell.called_cells())
+    cells = [ci for ci in layout.each_cell_bottom_up() if ci in called]
+    variants: dict[int, int] = {}
+    # variants made in this call, their parents can not reuse an older variant
+    fresh: set[int] = set()
+    for ci in cells:
+        cell = layout.cell(ci)
+        if not any(not cell.shapes(li).is_empty() for li in sources) and not any(
+            child in variants for child in cell.each_child_cell()
+        ):
+            continue
+        kcell = kcl.kcells.get(ci)
+        reusable = (
+            kcell is not None
+            and kcell._locked
+            and not any(child in fresh for child in cell.each_child_cell())
+        )
+        existing = layout.cell(f"{cell.name}{suffix}")
+        if existing is not None and reusable:
+            variants[ci] = existing.cell_index()
+            continue
+        variant = kcl[ci].dup()
+        variant.name = _unique_name(layout, f"{cell.name}{suffix}")
+        _rewire(variant._kdb_cell, variants)
+        _apply(variant._kdb_cell, remove_indexes, remap_indexes, copy_indexes)
+        variant._locked = True
+        variants[ci] = variant.cell_index()
+        fresh.add(ci)
+
+    if component._locked:
+        name = f"{component.name}{suffix}"
+        existing = layout.cell(name)
+        if existing is not None and not any(
+            child in fresh for child in component._kdb_cell.each_child_cell()
+        ):
+            return kcl[existing.cell_index()]
+        top = component.dup()
+        top.name = _unique_name(layout, name)
+        _rewire(top._kdb_cell, variants)
+        _apply(top._kdb_cell, remove_indexes, remap_indexes, copy_indexes)
+        top._locked = True
+        return top
+
+    _rewire(component._kdb_cell, variants)
+    _apply(component._kdb_cell, remove_indexes, remap_indexes, copy_indexes)
+    return component
+
+
+def _unique_name(layout: kdb.Layout, name: str) -> str:
+    i = 0
+    unique = name
+    while layout.cell(unique) is not None:
+        i += 1
+        unique = f"{name}_{i}"
+    return unique
+
+
+def _rewire(cell: kdb.Cell, variants: dict[int, int]) -> None:
+    for inst in cell.each_inst():
+        if inst.cell_index in variants:
+            inst.cell_index = variants[inst.cell_index]
+
+
+def _apply(
+    cell: kdb.Cell,
+    remove: list[int],
+    remap: list[tuple[int, int]],
+    copy: list[tuple[int, int]],
+) -> None:
+    for src, dst in copy:
+        cell.copy(src, dst)
+    for src, dst in remap:
+        cell.move(src, dst)
+    for layer_index in remove:
+        cell.shapes(layer_index).clear()
+
+
+def remove_layers(component: Component, layers: LayerSpecs) -> Component:
+    """Removes layers from a component and its hierarchy, copying shared cells.
+
+    Args:
+        component: to edit.
+        layers: layers to remove.
+    """
+    return edit_layers(component, remove=layers)
+
+
+def remap_layers(
+    component: Component, layer_map: dict[LayerSpec, LayerSpec]
+) -> Component:
+    """Moves shapes between layers in a component and its hierarchy, copying shared cells.
+
+    Args:
+        component: to edit.
+        layer_map: maps source layers to destination layers.
+    """
+    return edit_layers(component, remap=layer_map)
+
+
+def copy_layers(
+    component: Component, layer_map: dict[LayerSpec, LayerSpec]
+) -> Component:
+    """Copies shapes between layers in a component and its hierarchy, copying shared cells.
+
+    Args:
+        component: to edit.
+        layer_map: maps source layers to destination layers.
+    """
+    return edit_layers(component, copy=layer_map)
@@ -12,13 +12,19 @@ from typing import Any
 import kfactory as kf
 import numpy as np
 import orjson
-import pydantic
 import toolz
 from omegaconf import DictConfig, OmegaConf
+from pydantic import BaseModel
 
 DEFAULT_SERIALIZATION_MAX_DIGITS = 3
 """By default, the maximum number of digits retained when serializing float-like arrays"""
 
+_primitive_types = (str, int, bool, type(None))
+_frozen_models: dict[tuple[BaseModel, bool], Any] = {}
+_partials: dict[tuple, Any] = {}
+_layers: dict[tuple[type, kf.LayerEnum], str] = {}
+_max_cached_models = 10_000
+
 
 def get_string(value: Any) -> str:
     try:
@@ -41,14 +47,49 @@ def complex_encoder(obj, digits=DEFAULT_SERIALIZATION_MAX_DIGITS):
     return {"real": real_part, "imag": imag_part}
 
 
+def _copy(value: Any) -> Any:
+    """Returns a copy of the dicts in a cleaned value, so cached values stay intact."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, tuple | list) and any(
+        isinstance(v, dict | tuple | list) for v in value
+    ):
+        return type(value)(_copy(v) for v in value)
+    return value
+
+
+@functools.cache
+def _path_type() -> type:
+    from gdsfactory.path import Path
+
+    return Path
+
+
 def clean_value_json(
     value: Any, include_module: bool = True
 ) -> str | int | float | dict | list | bool | None:
-    """Return JSON serializable object."""
-    from gdsfactory.path import Path
+    """Return JSON serializable object.
+
+    The cleaned values of frozen models (CrossSection, Section ...), partials and
+    layers are cached.
+    """
+    if type(value) in _primitive_types:
+        return value
 
-    if isinstance(value, pydantic.BaseModel):
-        return clean_dict(value.model_dump(exclude_none=True))
+    elif isinstance(value, BaseModel):
+        if not value.model_config.get("frozen"):
+            return clean_dict(value.model_dump(exclude_none=True))
+        try:
+            key = (value, include_module)
+            cleaned = _frozen_models.get(key)
+        except TypeError:  # unhashable field values
+            return clean_dict(value.model_dump(exclude_none=True))
+        if cleaned is None:
+            cleaned = clean_dict(value.model_dump(exclude_none=True))
+            if len(_frozen_models) >= _max_cached_models:
+                _frozen_models.clear()
+            _frozen_models[key] = cleaned
+        return _copy(cleaned)
 
     elif hasattr(value, "get_component_spec"):
         return value.get_component_spec()
@@ -57,7 +98,11 @@ def clean_value_json(
         return value
 
     elif isinstance(value, kf.LayerEnum):
-        return str(value)
+        key = (type(value), value)
+        name = _layers.get(key)
+        if name is None:
+            name = _layers[key] = str(value)
+        return name
 
     elif isinstance(value, np.integer | int):
         return int(value)
@@ -72,10 +117,28 @@ def clean_value_json(
 
     elif isinstance(value, np.ndarray):
         value = np.round(value, DEFAULT_SERIALIZATION_MAX_DIGITS)
+        if value.dtype.kind in "biu" or np.isfinite(value).all():
+            return value.tolist()
         return orjson.loads(orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY))
 
     elif callable(value) and isinstance(value, functools.partial):
-        return clean_value_partial(value, include_module)
+        # keyed on the arguments, so partials with mutated keywords are not stale
+        try:
+            key = (
+                value.func,
+                tuple((type(v), v) for v in value.args),
+                tuple((k, type(v), v) for k, v in value.keywords.items()),
+                include_module,
+            )
+            cleaned = _partials.get(key)
+        except TypeError:  # unhashable arguments
+            return clean_value_partial(value, include_module)
+        if cleaned is None:
+            cleaned = clean_value_partial(value, include_module)
+            if len(_partials) >= _max_cached_models:
+                _partials.clear()
+            _partials[key] = cleaned
+        return _copy(cleaned)
     elif hasattr(value, "to_dict"):
         return clean_dict(value.to_dict())
 
@@ -91,7 +154,7 @@ def clean_value_json(
             else {"function": value.__name__}
         )
 
-    elif isinstance(value, Path):
+    elif isinstance(value, _path_type()):
         return value.hash_geometry()
 
     elif isinstance(value, pathlib.Path):
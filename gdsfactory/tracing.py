@@ -0,0 +1,280 @@
+"""Opt-in tracing of cell builds.
+
+Records for each cell function the number of calls, cache hits and builds, the
+inclusive and exclusive time and the shapes and instances created. Cross-section
+resolution, extrusion and routing are traced as well.
+
+.. code::
+
+    import gdsfactory as gf
+    from gdsfactory.tracing import trace
+
+    with trace() as tracer:
+        gf.components.mzi()
+
+    print(tracer.summary())
+    tracer.write_chrome_trace("mzi.trace.json")
+
+The trace JSON opens in chrome://tracing, https://ui.perfetto.dev or
+https://www.speedscope.app as a flame graph.
+
+Setting the environment variable `GDSFACTORY_TRACE=mzi.trace.json` traces the
+whole process, prints the summary and writes the trace on exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Stats:
+    """Accumulated statistics of one traced function.
+
+    Attributes:
+        name: function name.
+        category: cell, cross_section, extrude or route.
+        calls: number of calls.
+        builds: number of calls that ran the cell function (cache misses).
+        inclusive: time in seconds including nested traced calls.
+        exclusive: time in seconds excluding nested traced calls.
+        shapes: shapes in the cells built.
+        instances: instances in the cells built.
+    """
+
+    name: str
+    category: str
+    calls: int = 0
+    builds: int = 0
+    inclusive: float = 0.0
+    exclusive: float = 0.0
+    shapes: int = 0
+    instances: int = 0
+
+    @property
+    def cache_hits(self) -> int:
+        """Returns the number of calls served from the cell cache."""
+        return self.calls - self.builds if self.category == "cell" else 0
+
+
+@dataclass
+class _Frame:
+    name: str
+    children: int = 0
+    built: bool = False
+
+
+@dataclass
+class Tracer:
+    """Collects statistics and trace events of traced calls.
+
+    Attributes:
+        stats: statistics per function name.
+        events: Chrome trace events.
+    """
+
+    stats: dict[str, Stats] = field(default_factory=dict)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    _start: int = field(default_factory=time.perf_counter_ns)
+    _local: threading.local = field(default_factory=threading.local)
+
+    def _stack(self) -> list[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def call(
+        self,
+        name: str,
+        category: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Calls func and records it."""
+        stack = self._stack()
+        frame = _Frame(name)
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            stack.pop()
+            if stack:
+                stack[-1].children += duration
+
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = Stats(name=name, category=category)
+        stats.calls += 1
+        stats.inclusive += duration * 1e-9
+        stats.exclusive += (duration - frame.children) * 1e-9
+        args_event: dict[str, Any] = {}
+        if frame.built:
+            stats.builds += 1
+            kdb_cell = getattr(result, "_kdb_cell", None)
+            if kdb_cell is not None:
+                shapes = sum(
+                    kdb_cell.shapes(layer).size()
+                    for layer in kdb_cell.layout().layer_indexes()
+                )
+                instances = kdb_cell.child_instances()
+                stats.shapes += shapes
+                stats.instances += instances
+                args_event = dict(
+                    cell=kdb_cell.name, shapes=shapes, instances=instances
+                )
+
+        self.events.append(
+            dict(
+                name=name,
+                cat="cache" if category == "cell" and not frame.built else category,
+                ph="X",
+                ts=(start - self._start) / 1e3,
+                dur=duration / 1e3,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+                args=args_event,
+            )
+        )
+        return result
+
+    def mark_build(self) -> None:
+        """Marks the current cell call as a build (cache miss)."""
+        stack = self._stack()
+        if stack:
+            stack[-1].built = True
+
+    def summary(self, sort_by: str = "exclusive", limit: int | None = None) -> str:
+        """Returns a table with the statistics per function.
+
+        Args:
+            sort_by: Stats attribute to sort by, in descending order.
+            limit: maximum number of rows.
+        """
+        rows = sorted(
+            self.stats.values(), key=lambda s: getattr(s, sort_by), reverse=True
+        )[:limit]
+        width = max([len(s.name) for s in rows] + [4])
+        lines = [
+            f"{'name':<{width}} {'category':<13} {'calls':>7} {'builds':>7} "
+            f"{'hits':>7} {'incl(ms)':>10} {'excl(ms)':>10} {'shapes':>8} "
+            f"{'insts':>7}"
+        ]
+        lines.extend(
+            f"{s.name:<{width}} {s.category:<13} {s.calls:>7} {s.builds:>7} "
+            f"{s.cache_hits:>7} {s.inclusive * 1e3:>10.2f} "
+            f"{s.exclusive * 1e3:>10.2f} {s.shapes:>8} {s.instances:>7}"
+            for s in rows
+        )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, filepath: str | pathlib.Path) -> pathlib.Path:
+        """Writes the events in Chrome trace format.
+
+        Args:
+            filepath: json file to write.
+        """
+        filepath = pathlib.Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(
+            json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"})
+        )
+        return filepath
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer | None:
+    """Returns the active tracer, None if tracing is off."""
+    return _tracer
+
+
+@contextmanager
+def trace(tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Traces cell builds inside the context.
+
+    Args:
+        tracer: to add the records to. Defaults to a new one.
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = tracer or Tracer()
+    try:
+        yield _tracer
+    finally:
+        _tracer = previous
+
+
+def traced(
+    func: F | None = None, *, category: str = "function", name: str | None = None
+) -> Any:
+    """Decorator that records calls of func while tracing is on.
+
+    Args:
+        func: function to trace.
+        category: shown in the summary and the trace.
+        name: defaults to the function name.
+    """
+
+    def decorator(func: F) -> F:
+        func_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            return _tracer.call(func_name, category, func, args, kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator if func is None else decorator(func)
+
+
+def traced_cell(
+    cell_decorator: Callable[[F], F], func: F, name: str | None = None
+) -> F:
+    """Returns func decorated by cell_decorator with tracing of calls and builds.
+
+    Args:
+        cell_decorator: caching cell decorator.
+        func: cell function.
+        name: defaults to the function name.
+    """
+
+    @functools.wraps(func)
+    def build(*args: Any, **kwargs: Any) -> Any:
+        if _tracer is not None:
+            _tracer.mark_build()
+        return func(*args, **kwargs)
+
+    return traced(cell_decorator(build), category="cell", name=name)
+
+
+def _trace_process(filepath: str) -> None:
+    global _tracer
+    tracer = _tracer = Tracer()
+
+    def write() -> None:
+        print(tracer.summary(limit=50))
+        print(f"Wrote {tracer.write_chrome_trace(filepath)}")
+
+    atexit.register(write)
+
+
+if os.environ.get("GDSFACTORY_TRACE"):
+    _trace_process(os.environ["GDSFACTORY_TRACE"])
@@ -3,37 +3,135 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import pathlib
 import sys
 import threading
 import time
 import traceback
 from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 
+import kfactory as kf
 from IPython.terminal.embed import embed
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
-from gdsfactory.config import cwd
+from gdsfactory.config import GDSDIR_TEMP, cwd
 from gdsfactory.pdk import get_active_pdk
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
+from gdsfactory.read.from_yaml_incremental import IncrementalYamlBuilder
+from gdsfactory.read.from_yaml_template import LazyYamlCell
 from gdsfactory.typings import ComponentSpec, PathType
 
+_builders: dict[str, IncrementalYamlBuilder] = {}
 
-class FileWatcher(FileSystemEventHandler):
-    """Captures *.py or *.pic.yml file change events."""
 
-    def __init__(self, logger=None, path: str | None = None) -> None:
+def _init_worker(pdk: str | None, path: str | None) -> None:
+    """Activates the PDK and registers the YAML cells in a worker process."""
+    if pdk:
+        get_active_pdk(name=pdk)
+    if path:
+        get_active_pdk().register_cells_yaml(dirpath=path, update=True)
+
+
+def build_file(filepath: PathType, incremental: bool = False):
+    """Builds the Component of a *.pic.yml file or runs a *.py file.
+
+    Args:
+        filepath: to a *.pic.yml or *.py file.
+        incremental: reuses the previous build of the same *.pic.yml file and only
+            rebuilds the instances and routes that changed.
+
+    Returns:
+        the Component for *.pic.yml files, None for *.py files.
+    """
+    filepath = pathlib.Path(filepath)
+    if not filepath.exists():
+        return None
+
+    if str(filepath).endswith(".pic.yml"):
+        cell_name = filepath.stem.split(".")[0]
+        pdk = get_active_pdk()
+        if incremental:
+            builder = _builders.setdefault(
+                str(filepath.absolute()), IncrementalYamlBuilder(name=cell_name)
+            )
+            c = builder.build(filepath)
+            kf.logger.info(f"{cell_name!r}: {builder.last_update}")
+            return c
+        function = LazyYamlCell(filepath, name=cell_name)
+        pdk.register_cells_yaml(**{cell_name: function}, update=True)
+        return function()
+
+    elif str(filepath).endswith(".py"):
+        d = dict(globals())
+        d.update(__name__="__main__")
+        exec(filepath.read_text(), d, d)
+    else:
+        print(f"Changed file {filepath} ignored (not .pic.yml or .py)")
+    return None
+
+
+def _build_file_in_worker(filepath: str, incremental: bool) -> str | None:
+    """Builds a file in a worker process and writes the GDS to a temp file."""
+    c = build_file(filepath, incremental=incremental)
+    if c is None:
+        return None
+    gdspath = GDSDIR_TEMP / "watch" / f"{c.name}.gds"
+    gdspath.parent.mkdir(parents=True, exist_ok=True)
+    c.write_gds(gdspath)
+    return str(gdspath)
+
+
+class FileWatcher(FileSystemEventHandler):
+    """Captures *.py or *.pic.yml file change events.
+
+    Args:
+        logger: to log events.
+        path: directory to watch.
+        incremental: only rebuild the instances and routes of a *.pic.yml file that
+            changed since the previous save.
+        debounce: seconds to wait for more events on the same file before building.
+            Editors often write a file several times per save. Builds of
+            different files run one at a time, the layout is not thread safe.
+        run_in_process: builds in a separate worker process, so the IPython
+            session stays responsive. The worker keeps its cell cache between builds.
+        pdk: name of the PDK to activate in the worker process.
+    """
+
+    def __init__(
+        self,
+        logger=None,
+        path: str | None = None,
+        incremental: bool = False,
+        debounce: float = 0.2,
+        run_in_process: bool = False,
+        pdk: str | None = None,
+    ) -> None:
         """Initialize the YAML event handler."""
         super().__init__()
 
         self.logger = logger or logging.root
-        pdk = get_active_pdk()
-        pdk.register_cells_yaml(dirpath=path, update=True)
+        pdk_active = get_active_pdk()
+        pdk_active.register_cells_yaml(dirpath=path, update=True)
 
         self.observer = Observer()
         self.path = path
         self.stopping = threading.Event()
+        self.incremental = incremental
+        self.debounce = debounce
+        self.executor: ProcessPoolExecutor | None = None
+        self._timers: dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+        if run_in_process:
+            self.executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(pdk, path),
+            )
 
     def start(self) -> None:
         self.observer.schedule(self, self.path, recursive=True)
@@ -51,6 +149,33 @@ class FileWatcher(FileSystemEventHandler):
     def stop(self) -> None:
         self.stopping.set()
         self.thread.join()
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
+
+    def schedule(self, filepath) -> None:
+        """Builds a file once no new events arrived for `debounce` seconds."""
+        filepath = str(filepath)
+        if self.debounce <= 0:
+            self.get_component(filepath)
+            return
+
+        with self._lock:
+            timer = self._timers.pop(filepath, None)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(self.debounce, self._fire, args=(filepath,))
+            timer.daemon = True
+            self._timers[filepath] = timer
+            timer.start()
+
+    def _fire(self, filepath: str) -> None:
+        with self._lock:
+            self._timers.pop(filepath, None)
+        self.get_component(filepath)
 
     def update_cell(self, src_path, update: bool = False) -> Callable:
         """Parses a YAML file to a cell function and registers into active pdk.
@@ -69,7 +194,7 @@ class FileWatcher(FileSystemEventHandler):
         # FIXME: This is a temporary fix to avoid caching issues
         # if cell_name in CACHE:
         #     CACHE.pop(cell_name)
-        function = cell_from_yaml_template(filepath, name=cell_name)
+        function = LazyYamlCell(filepath, name=cell_name)
         try:
             pdk.register_cells_yaml(**{cell_name: function}, update=update)
         except ValueError as e:
@@ -83,7 +208,7 @@ class FileWatcher(FileSystemEventHandler):
         if what == "file" and event.dest_path.endswith(".pic.yml"):
             self.logger.info("Moved %s: %s", what, event.src_path)
             self.update_cell(event.dest_path)
-            self.get_component(event.src_path)
+            self.schedule(event.dest_path)
 
     def on_created(self, event) -> None:
         super().on_created(event)
@@ -95,7 +220,7 @@ class FileWatcher(FileSystemEventHandler):
             or event.src_path.endswith(".py")
         ):
             self.logger.info("Created %s: %s", what, event.src_path)
-            self.get_component(event.src_path)
+            self.schedule(event.src_path)
 
     def on_deleted(self, event) -> None:
         super().on_deleted(event)
@@ -119,35 +244,50 @@ class FileWatcher(FileSystemEventHandler):
             or event.src_path.endswith(".py")
         ):
             self.logger.info("Modified %s: %s", what, event.src_path)
-            self.get_component(event.src_path)
+            self.schedule(event.src_path)
 
     def update(self):
         pass
 
     def get_component(self, filepath):
         self.update()
+        if self.executor:
+            future = self.executor.submit(
+                _build_file_in_worker, str(filepath), self.incremental
+            )
+            future.add_done_callback(self._show_worker_result)
+            return future
+
         try:
-            filepath = pathlib.Path(filepath)
-            if filepath.exists():
-                if str(filepath).endswith(".pic.yml"):
-                    cell_func = self.update_cell(filepath, update=True)
-                    c = cell_func()
-                    c.show()
-                    # on_yaml_cell_modified.fire(c)
-                    return c
-                elif str(filepath).endswith(".py"):
-                    d = dict(locals(), **globals())
-                    d.update(__name__="__main__")
-                    exec(filepath.read_text(), d, d)
-                else:
-                    print("Changed file {filepath} ignored (not .pic.yml or .py)")
+            with self._build_lock:
+                c = build_file(filepath, incremental=self.incremental)
+            if c is not None:
+                c.show()
+                # on_yaml_cell_modified.fire(c)
+            return c
 
         except Exception as e:
             traceback.print_exc(file=sys.stdout)
             print(e)
 
-
-def watch(path: PathType | None = cwd, pdk: str | None = None) -> None:
+    def _show_worker_result(self, future: Future) -> None:
+        try:
+            gdspath = future.result()
+        except Exception as e:
+            traceback.print_exc(file=sys.stdout)
+            print(e)
+            return
+        if gdspath:
+            kf.show(gdspath)
+
+
+def watch(
+    path: PathType | None = cwd,
+    pdk: str | None = None,
+    incremental: bool = False,
+    debounce: float = 0.2,
+    run_in_process: bool = False,
+) -> None:
     path = str(path)
     logging.basicConfig(
         level=logging.INFO,
@@ -156,7 +296,13 @@ def watch(path: PathType | None = cwd, pdk: str | None = None) -> None:
     )
     if pdk:
         get_active_pdk(name=pdk)
-    watcher = FileWatcher(path=path)
+    watcher = FileWatcher(
+        path=path,
+        incremental=incremental,
+        debounce=debounce,
+        run_in_process=run_in_process,
+        pdk=pdk,
+    )
     watcher.start()
     logging.info(
         f"File watcher looking for changes in *.py and *.pic.yml files in {path!r}. Stop with Ctrl+C"
@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import multiprocessing
+import os
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import klayout.db as kdb
+
 import gdsfactory as gf
 from gdsfactory import logger
+from gdsfactory.cell_hash import get_cell_own_hashes
+from gdsfactory.layout_format import LayoutFormat, get_save_options, suffixes
 from gdsfactory.name import clean_name
 from gdsfactory.typings import PathType
 
@@ -96,37 +105,158 @@ def get_import_gds_script(dirpath: PathType, module: str | None = None) -> str:
     return "\n".join(script)
 
 
+_layout: kdb.Layout | None = None
+
+
+def _init_worker(gdspath: str) -> None:
+    """Reads the GDS once per worker process."""
+    global _layout
+    _layout = kdb.Layout()
+    _layout.read(gdspath)
+
+
+def get_content_hashes(layout: kdb.Layout) -> dict[int, str]:
+    """Returns a hash of each cell and the names and content of all its children.
+
+    Two cells with the same content hash are written into the same GDS file,
+    up to the order of the shapes.
+
+    Args:
+        layout: klayout Layout.
+    """
+    own_hashes = get_cell_own_hashes(layout)
+    keys = {ci: f"{layout.cell(ci).name} {h}" for ci, h in own_hashes.items()}
+    hashes = {}
+    for cell in layout.each_cell():
+        ci = cell.cell_index()
+        tree = sorted(keys[c] for c in [ci, *cell.called_cells()])
+        hashes[ci] = hashlib.sha256("\n".join(tree).encode()).hexdigest()
+    return hashes
+
+
+def _write_cell(
+    name: str, gdspath: str, content_hash: str, format: LayoutFormat = "gds"
+) -> bool:
+    """Writes a cell and its children unless gdspath already has the same content.
+
+    Returns True if the file was written.
+    """
+    assert _layout is not None
+    path = pathlib.Path(gdspath)
+    if path.exists():
+        existing = kdb.Layout()
+        try:
+            existing.read(gdspath)
+        except RuntimeError:
+            # truncated or not a layout file
+            existing.clear()
+        cell = existing.cell(name)
+        if cell is not None and get_content_hashes(existing)[cell.cell_index()] == (
+            content_hash
+        ):
+            return False
+    options = get_save_options(format, kdb.SaveLayoutOptions())
+    options.add_cell(_layout.cell(name).cell_index())
+    _layout.write(gdspath, options)
+    return True
+
+
 def write_cells_recursively(
     gdspath: PathType | None = None,
-    dirpath: pathlib.Path | None = None,
+    dirpath: PathType | None = None,
+    max_workers: int | None = None,
+    manifest: bool = True,
+    format: LayoutFormat = "gds",
 ) -> dict[str, Path]:
-    """Write gdstk cells recursively.
+    """Writes each cell of a GDS file with its children into a separate GDS file.
+
+    Files are written in parallel by worker processes, each reading gdspath once.
+    A cell is not written again when its file has the same content, which is
+    checked against the `manifest.json` of dirpath or by reading the file.
 
     Args:
         gdspath: gds file to write cells from.
         dirpath: directory for the GDS file to write to.
+        max_workers: number of worker processes. Defaults to the number of CPUs.
+            0 writes in the current process.
+        manifest: writes `manifest.json` into dirpath with the content hash and
+            the file of each cell.
+        format: gds, gds.gz or oas.
 
     Returns:
         gdspaths: dict of cell name to gdspath.
     """
-    gf.kcl.read(gdspath)
+    global _layout
+
+    if gdspath is None:
+        raise ValueError("gdspath is required")
+    gdspath = str(pathlib.Path(gdspath).absolute())
+    layout = kdb.Layout()
+    layout.read(gdspath)
     dirpath = dirpath or pathlib.Path.cwd()
     dirpath = pathlib.Path(dirpath).absolute()
     dirpath.mkdir(exist_ok=True, parents=True)
 
-    gdspaths = {}
-
-    for cell_index in gf.kcl.each_cell_bottom_up():
-        component = gf.kcl[cell_index]
-        gdspath = dirpath / f"{component.name}.gds"
-        component.write(gdspath)
-        gdspaths[component.name] = gdspath
+    manifest_path = dirpath / "manifest.json"
+    previous = (
+        json.loads(manifest_path.read_text())["cells"] if manifest_path.exists() else {}
+    )
+
+    hashes = get_content_hashes(layout)
+    gdspaths: dict[str, Path] = {}
+    to_write: list[tuple[str, str, str]] = []
+    for cell_index in layout.each_cell_bottom_up():
+        name = layout.cell(cell_index).name
+        path = dirpath / f"{name}{suffixes[format]}"
+        gdspaths[name] = path
+        entry = previous.get(name)
+        if (
+            entry
+            and path.exists()
+            and entry["hash"] == hashes[cell_index]
+            and entry["mtime_ns"] == path.stat().st_mtime_ns
+        ):
+            continue
+        to_write.append((name, str(path), hashes[cell_index], format))
+
+    if to_write:
+        args = list(zip(*to_write))
+        if max_workers == 0 or len(to_write) == 1:
+            _layout = layout
+            written = list(map(_write_cell, *args))
+            _layout = None
+        else:
+            max_workers = min(max_workers or os.cpu_count() or 1, len(to_write))
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(gdspath,),
+            ) as executor:
+                chunksize = max(len(to_write) // (4 * max_workers), 1)
+                written = list(executor.map(_write_cell, *args, chunksize=chunksize))
+        logger.info(
+            f"Wrote {sum(written)} of {len(gdspaths)} cells from {gdspath!r}, "
+            f"{len(to_write) - sum(written)} unchanged files kept"
+        )
+
+    if manifest:
+        cells = {
+            name: {
+                "hash": hashes[layout.cell(name).cell_index()],
+                "path": path.name,
+                "mtime_ns": path.stat().st_mtime_ns,
+            }
+            for name, path in gdspaths.items()
+        }
+        manifest_path.write_text(json.dumps({"cells": cells}, indent=2))
     return gdspaths
 
 
 def write_cells(
     gdspath: PathType | None = None,
     dirpath: PathType | None = None,
+    format: LayoutFormat = "gds",
 ) -> dict[str, Path]:
     """Writes cells into separate GDS files.
 
@@ -134,6 +264,7 @@ def write_cells(
         gdspath: GDS file to write cells.
         dirpath: directory path to write GDS files to.
             Defaults to current working directory.
+        format: gds, gds.gz or oas.
 
     Returns:
         gdspaths: dict of cell name to gdspath.
@@ -148,7 +279,7 @@ def write_cells(
     gdspaths = {}
 
     for component in components:
-        gdspath = dirpath / f"{component.name}.gds"
-        component.write(gdspath)
+        gdspath = dirpath / f"{component.name}{suffixes[format]}"
+        component.write(gdspath, save_options=get_save_options(format))
         gdspaths[component.name] = gdspath
     return gdspaths
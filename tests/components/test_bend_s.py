@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from gdsfactory.components.bend_s import get_min_sbend_size
+from gdsfactory.components.bezier import bezier_curve
+from gdsfactory.functions import curvature
+
+
+def _get_min_sbend_size_scan(size, min_radius, num_points=100) -> float:
+    ind = 0 if size[0] is None else 1
+    known_s = size[1 - ind]
+    max_size = 2.5 * np.sqrt(np.abs(min_radius * known_s))
+    t = np.linspace(0, 1, 201)
+    for s in np.linspace(max_size, 0.1 * max_size, num_points):
+        size = list(size)
+        size[ind] = s
+        dx, dy = size
+        path_points = bezier_curve(t, ((0, 0), (dx / 2, 0), (dx / 2, dy), (dx, dy)))
+        if 1 / max(np.abs(curvature(path_points, t))) < min_radius:
+            return s
+    return np.inf
+
+
+@pytest.mark.parametrize(
+    "size", [(None, 10.0), (None, -5.0), (None, 0.3), (20.0, None), (3.0, None)]
+)
+def test_get_min_sbend_size(size) -> None:
+    min_size = get_min_sbend_size(size, cross_section="strip")
+    assert np.isclose(min_size, _get_min_sbend_size_scan(size, min_radius=10))
@@ -0,0 +1,23 @@
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.components.spiral_heater import (
+    _req_straight_len,
+    _req_straight_len_brute_force,
+)
+
+
+def test_spiral_racetrack_fixed_length() -> None:
+    length = 1000.0
+    c = gf.components.spiral_racetrack_fixed_length(length=length)
+    assert np.isclose(c.info["length"], length, atol=1e-2)
+
+
+def test_req_straight_len_matches_brute_force() -> None:
+    settings = dict(
+        length=800.0, in_out_port_spacing=150, min_radius=5, spacings=(5.0,) * 3
+    )
+    straight_length = _req_straight_len(**settings)
+    assert np.isclose(
+        straight_length, _req_straight_len_brute_force(**settings), rtol=1e-3
+    )
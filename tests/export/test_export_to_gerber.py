@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pathlib
+import re
+
+import pytest
+from kfactory import kdb
+
+import gdsfactory as gf
+from gdsfactory.export.to_gerber import GerberLayer, GerberOptions, to_gerber
+
+F_CU = (1, 0)
+EDGE_CUTS = (31, 0)
+
+layermap_to_gerber_layer = {
+    F_CU: GerberLayer(
+        name="F_Cu", function=["Copper", "L1", "Top"], polarity="Positive"
+    ),
+    EDGE_CUTS: GerberLayer(name="Edge_Cuts", function=["Profile"], polarity="Positive"),
+}
+
+
+@gf.cell
+def board() -> gf.Component:
+    """Returns a pad ring with an island in its hole, pads and an outline."""
+    c = gf.Component()
+    ring = kdb.Region(kdb.Box(0, 0, 500_000, 500_000)) - kdb.Region(
+        kdb.Box(100_000, 100_000, 400_000, 400_000)
+    )
+    c.shapes(gf.get_layer(F_CU)).insert(ring)
+    c.add_polygon([(200, 200), (300, 200), (250, 300)], layer=F_CU)
+    pads = c.add_ref(
+        gf.components.rectangle(size=(50, 50), layer=F_CU),
+        columns=4,
+        rows=2,
+        spacing=(100, 100),
+    )
+    pads.dmove((600, 0))
+    c << gf.components.circle(radius=100, layer=F_CU)
+    c.add_polygon(
+        [(-200, -200), (1100, -200), (1100, 700), (-200, 700)], layer=EDGE_CUTS
+    )
+    return c
+
+
+def read_gerber(filepath: pathlib.Path, dbu: float) -> kdb.Region:
+    """Returns the regions of a Gerber file written by to_gerber."""
+    text = filepath.read_text()
+    fs = re.search(r"%FSLAX(\d)(\d)Y\d\d\*%", text)
+    mode = re.search(r"%MO(MM|IN)\*%", text).group(1)
+    um = (1e3 if mode == "MM" else 25400) / 10 ** int(fs.group(2))
+    region = kdb.Region()
+    for block in re.findall(r"G36\*\n(.*?)G37\*\n", text, flags=re.S):
+        points = [
+            kdb.Point(round(int(x) * um / dbu), round(int(y) * um / dbu))
+            for x, y in re.findall(r"X(-?\d+)Y(-?\d+)D0[12]\*", block)
+        ]
+        assert points[0] == points[-1]
+        region.insert(kdb.Polygon(points[:-1]))
+    return region.merged()
+
+
+@pytest.mark.parametrize("mode", ["mm", "in"])
+def test_to_gerber_round_trip(tmp_path: pathlib.Path, mode: str) -> None:
+    c = board()
+    to_gerber(
+        c,
+        dirpath=tmp_path,
+        layermap_to_gerber_layer=layermap_to_gerber_layer,
+        options=GerberOptions(mode=mode),
+    )
+    dbu = c.kcl.dbu
+    for layer, gerber_layer in layermap_to_gerber_layer.items():
+        filepath = tmp_path / f"{gerber_layer.name}.gbr"
+        text = filepath.read_text()
+        assert text.startswith("%TF.FileFunction,")
+        assert "%FSLAX46Y46*%" in text
+        assert text.endswith("M02*\n")
+
+        expected = kdb.Region(c.begin_shapes_rec(gf.get_layer(layer))).merged()
+        xor = read_gerber(filepath, dbu) ^ expected
+        # inches are rounded to 1e-6 in = 25.4 nm
+        assert xor.sized(-1 if mode == "mm" else -26).is_empty()
+        assert read_gerber(filepath, dbu).count() == expected.count()
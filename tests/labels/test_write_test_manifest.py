@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.labels.write_test_manifest import (
+    write_test_manifest,
+    write_test_manifest_batches,
+)
+
+
+def test_write_test_manifest_batches(tmp_path) -> None:
+    c = gf.Component()
+    mmi = gf.components.mmi1x2()
+    c.add_ref(mmi).dmove((10, 20))
+    c.add_ref(mmi).drotate(90).dmove((-100, 5))
+    c.add_ref(mmi).dmirror().dmove((300, -7))
+    c.add_ref(gf.components.straight(length=3), columns=3, spacing=(20, 0))
+
+    csvpath = tmp_path / "manifest.csv"
+    csvpath_batches = tmp_path / "manifest_batches.csv"
+    write_test_manifest(c, csvpath)
+    n = write_test_manifest_batches(c, csvpath_batches, batch_size=2)
+
+    df1 = pd.read_csv(csvpath)
+    df2 = pd.read_csv(csvpath_batches)
+    assert n == len(df1) == len(df2) == 6
+    assert list(df1.columns) == list(df2.columns)
+
+    for (_, r1), (_, r2) in zip(df1.iterrows(), df2.iterrows()):
+        assert (r1["cell"], r1["x"], r1["y"], r1["info"]) == (
+            r2["cell"],
+            r2["x"],
+            r2["y"],
+            r2["info"],
+        )
+        ports1 = json.loads(r1["ports"])
+        ports2 = json.loads(r2["ports"])
+        assert list(ports1) == list(ports2)
+        for name, p1 in ports1.items():
+            p2 = ports2[name]
+            p1["center"] = [round(v, 3) for v in p1["center"]]
+            p1["orientation"] %= 360
+            assert p1 == p2
+
+
+def test_write_test_manifest_parquet(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    c = gf.Component()
+    c.add_ref(gf.components.mmi1x2(), columns=4, spacing=(50, 0))
+    filepath = tmp_path / "manifest.parquet"
+    assert write_test_manifest_batches(c, filepath, batch_size=3) == 4
+    df = pd.read_parquet(filepath)
+    assert df["x"].tolist() == [0, 50000, 100000, 150000]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+from kfactory import kdb
+
+import gdsfactory as gf
+from gdsfactory.read.from_np import (
+    bitmap_to_boxes,
+    boxes_to_region,
+    douglas_peucker,
+    from_np,
+)
+
+
+def _region(component: gf.Component) -> kdb.Region:
+    return kdb.Region(component.begin_shapes_rec(gf.get_layer((1, 0)))).merged()
+
+
+def _ring() -> np.ndarray:
+    img = np.zeros((20, 10))
+    img[5:15, 2:8] = 1
+    img[8:11, 4:6] = 0
+    return img
+
+
+def test_bitmap_to_boxes() -> None:
+    boxes = bitmap_to_boxes(_ring() > 0.5)
+    covered = np.zeros((20, 10), dtype=bool)
+    for x0, y0, x1, y1 in boxes:
+        assert not covered[x0:x1, y0:y1].any()
+        covered[x0:x1, y0:y1] = True
+    np.testing.assert_array_equal(covered, _ring() > 0.5)
+    assert len(boxes) == 4
+
+
+def test_from_np_rle_keeps_holes() -> None:
+    img = _ring()
+    region = _region(from_np(img, nm_per_pixel=1000, method="rle", tile_rows=7))
+    assert region.count() == 1
+    polygon = next(iter(region.each()))
+    assert polygon.holes() == 1
+    assert region.area() == img.sum() * 1000**2
+
+
+def test_boxes_to_region() -> None:
+    boxes = np.array([(0, 0, 10, 10), (20, -5, 30, 5), (-(2**20), 0, 0, 1)])
+    region = boxes_to_region(boxes)
+    assert sorted(str(p.bbox()) for p in region.each()) == sorted(
+        str(kdb.Box(*box)) for box in boxes.tolist()
+    )
+    assert boxes_to_region(np.empty((0, 4), dtype=np.int64)).is_empty()
+
+
+def test_from_np_methods_agree() -> None:
+    img = _ring()
+    for invert, pixels in [(True, 54), (False, 6)]:
+        rle = _region(from_np(img, nm_per_pixel=1000, method="rle", invert=invert))
+        contour = _region(from_np(img, nm_per_pixel=1000, invert=invert))
+        assert rle.area() == pixels * 1000**2
+        # contours follow the threshold, 0.01 pixel from the pixel centers
+        assert (rle ^ contour).sized(-500).is_empty()
+        assert rle.interacting(contour).count() == rle.count()
+
+
+def test_from_np_rle_simplify() -> None:
+    x, y = np.mgrid[0:400, 0:400]
+    img = ((x - 200) ** 2 + (y - 200) ** 2 < 150**2).astype(float)
+    img[(x - 200) ** 2 + (y - 200) ** 2 < 50**2] = 0
+    exact = _region(from_np(img, nm_per_pixel=10, method="rle"))
+    simple = _region(from_np(img, nm_per_pixel=10, method="rle", simplify=0.01))
+
+    def vertices(region: kdb.Region) -> int:
+        return sum(p.num_points() for p in region.each())
+
+    assert vertices(simple) < vertices(exact) / 4
+    assert next(iter(simple.each())).holes() == 1
+    assert (exact ^ simple).sized(-10).is_empty()
+
+
+def test_douglas_peucker() -> None:
+    points = np.array([(0, 0), (1, 0.1), (2, -0.1), (3, 5), (4, 6), (5, 7)])
+    np.testing.assert_array_equal(
+        douglas_peucker(points, 0.5), [(0, 0), (2, -0.1), (3, 5), (5, 7)]
+    )
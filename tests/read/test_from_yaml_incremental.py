@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+from gdsfactory.read.from_yaml_incremental import IncrementalYamlBuilder
+
+yaml_template = """
+name: incremental
+instances:
+    mmi_top:
+      component: mmi1x2
+      settings:
+        length_mmi: {length_mmi}
+    mmi_bot:
+      component: mmi1x2
+    s:
+      component: straight
+      settings:
+        length: 5
+placements:
+    mmi_top:
+        x: 0
+        y: {y}
+    mmi_bot:
+        x: 100
+        y: 0
+        mirror: True
+    s:
+        x: -50
+        y: -50
+routes:
+    optical:
+        links:
+            mmi_top,o3: mmi_bot,o3
+ports:
+    o1: mmi_top,o1
+    o2: mmi_bot,o1
+"""
+
+
+def _xor_is_empty(c1: gf.Component, c2: gf.Component) -> bool:
+    for layer in set(c1.layers) | set(c2.layers):
+        li = gf.kcl.layer(*layer)
+        r1 = gf.kdb.Region(c1.begin_shapes_rec(li))
+        r2 = gf.kdb.Region(c2.begin_shapes_rec(li))
+        if not (r1 ^ r2).is_empty():
+            return False
+    return True
+
+
+def test_incremental_matches_full_build() -> None:
+    builder = IncrementalYamlBuilder()
+    builder.build(yaml_template.format(length_mmi=5.5, y=20))
+    assert builder.last_update.full
+
+    yaml_str = yaml_template.format(length_mmi=8, y=20)
+    c = builder.build(yaml_str)
+    update = builder.last_update
+    assert not update.full
+    assert update.instances_built == {"mmi_top"}
+    assert update.routes_built == {"optical"}
+    assert "s" not in update.instances_moved
+
+    c_full = gf.read.from_yaml(yaml_str)
+    assert _xor_is_empty(c, c_full)
+    assert [p.name for p in c.ports] == [p.name for p in c_full.ports]
+    assert c.ports["o1"].dcenter == c_full.ports["o1"].dcenter
+
+
+def test_incremental_move_reroutes_only_affected() -> None:
+    builder = IncrementalYamlBuilder()
+    builder.build(yaml_template.format(length_mmi=5.5, y=20))
+    yaml_str = yaml_template.format(length_mmi=5.5, y=40)
+    c = builder.build(yaml_str)
+    update = builder.last_update
+    assert not update.instances_built
+    assert update.instances_moved == {"mmi_top"}
+    assert update.routes_built == {"optical"}
+    assert _xor_is_empty(c, gf.read.from_yaml(yaml_str))
+
+    builder.build(yaml_str)
+    assert not builder.last_update.instances_moved
+    assert not builder.last_update.routes_built
+
+
+def _route_raw(c: gf.Component, ports1, ports2, **kwargs) -> list:
+    """Routing strategy that writes a raw kdb instance and a polygon."""
+    s = gf.components.straight(length=1)
+    c._kdb_cell.insert(gf.kdb.CellInstArray(s.cell_index(), gf.kdb.Trans()))
+    c.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(1, 0))
+    return []
+
+
+def test_incremental_raw_routes_do_not_stack() -> None:
+    builder = IncrementalYamlBuilder(routing_strategy={"route_bundle": _route_raw})
+    builder.build(yaml_template.format(length_mmi=5.5, y=20))
+    yaml_str = yaml_template.format(length_mmi=5.5, y=40)
+    c = builder.build(yaml_str)
+    assert builder.last_update.full
+    n_insts = c._kdb_cell.child_instances()
+    c = builder.build(yaml_str)
+    assert c._kdb_cell.child_instances() == n_insts
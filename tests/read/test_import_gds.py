@@ -6,6 +6,7 @@ import jsondiff
 import pandas as pd
 
 import gdsfactory as gf
+from gdsfactory.config import PATH
 from gdsfactory.generic_tech import LAYER
 from gdsfactory.read.import_gds import import_gds
 
@@ -66,6 +67,27 @@ def test_import_gds_ports(data_regression) -> None:
         data_regression.check(c1.to_dict())
 
 
+def test_import_gds_layers() -> None:
+    """Only the requested layers are read."""
+    gdspath = PATH.gdsdir / "mmi1x2.gds"
+    c = import_gds(gdspath, layers=[(1, 0), (68, 0)])
+    assert sorted(c.layers) == [(1, 0), (68, 0)], c.layers
+
+
+def test_import_gds_cache() -> None:
+    gdspath = PATH.gdsdir / "mzi2x2.gds"
+    c1 = import_gds(gdspath, cache=True)
+    c2 = import_gds(gdspath, cache=True)
+    c3 = import_gds(gdspath, cache=True, layers=[(1, 0)])
+    assert c1.name == c2.name
+    assert set(c1.called_cells()) == set(c2.called_cells())
+    assert set(c1.called_cells()) != set(c3.called_cells())
+
+    c1.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(99, 0))
+    assert (99, 0) not in c2.layers
+    assert (99, 0) not in import_gds(gdspath, cache=True).layers
+
+
 if __name__ == "__main__":
     # test_import_gds_info()
     c1 = gf.components.straight(length=1.234)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import klayout.db as kdb
+
+from gdsfactory.config import PATH
+from gdsfactory.read.from_gdspaths import merge_gdspaths
+
+
+def test_merge_gdspaths(tmp_path) -> None:
+    gdspaths = [
+        PATH.gdsdir / "mzi2x2.gds",
+        PATH.gdsdir / "mzi2x2.gds",
+        PATH.gdsdir / "big_rect.gds",
+        PATH.gdsdir / "small_rect.gds",
+    ]
+    gdspath = tmp_path / "merged.gds"
+    report = merge_gdspaths(gdspaths, gdspath=gdspath, max_workers=2)
+    assert [f.gdspath for f in report.files] == gdspaths
+
+    mzi1, mzi2, big_rect, small_rect = report.files
+    assert mzi1.deduplicated == 0
+    assert mzi2.deduplicated == mzi2.cells
+    assert not big_rect.renamed
+    assert small_rect.renamed == {"TOP": small_rect.renamed["TOP"]}
+
+    layout = kdb.Layout()
+    layout.read(str(gdspath))
+    assert layout.top_cell().name == "merged"
+    assert layout.top_cell().child_instances() == 4
+    assert layout.cells() == 1 + mzi1.cells + 2
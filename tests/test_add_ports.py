@@ -4,7 +4,9 @@ from functools import partial
 
 import gdsfactory as gf
 from gdsfactory.add_ports import (
+    add_ports_from_boxes,
     add_ports_from_labels,
+    add_ports_from_markers_center,
     add_ports_from_markers_inside,
     add_ports_from_siepic_pins,
 )
@@ -62,5 +64,34 @@ def test_add_ports_from_labels() -> None:
     assert c2.ports["o2"].dcenter[0] == x, c2.ports["o2"].dcenter[0]
 
 
+def test_add_ports_from_markers_center_hierarchy() -> None:
+    nxn = gf.components.nxn(west=2, east=3, north=4, south=5)
+    c = gf.Component()
+    c << gf.add_pins.add_pins_container(nxn)
+    add_ports_from_markers_center(c, pin_layer=LAYER.PORT, inside=True)
+    assert len(c.ports) == len(nxn.ports)
+    for orientation in (0, 90, 180, 270):
+        expected = sorted(
+            (p.dcenter, p.dwidth) for p in nxn.ports if p.orientation == orientation
+        )
+        ports = sorted(
+            (p.dcenter, p.dwidth) for p in c.ports if p.orientation == orientation
+        )
+        assert ports == expected, orientation
+
+
+def test_add_ports_from_boxes() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (10, 0), (10, 4), (0, 4)], layer=LAYER.WG)
+    pins = c.shapes(gf.get_layer(LAYER.PORT))
+    pins.insert(gf.kdb.DBox(-1, 1, 1, 3))
+    pins.insert(gf.kdb.DBox(9, 1, 11, 3))
+    ref = gf.Component()
+    ref << c
+    add_ports_from_boxes(ref, pin_layer=LAYER.PORT, port_layer=LAYER.WG)
+    assert [p.orientation for p in ref.ports] == [180, 0]
+    assert [p.dcenter for p in ref.ports] == [(0, 2), (10, 2)]
+
+
 if __name__ == "__main__":
     test_add_ports_from_pins_path()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+
+
+def test_area_report_matches_area() -> None:
+    c = gf.components.mzi()
+    report = c.area_report()
+    assert report.density == {}
+    for layer, area in report.area.items():
+        assert area == pytest.approx(c.area(layer))
+
+
+def test_area_report_density() -> None:
+    c = gf.Component()
+    rectangle = gf.components.rectangle(size=(10, 10), layer=(1, 0))
+    c << rectangle
+    ref = c << rectangle
+    ref.dmovex(15)
+    c.add_polygon([(0, 0), (30, 0), (30, 5), (0, 5)], layer=(2, 0))
+
+    report = c.area_report(layers=[(1, 0), (2, 0)], tile_size=5)
+    assert report.area[(1, 0)] == pytest.approx(200)
+    assert report.area[(2, 0)] == pytest.approx(150)
+    density = report.density[(1, 0)]
+    assert density.shape == (2, 6)
+    np.testing.assert_allclose(density[0], [1, 1, 0, 1, 1, 0])
+    np.testing.assert_allclose(report.density[(2, 0)], [[1] * 6, [0] * 6])
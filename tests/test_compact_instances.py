@@ -0,0 +1,62 @@
+from functools import partial
+
+import pytest
+from kfactory.kcell import LockedError
+
+import gdsfactory as gf
+from gdsfactory.compact_instances import compact_instances
+
+
+def _xor_is_empty(c1: gf.Component, c2: gf.Component) -> bool:
+    for layer in set(c1.layers) | set(c2.layers):
+        li = gf.kcl.layer(*layer)
+        r1 = gf.kdb.Region(c1.begin_shapes_rec(li))
+        r2 = gf.kdb.Region(c2.begin_shapes_rec(li))
+        if not (r1 ^ r2).is_empty():
+            return False
+    return True
+
+
+def test_compact_instances_lattice() -> None:
+    unit_cell = gf.components.rectangle(size=(1, 1))
+    c = gf.Component()
+    for j in range(5):
+        for i in range(6):
+            ref = c << unit_cell
+            ref.dmove((i * 3 + (j % 2) * 1.5, j * 2))
+    for i in range(4):
+        ref = c << unit_cell
+        ref.drotate(90)
+        ref.dmove((100 + i * 2, 100 + i * 2))
+    ref = c << unit_cell
+    ref.dmove((-50, -50))
+
+    compacted = c.dup()
+    report = compacted.compact_instances()
+    assert report.instances_before == 35
+    assert report.instances_after == 4
+    assert report.arrays == 3
+    assert len(compacted.insts) == 4
+    assert _xor_is_empty(c, compacted)
+
+
+def test_compact_instances_post_process() -> None:
+    @gf.cell(post_process=[partial(compact_instances, allow_locked=True)])
+    def crystal(n: int = 10) -> gf.Component:
+        c = gf.Component()
+        for i in range(n):
+            ref = c << gf.components.circle(radius=0.1)
+            ref.dmovex(i * 0.5)
+        return c
+
+    c = crystal()
+    assert len(c.insts) == 1
+    assert c.insts[0].na == 10
+
+
+def test_compact_instances_locked() -> None:
+    c = gf.components.grating_coupler_dual_pol()
+    n = len(c.insts)
+    with pytest.raises(LockedError):
+        c.compact_instances()
+    assert len(gf.components.grating_coupler_dual_pol().insts) == n
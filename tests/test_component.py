@@ -27,6 +27,43 @@ def test_extract() -> None:
     assert tuple(LAYER.WGCLAD) in c2.layers, c2.layers
 
 
+def test_extract_flat() -> None:
+    child = gf.Component()
+    child.add_polygon([(0, 0), (1, 0), (1, 1)], layer=LAYER.WG)
+    c = gf.Component()
+    c << child
+    c << child
+    c.add_label("a", layer=LAYER.TEXT)
+    c2 = c.extract(layers=[LAYER.WG, LAYER.TEXT])
+    assert c2.shapes(gf.get_layer(LAYER.WG)).size() == 2
+    assert c2.shapes(gf.get_layer(LAYER.TEXT)).size() == 1
+
+
+def test_extract_hierarchical() -> None:
+    c = gf.c.mzi()
+    c2 = c.extract(layers=[LAYER.WG], hierarchical=True)
+    assert c2._kdb_cell.child_instances() == c._kdb_cell.child_instances()
+    assert len(c2.called_cells()) == len(c.called_cells())
+    assert all(set(c2.kcl[ci].layers) == {tuple(LAYER.WG)} for ci in c2.called_cells())
+    assert c2.extract(layers=[LAYER.WG]).area(LAYER.WG) == c.extract(
+        layers=[LAYER.WG]
+    ).area(LAYER.WG)
+    c3 = c.extract(layers=[LAYER.WG], hierarchical=True)
+    assert set(c3.called_cells()) == set(c2.called_cells())
+
+
+def test_extract_hierarchical_unlocked_child() -> None:
+    child = gf.Component()
+    child.add_polygon([(0, 0), (1, 0), (1, 1)], layer=LAYER.WG)
+    c = gf.Component()
+    c.add_ref(child)
+    area = c.extract(layers=[LAYER.WG], hierarchical=True).area(LAYER.WG)
+
+    child.add_polygon([(0, 2), (1, 2), (1, 3)], layer=LAYER.WG)
+    c2 = c.extract(layers=[LAYER.WG], hierarchical=True)
+    assert c2.area(LAYER.WG) == 2 * area
+
+
 def test_hierarchy():
     c = gf.c.mzi()
     assert len(c.called_cells()) == 5, len(c.called_cells())
@@ -1,6 +1,10 @@
+import shutil
 from pathlib import Path
 
-from gdsfactory.difftest import diff
+import klayout.db as kdb
+
+from gdsfactory.cell_hash import get_tree_hashes
+from gdsfactory.difftest import diff, get_changed_cells, get_ref_hashes
 
 _gds_dir = Path(__file__).parent / "gds"
 
@@ -36,3 +40,67 @@ def test_xor2(capsys):
         capsys=capsys,
         layers_with_xor=["2/0"],
     )
+
+
+def test_diff_same_geometry(tmp_path):
+    ref_gds = _gds_dir / "mzi2x2.gds"
+    run_gds = tmp_path / "mzi2x2.gds"
+    layout = kdb.Layout()
+    layout.read(str(ref_gds))
+    layout.add_meta_info(
+        kdb.LayoutMetaInfo("note", "only metadata changed", None, True)
+    )
+    layout.write(str(run_gds))
+    assert diff(ref_gds, run_gds, xor=True, test_name="same") is False
+
+
+def test_get_changed_cells():
+    ref_gds = _gds_dir / "mzi2x2.gds"
+    layout = kdb.Layout()
+    layout.read(str(ref_gds))
+    top = layout.top_cell()
+    ref_hashes = get_tree_hashes(top)
+
+    child = layout.cell(next(iter(top.each_child_cell())))
+    child.shapes(layout.layer(2, 0)).insert(kdb.Box(0, 0, 1000, 1000))
+    run_hashes = get_tree_hashes(top)
+
+    changed = get_changed_cells(ref_hashes, run_hashes, top.name, top.name, layout)
+    assert changed == [child.name]
+    assert run_hashes[top.name][1] == ref_hashes[top.name][1]
+    assert run_hashes[top.name][0] != ref_hashes[top.name][0]
+
+
+def test_get_changed_cells_shared_child():
+    """A changed child placed under a changed and an unchanged parent is kept."""
+    layout = kdb.Layout()
+    layer = layout.layer(1, 0)
+    top = layout.create_cell("top")
+    changed_parent = layout.create_cell("changed_parent")
+    other_parent = layout.create_cell("other_parent")
+    child = layout.create_cell("child")
+    child.shapes(layer).insert(kdb.Box(0, 0, 100, 100))
+    for parent in (changed_parent, other_parent):
+        parent.insert(kdb.CellInstArray(child.cell_index(), kdb.Trans()))
+        top.insert(kdb.CellInstArray(parent.cell_index(), kdb.Trans()))
+    ref_hashes = get_tree_hashes(top)
+
+    child.shapes(layer).insert(kdb.Box(200, 0, 300, 100))
+    changed_parent.shapes(layer).insert(kdb.Box(0, 500, 100, 600))
+    run_hashes = get_tree_hashes(top)
+
+    changed = get_changed_cells(ref_hashes, run_hashes, "top", "top", layout)
+    assert changed == ["changed_parent", "child"]
+
+    other_parent.shapes(layer).insert(kdb.Box(0, 500, 100, 600))
+    run_hashes = get_tree_hashes(top)
+    changed = get_changed_cells(ref_hashes, run_hashes, "top", "top", layout)
+    assert changed == ["changed_parent", "other_parent"]
+
+
+def test_get_ref_hashes_cache(tmp_path):
+    ref_gds = tmp_path / "mzi2x2.gds"
+    shutil.copy(_gds_dir / "mzi2x2.gds", ref_gds)
+    top, hashes = get_ref_hashes(ref_gds)
+    assert ref_gds.with_suffix(".hashes.json").exists()
+    assert get_ref_hashes(ref_gds) == (top, hashes)
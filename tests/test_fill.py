@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from kfactory import kdb
+from kfactory.kcell import LockedError
+
+import gdsfactory as gf
+
+
+def _region(component: gf.Component, layer) -> kdb.Region:
+    return kdb.Region(component.begin_shapes_rec(gf.get_layer(layer))).merged()
+
+
+def test_fill_density() -> None:
+    c = gf.Component()
+    c << gf.components.rectangle(size=(40, 20), layer=(1, 0))
+    ref = c << gf.components.rectangle(size=(10, 10), layer=(2, 0))
+    ref.dmove((25, 5))
+    c.add_polygon([(0, 0), (20, 0), (20, 20), (0, 20)], layer=(3, 0))
+
+    report = gf.fill.fill_density(
+        c,
+        layers=[(3, 0)],
+        density_min=0.2,
+        tile_size=20,
+        exclude_layers=[(2, 0)],
+        keep_out=1,
+    )
+    np.testing.assert_allclose(report.before.density[(3, 0)], [[1, 0]])
+    assert report.tiles == 1
+    assert report.instances > 0
+    assert report.after.density[(3, 0)][0, 1] > 0.1
+
+    fill = _region(report.fill, (3, 0))
+    assert fill.bbox().left >= 21_000
+    assert (fill & _region(c, (2, 0)).sized(1_000)).is_empty()
+    assert any(inst.is_regular_array() for inst in report.fill._kdb_cell.each_inst())
+
+
+def test_fill_density_above_target() -> None:
+    c = gf.Component()
+    c << gf.components.rectangle(size=(20, 20), layer=(3, 0))
+    report = gf.fill.fill_density(c, layers=[(3, 0)], density_min=0.5, tile_size=10)
+    assert report.tiles == 0
+    assert report.fill is None
+
+
+def test_fill_density_twice() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (1, 0), (1, 1), (0, 1)], layer=(3, 0))
+    c.add_polygon([(39, 19), (40, 19), (40, 20), (39, 20)], layer=(3, 0))
+    first = gf.fill.fill_density(c, layers=[(3, 0)], density_min=0.2, tile_size=20)
+    second = gf.fill.fill_density(c, layers=[(3, 0)], density_min=0.9, tile_size=20)
+    assert first.fill is not None and second.fill is not None
+    assert second.fill.name == f"{first.fill.name}_1"
+    assert len(list(c._kdb_cell.each_inst())) == 2
+
+
+def test_fill_density_locked() -> None:
+    c = gf.components.mzi()
+    n_insts = len(c.insts)
+    with pytest.raises(LockedError):
+        gf.fill.fill_density(c, layers=[(1, 0)], density_min=0.9, tile_size=20)
+    assert len(c.insts) == n_insts
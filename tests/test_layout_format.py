@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+
+import klayout.db as kdb
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.layout_format import (
+    get_layout_format,
+    get_save_options,
+    layout_to_bytes,
+    read_layout_bytes,
+)
+
+
+def test_get_layout_format() -> None:
+    assert get_layout_format("a.gds") == "gds"
+    assert get_layout_format("a.GDS.gz") == "gds.gz"
+    assert get_layout_format("a.oas") == "oas"
+    assert get_layout_format(None) == "gds"
+    assert get_layout_format("a.oasis", format="oas") == "oas"
+    assert get_layout_format(None, format="gds.gz") == "gds.gz"
+    for path, format in [("a.gds", "gds.gz"), ("a.gds", "oas"), ("a.oas", "gds")]:
+        with pytest.raises(ValueError):
+            get_layout_format(path, format=format)
+
+
+def test_get_save_options() -> None:
+    options = get_save_options("oas", oasis_compression_level=2)
+    assert options.format == "OASIS"
+    assert options.oasis_compression_level == 2
+    assert options.oasis_strict_mode
+    assert get_save_options("gds.gz").format == "GDS2"
+
+
+def test_component_oasis_round_trip(tmp_path) -> None:
+    c = gf.components.mzi()
+    data = c.to_bytes(format="oas")
+    c2 = gf.import_gds(data)
+    assert c2.name == c.name
+    assert c2.area((1, 0)) == pytest.approx(c.area((1, 0)))
+    assert len(c2.ports) == len(c.ports)
+
+    gdspath = c.write_gds(gdsdir=tmp_path, format="oas")
+    assert gdspath.suffix == ".oas"
+    assert gdspath.read_bytes()[:13] == b"%SEMI-OASIS\r\n"
+    assert gf.import_gds(gdspath).area((1, 0)) == pytest.approx(c.area((1, 0)))
+
+
+def _layout(n: int) -> kdb.Layout:
+    rng = np.random.default_rng(0)
+    layout = kdb.Layout()
+    cell = layout.create_cell("top")
+    shapes = cell.shapes(layout.layer(1, 0))
+    for x, y, w, h in rng.integers(0, 10**6, size=(n, 4)):
+        shapes.insert(kdb.Box(int(x), int(y), int(x + w % 500), int(y + h % 500)))
+    return layout
+
+
+def test_gds_gz_bytes() -> None:
+    data = layout_to_bytes(_layout(100), format="gds.gz")
+    assert data[:2] == b"\x1f\x8b"
+    layout = kdb.Layout()
+    read_layout_bytes(layout, data)
+    assert layout.top_cell().shapes(layout.layer(1, 0)).size() == 100
+
+
+@pytest.mark.benchmark
+def test_layout_format_benchmark(record_property) -> None:
+    """Records file size and throughput in GDS equivalent MB/s per format."""
+    layout = _layout(200_000)
+    sizes = {}
+    for format in ("gds", "gds.gz", "oas"):
+        t0 = time.perf_counter()
+        data = layout_to_bytes(layout, format=format)
+        t1 = time.perf_counter()
+        read_layout_bytes(kdb.Layout(), data)
+        t2 = time.perf_counter()
+        sizes[format] = len(data)
+        mb = sizes["gds"] / 1e6
+        record_property(f"{format}_size_mb", len(data) / 1e6)
+        record_property(f"{format}_write_mb_s", mb / (t1 - t0))
+        record_property(f"{format}_read_mb_s", mb / (t2 - t1))
+    assert sizes["oas"] < sizes["gds.gz"] < sizes["gds"]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from functools import partial
+
+import pytest
+
+import gdsfactory as gf
+
+_lazy_modules = (
+    "gdsfactory.components",
+    "gdsfactory.export",
+    "gdsfactory.labels",
+    "gdsfactory.read",
+    "gdsfactory.routing",
+)
+
+
+def _import_times(statement: str) -> tuple[dict[str, int], set[str]]:
+    """Returns cumulative import times in us and the modules loaded by statement."""
+    code = f"{statement}; import sys; print(*sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times, set(result.stdout.split())
+
+
+def test_import_is_lazy() -> None:
+    _, modules = _import_times("import gdsfactory")
+    assert not modules.intersection(_lazy_modules)
+
+
+@pytest.mark.benchmark
+def test_import_time_benchmark(record_property) -> None:
+    times, _ = _import_times("import gdsfactory")
+    record_property("import_time_us", times["gdsfactory"])
+    record_property("own_import_time_us", times["gdsfactory"] - times["kfactory"])
+
+
+def test_lazy_attributes() -> None:
+    import gdsfactory.components.straight  # noqa: F401
+
+    assert callable(gf.components.straight)
+    assert gf.c is gf.components
+    assert "mmi1x2" in dir(gf.components)
+    assert gf.get_cell("mmi1x2") is gf.components.mmi1x2
+    assert gf.samples.__name__ == "gdsfactory.samples"
+    assert gf.schematic.__name__ == "gdsfactory.schematic"
+    assert gf.constants.__name__ == "gdsfactory.constants"
+
+
+def test_lazy_submodules() -> None:
+    from gdsfactory.components import _submodules
+
+    for name in _submodules:
+        assert getattr(gf.components, name).__name__ == f"gdsfactory.components.{name}"
+    assert gf.components.wire.wire_straight is gf.components.wire_straight
+    assert callable(gf.components.get_cells)
+    assert gf.components.partial is partial
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+from kfactory import kdb
+from kfactory.kcell import LockedError
+
+import gdsfactory as gf
+from gdsfactory.over_under import fix_min_width_space, over_under, under_over
+
+
+def _region(component: gf.Component, layer) -> kdb.Region:
+    return kdb.Region(component.begin_shapes_rec(gf.get_layer(layer))).merged()
+
+
+@gf.cell
+def _slots() -> gf.Component:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (10, 0), (10, 1), (0, 1)], layer=(1, 0))
+    c.add_polygon([(0, 1.1), (10, 1.1), (10, 2), (0, 2)], layer=(1, 0))
+    c.add_polygon([(20, 0), (20.4, 0), (20.4, 5), (20, 5)], layer=(1, 0))
+    c.add_polygon([(30, 0), (30.5, 0), (30.5, 5), (30, 5)], layer=(1, 0))
+    return c
+
+
+@pytest.mark.parametrize("tile_size", [None, 3.0])
+def test_fix_min_width_space_keeps_hierarchy(tile_size: float | None) -> None:
+    c = gf.Component()
+    ref = c << _slots()
+    ref.dmovex(100)
+    fix_min_width_space(
+        c, (1, 0), min_width=0.5, min_space=0.2, layer_out=(2, 0), tile_size=tile_size
+    )
+
+    expected = kdb.Region(kdb.Box(100_000, 0, 110_000, 2_000))
+    expected.insert(kdb.Box(130_000, 0, 130_500, 5_000))
+    assert (_region(c, (2, 0)) ^ expected).is_empty()
+    assert c.shapes(gf.get_layer((2, 0))).size() == 2
+    assert _slots().shapes(gf.get_layer((2, 0))).is_empty()
+    assert _region(c, (1, 0)).count() == 4
+
+
+@pytest.mark.parametrize("tile_size", [None, 3.0])
+def test_fix_min_width_space_one_dbu_below(tile_size: float | None) -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (0.499, 0), (0.499, 5), (0, 5)], layer=(1, 0))
+    c.add_polygon([(2, 0), (2.5, 0), (2.5, 5), (2, 5)], layer=(1, 0))
+    c.add_polygon([(4, 0), (5, 0), (5, 5), (4, 5)], layer=(1, 0))
+    c.add_polygon([(5.199, 0), (6, 0), (6, 5), (5.199, 5)], layer=(1, 0))
+    c.add_polygon([(6.2, 0), (7, 0), (7, 5), (6.2, 5)], layer=(1, 0))
+    fix_min_width_space(
+        c, (1, 0), min_width=0.5, min_space=0.2, layer_out=(2, 0), tile_size=tile_size
+    )
+
+    expected = kdb.Region(kdb.Box(2_000, 0, 2_500, 5_000))
+    expected.insert(kdb.Box(4_000, 0, 6_000, 5_000))
+    expected.insert(kdb.Box(6_200, 0, 7_000, 5_000))
+    assert (_region(c, (2, 0)) ^ expected.merged()).is_empty()
+
+
+def test_over_under_tiled_matches_flat() -> None:
+    c = gf.components.mzi()
+    flat = over_under(c, (1, 0), distance=50, cell_name="mzi_flat", tile_size=None)
+    tiled = over_under(c, (1, 0), distance=50, cell_name="mzi_tiled", tile_size=20)
+    # clipping curved edges at the tile boundaries moves vertices by up to 1 dbu
+    xor = _region(flat, (1, 0)) ^ _region(tiled, (1, 0))
+    assert xor.sized(-1).is_empty()
+
+
+def test_under_over_removes_slivers() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (10, 0), (10, 1), (0, 1)], layer=(1, 0))
+    c.add_polygon([(10, 0), (10.002, 0), (10.002, 5), (10, 5)], layer=(1, 0))
+    under_over(c, (1, 0), distance=2)
+    assert (_region(c, (1, 0)) ^ kdb.Region(kdb.Box(0, 0, 10_002, 1_000))).is_empty()
+
+
+def test_over_under_same_layer_with_children_raises() -> None:
+    c = gf.Component()
+    c << _slots()
+    with pytest.raises(ValueError):
+        over_under(c, (1, 0))
+
+
+def test_over_under_locked_raises() -> None:
+    c = _slots()
+    with pytest.raises(LockedError):
+        over_under(c, (1, 0), layer_out=(2, 0))
+    assert c.shapes(gf.get_layer((2, 0))).is_empty()
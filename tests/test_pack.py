@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 import gdsfactory as gf
 
@@ -46,6 +47,37 @@ def test_pack_with_settings() -> None:
     assert components_packed_list[0]
 
 
+def test_pack_skyline() -> None:
+    component_list = [
+        gf.components.rectangle(size=(i, 10 - i), port_type=None) for i in range(1, 10)
+    ] * 3
+    packed = gf.pack(component_list, spacing=1, engine="skyline", allow_rotation=True)
+    assert len(packed) == 1
+    c = packed[0]
+    assert len(c.insts) == len(component_list)
+    area = sum(inst.dbbox().area() for inst in c.insts)
+    region = gf.kdb.Region([inst.bbox() for inst in c.insts])
+    assert np.isclose(region.merged().area() * c.kcl.dbu**2, area)
+
+
+def test_pack_skyline_max_size() -> None:
+    component_list = [gf.components.rectangle(size=(20, 20), port_type=None)] * 20
+    packed = gf.pack(component_list, spacing=10, max_size=(100, 100), engine="skyline")
+    assert len(packed) == 3
+    assert sum(len(c.insts) for c in packed) == 20
+
+
+def test_pack_skyline_max_size_rotation() -> None:
+    component_list = [gf.components.rectangle(size=(80, 20), port_type=None)] * 2
+    with pytest.raises(ValueError):
+        gf.pack(component_list, max_size=(50, 200), engine="skyline")
+    packed = gf.pack(
+        component_list, max_size=(50, 200), engine="skyline", allow_rotation=True
+    )
+    assert len(packed) == 1
+    assert packed[0].dxsize <= 50
+
+
 if __name__ == "__main__":
     test_pack()
     test_pack_with_settings()
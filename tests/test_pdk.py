@@ -1,3 +1,5 @@
+import os
+
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER
 
@@ -16,3 +18,31 @@ def test_get_layer():
     assert gf.get_layer(1) == LAYER.WG
     assert gf.get_layer((1, 0)) == LAYER.WG
     assert gf.get_layer("WG") == LAYER.WG
+
+
+def test_register_cells_yaml_lazy(tmp_path) -> None:
+    from gdsfactory.read.from_yaml_template import LazyYamlCell
+
+    filepath = tmp_path / "yaml_straight.pic.yml"
+    filepath.write_text(
+        "instances:\n  s:\n    component: straight\n    settings:\n      length: 5\n"
+    )
+    pdk = gf.Pdk(name="yaml_cells", layers=LAYER)
+    pdk.register_cells_yaml(dirpath=tmp_path)
+    cell = pdk.cells["yaml_straight"]
+    assert isinstance(cell, LazyYamlCell)
+
+    function = cell.function
+    assert cell.function is function
+    assert cell().name == "yaml_straight"
+
+    filepath.write_text(filepath.read_text().replace("5", "7"))
+    os.utime(filepath, ns=(0, filepath.stat().st_mtime_ns + 1))
+    assert cell.function is not function
+
+    # edits within the mtime resolution are caught by the size
+    function = cell.function
+    mtime = filepath.stat().st_mtime_ns
+    filepath.write_text(filepath.read_text().replace("7", "10"))
+    os.utime(filepath, ns=(0, mtime))
+    assert cell.function is not function
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+from gdsfactory.port import sort_ports_clockwise
+from gdsfactory.port_table import get_port_table
+
+
+def test_port_table_select() -> None:
+    c = gf.components.nxn(west=2, east=3, north=4, south=5)
+    table = get_port_table(c.ports)
+    assert len(table) == 14
+    west = table.select(orientation=180)
+    assert [p.name for p in west] == [p.name for p in c.ports if p.orientation == 180]
+    assert table.select(port_type="electrical") == []
+    assert len(table.select(layers_excluded=["WG"])) == 0
+
+
+def test_port_table_sort_and_facing() -> None:
+    c = gf.components.nxn(west=2, east=3, north=4, south=5)
+    table = get_port_table(c.ports)
+    assert table.take(table.sort_clockwise()) == sort_ports_clockwise(c.ports)
+    assert len(table.facing("N")) == 4
+    assert len(table.facing("S")) == 5
+
+
+def test_port_table_nearest() -> None:
+    c = gf.components.straight(length=10)
+    table = get_port_table(c.ports)
+    assert table.take(table.nearest(9, 0)) == [c.ports["o2"]]
+    assert [p.name for p in table.take(table.nearest(0, 0, k=5))] == ["o1", "o2"]
+
+
+def test_port_table_follows_changes() -> None:
+    c = gf.Component()
+    c.add_port(name="o1", center=(0, 0), width=0.5, orientation=180, layer="WG")
+    table = get_port_table(c.ports)
+    assert len(table) == 1
+
+    c.add_port(name="o2", center=(10, 0), width=0.5, orientation=0, layer="WG")
+    table = get_port_table(c.ports)
+    assert len(table) == 2
+
+    c.ports["o2"].dx = 20
+    assert get_port_table(c.ports).nearest(20, 0)[0] == 1
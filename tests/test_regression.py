@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from functools import partial
+
+import gdsfactory as gf
+from gdsfactory.config import __version__
+from gdsfactory.regression import (
+    CellResult,
+    RegressionReport,
+    get_pdk_module_name,
+    get_source_hash,
+    manifest_name,
+    run_regression,
+)
+
+
+def test_get_source_hash() -> None:
+    straight = gf.components.straight
+    assert get_source_hash(straight) == get_source_hash(straight)
+    assert get_source_hash(straight) != get_source_hash(gf.components.bend_euler)
+    assert get_source_hash(partial(straight, length=5)) == get_source_hash(
+        partial(straight, length=5)
+    )
+    assert get_source_hash(partial(straight, length=5)) != get_source_hash(straight)
+
+
+def test_run_regression_error(tmp_path) -> None:
+    report = run_regression(
+        cells=["not_a_cell"],
+        dirpath=tmp_path,
+        max_workers=0,
+        junit_xml=tmp_path / "report.xml",
+    )
+    assert [r.status for r in report.results] == ["error"]
+    assert report.failed
+
+    suite = ET.parse(tmp_path / "report.xml").getroot().find("testsuite")
+    assert suite.get("errors") == "1"
+    assert suite.find("testcase/error") is not None
+
+
+def test_run_regression_skips_unchanged(tmp_path) -> None:
+    source_hash = get_source_hash(gf.get_active_pdk().cells["straight"])
+    (tmp_path / "straight.gds").touch()
+    manifest = {
+        "version": __version__,
+        "cells": {
+            "straight": {
+                "status": "passed",
+                "source_hash": source_hash,
+                "geometry_hash": "abc",
+                "reference": None,
+            }
+        },
+    }
+    (tmp_path / manifest_name).write_text(json.dumps(manifest))
+
+    report = run_regression(cells=["straight"], dirpath=tmp_path, max_workers=0)
+    (result,) = report.results
+    assert result.status == "skipped"
+    assert result.geometry_hash == "abc"
+
+
+def test_write_junit(tmp_path) -> None:
+    report = RegressionReport(
+        results=[
+            CellResult(name="a", status="passed"),
+            CellResult(name="b", status="failed", message="geometry changed"),
+            CellResult(name="c", status="new", message="no reference"),
+        ]
+    )
+    suite = ET.parse(report.write_junit(tmp_path / "r.xml")).getroot()[0]
+    assert suite.get("tests") == "3"
+    assert suite.get("failures") == "1"
+    assert suite.get("skipped") == "1"
+    assert [case.get("name") for case in suite] == ["a", "b", "c"]
+
+
+def test_get_pdk_module_name() -> None:
+    assert get_pdk_module_name(gf.get_active_pdk()) == "generic"
+
+
+def _runtime_cell() -> gf.Component:
+    raise RuntimeError("built in the parent process")
+
+
+def test_run_regression_builds_runtime_cells_in_process(tmp_path) -> None:
+    pdk = gf.get_active_pdk()
+    pdk.register_cells(runtime_cell=_runtime_cell)
+    try:
+        report = run_regression(cells=["runtime_cell"], dirpath=tmp_path, max_workers=1)
+    finally:
+        pdk.cells.pop("runtime_cell")
+    (result,) = report.results
+    assert result.status == "error"
+    assert "built in the parent process" in result.message
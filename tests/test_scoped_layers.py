@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from kfactory import kdb
+
+import gdsfactory as gf
+from gdsfactory.scoped_layers import copy_layers, edit_layers, remove_layers
+
+
+def _area(component: gf.Component, layer) -> int:
+    return kdb.Region(component.begin_shapes_rec(gf.get_layer(layer))).area()
+
+
+def test_remove_layers_copy_on_write() -> None:
+    bend = gf.components.bend_euler()
+    area = _area(bend, "WG")
+    c = gf.components.mzi().dup()
+    c.remove_layers(["WG"], copy_on_write=True)
+
+    assert _area(c, "WG") == 0
+    assert _area(bend, "WG") == area > 0
+    assert all(len(ref.ports) == len(ref.cell.ports) > 0 for ref in c.insts)
+
+
+def test_remap_layers_copy_on_write() -> None:
+    c = gf.components.mzi().dup()
+    area = _area(c, "WG")
+    c.remap_layers({"WG": (2, 0)}, recursive=True, copy_on_write=True)
+
+    assert _area(c, "WG") == 0
+    assert _area(c, (2, 0)) == area
+    assert _area(gf.components.mzi(), (2, 0)) == 0
+
+
+def test_edit_layers_reuses_variants() -> None:
+    c1 = gf.components.mzi().dup()
+    c2 = gf.components.mzi().dup()
+    copy_layers(c1, {"WG": (3, 0)})
+    cells = c1.kcl.layout.cells()
+    copy_layers(c2, {"WG": (3, 0)})
+
+    assert c2.kcl.layout.cells() == cells
+    assert set(c1.called_cells()) == set(c2.called_cells())
+    assert _area(c2, (3, 0)) == _area(c2, "WG")
+
+
+def test_edit_layers_only_copies_affected_cells() -> None:
+    c = gf.Component()
+    c << gf.components.straight()
+    c << gf.components.rectangle(layer=(4, 0))
+    rectangle = gf.components.rectangle(layer=(4, 0))
+    edit_layers(c, remove=["WG"])
+
+    assert rectangle.cell_index() in c.called_cells()
+    assert gf.components.straight().cell_index() not in c.called_cells()
+
+
+def test_remove_layers_copy_on_write_locked() -> None:
+    mzi = gf.components.mzi()
+    area = _area(mzi, "WG")
+    c = mzi.remove_layers(["WG"], copy_on_write=True)
+
+    assert c.cell_index() != mzi.cell_index()
+    assert _area(c, "WG") == 0
+    assert _area(mzi, "WG") == area > 0
+    assert mzi.remove_layers(["WG"], copy_on_write=True).cell_index() == (
+        c.cell_index()
+    )
+
+
+def test_edit_layers_unlocked_child_changed() -> None:
+    child = gf.Component()
+    child.add_polygon([(0, 0), (5, 0), (5, 5)], layer="WG")
+    child.add_polygon([(0, 0), (5, 0), (5, 5)], layer=(3, 0))
+    c1 = gf.Component()
+    c1 << child
+    remove_layers(c1, ["WG"])
+
+    child.add_polygon([(0, 10), (5, 10), (5, 15)], layer=(3, 0))
+    c2 = gf.Component()
+    c2 << child
+    remove_layers(c2, ["WG"])
+    assert _area(c2, (3, 0)) == _area(child, (3, 0)) == 2 * _area(c1, (3, 0))
+    assert _area(c2, "WG") == 0
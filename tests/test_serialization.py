@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.generic_tech import LAYER
+from gdsfactory.name import clean_name, dict2name
+from gdsfactory.serialization import (
+    _frozen_models,
+    _layers,
+    _partials,
+    clean_value_json,
+    get_hash,
+)
+
+
+def test_clean_value_json_cached_values_are_copies() -> None:
+    xs = gf.cross_section.strip(width=0.6)
+    d1 = clean_value_json(xs)
+    d1["sections"][0]["width"] = 100
+    d2 = clean_value_json(xs)
+    assert d2["sections"][0]["width"] == 0.6
+    assert clean_value_json(gf.cross_section.strip(width=0.6)) == d2
+
+    f = partial(gf.components.straight, length=3, cross_section=xs)
+    p1 = clean_value_json(f)
+    p1["settings"]["length"] = 4
+    assert clean_value_json(f)["settings"]["length"] == 3
+    assert "module" not in clean_value_json(f, include_module=False)
+
+
+def test_clean_value_json_mutated_partial() -> None:
+    f = partial(gf.components.straight, length=3)
+    assert clean_value_json(f)["settings"]["length"] == 3
+    f.keywords["length"] = 5
+    assert clean_value_json(f)["settings"]["length"] == 5
+    g = partial(gf.components.straight, offsets=[1, 2])
+    assert clean_value_json(g)["settings"]["offsets"] == (1, 2)
+
+
+def test_clean_value_json() -> None:
+    assert clean_value_json(LAYER.WG) == "WG"
+    assert clean_value_json(np.array([0.12345, 2])) == [0.123, 2.0]
+    assert clean_value_json([1.0, 2.5, "a", None]) == (1, 2.5, "a", None)
+    assert clean_value_json({"a": (1, 2)}) == {"a": (1, 2)}
+
+
+def test_clean_name() -> None:
+    assert clean_name("wg(:_=_2852") == "wg___2852"
+    assert clean_name("a.b-c (x)") == "apbmc_x"
+    assert clean_name("a.b-c (x)", remove_dots=True) == "abmc_x"
+    assert clean_name("a+b", allowed_characters=["+"]) == "a+b"
+
+
+def _time(function, number: int = 1000) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return (time.perf_counter() - start) / number
+
+
+def _settings() -> dict:
+    xs = gf.cross_section.strip(width=0.6)
+    return dict(
+        length=10.0,
+        width=0.5,
+        cross_section=xs,
+        layer=LAYER.WG,
+        bend=partial(gf.components.bend_euler, cross_section=xs),
+        offsets=np.arange(5) * 0.1,
+    )
+
+
+def test_clean_value_json_cache_consistent() -> None:
+    settings = _settings()
+    assert get_hash(settings) == get_hash(dict(settings))
+    cached = clean_value_json(settings)
+    _frozen_models.clear()
+    _partials.clear()
+    _layers.clear()
+    assert clean_value_json(settings) == cached
+    assert clean_value_json(_settings()) == cached
+
+
+@pytest.mark.benchmark
+def test_name_benchmark(record_property) -> None:
+    settings = _settings()
+    times = {
+        "clean_value_json": _time(lambda: clean_value_json(settings)),
+        "get_hash": _time(lambda: get_hash(settings)),
+        "dict2name": _time(lambda: dict2name(length=10.0, width=0.5, name="a.b")),
+        "clean_name": _time(lambda: clean_name("straight_L10p5_W0p5")),
+    }
+    for name, seconds in times.items():
+        record_property(f"{name}_us", seconds * 1e6)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+
+import gdsfactory as gf
+from gdsfactory.tracing import get_tracer, trace
+
+
+@gf.cell
+def _traced_child(length: float = 1) -> gf.Component:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (length, 0), (length, 1)], layer=(1, 0))
+    return c
+
+
+@gf.cell
+def _traced_parent(n: int = 3) -> gf.Component:
+    c = gf.Component()
+    for _ in range(n):
+        c << _traced_child(length=1)
+    return c
+
+
+def test_trace_cells(tmp_path) -> None:
+    with trace() as tracer:
+        _traced_parent(n=3)
+        _traced_parent(n=3)
+    assert get_tracer() is None
+
+    parent = tracer.stats["_traced_parent"]
+    assert (parent.calls, parent.builds, parent.cache_hits) == (2, 1, 1)
+    assert parent.instances == 3
+    assert parent.inclusive >= parent.exclusive
+
+    child = tracer.stats["_traced_child"]
+    assert (child.calls, child.builds, child.cache_hits) == (3, 1, 2)
+    assert child.shapes == 1
+    assert "_traced_parent" in tracer.summary()
+
+    filepath = tracer.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads(filepath.read_text())["traceEvents"]
+    assert len(events) == 5
+    assert {e["cat"] for e in events} == {"cell", "cache"}
+
+
+def test_trace_routes() -> None:
+    c = gf.Component()
+    s1 = c << gf.components.straight()
+    s2 = c << gf.components.straight()
+    s2.dmove((50, 20))
+    with trace() as tracer:
+        gf.routing.route_single(c, s1.ports["o2"], s2.ports["o1"])
+    assert tracer.stats["route_single"].calls == 1
+    assert tracer.stats["route_single"].category == "route"
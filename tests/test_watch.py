@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import gdsfactory.watch
+from gdsfactory.watch import FileWatcher
+
+
+def test_watch_builds_one_file_at_a_time(tmp_path, monkeypatch) -> None:
+    running = []
+    built = []
+    lock = threading.Lock()
+
+    def build_file(filepath, incremental: bool = False) -> None:
+        with lock:
+            running.append(filepath)
+            concurrent = len(running)
+        time.sleep(0.1)
+        with lock:
+            running.remove(filepath)
+            built.append((filepath, concurrent))
+
+    monkeypatch.setattr(gdsfactory.watch, "build_file", build_file)
+    watcher = FileWatcher(path=str(tmp_path), debounce=0.01)
+    watcher.schedule(tmp_path / "a.pic.yml")
+    watcher.schedule(tmp_path / "b.pic.yml")
+
+    deadline = time.time() + 5
+    while len(built) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert sorted(path for path, _ in built) == [
+        str(tmp_path / "a.pic.yml"),
+        str(tmp_path / "b.pic.yml"),
+    ]
+    assert all(concurrent == 1 for _, concurrent in built)
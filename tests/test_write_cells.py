@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from gdsfactory.component import GDSDIR_TEMP
@@ -5,11 +7,35 @@ from gdsfactory.config import PATH
 from gdsfactory.write_cells import write_cells, write_cells_recursively
 
 
-@pytest.mark.skip("TODO")
-def test_write_cells_recursively() -> None:
+def test_write_cells_recursively(tmp_path) -> None:
     gdspath = PATH.gdsdir / "mzi2x2.gds"
-    gdspaths = write_cells_recursively(gdspath=gdspath, dirpath=GDSDIR_TEMP)
+    gdspaths = write_cells_recursively(gdspath=gdspath, dirpath=tmp_path)
     assert len(gdspaths) == 10, len(gdspaths)
+    assert all(path.exists() for path in gdspaths.values())
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())["cells"]
+    assert set(manifest) == set(gdspaths)
+
+
+def test_write_cells_recursively_skips_unchanged(tmp_path) -> None:
+    gdspath = PATH.gdsdir / "mzi2x2.gds"
+    gdspaths = write_cells_recursively(gdspath=gdspath, dirpath=tmp_path, max_workers=0)
+    mtimes = {name: path.stat().st_mtime_ns for name, path in gdspaths.items()}
+
+    write_cells_recursively(gdspath=gdspath, dirpath=tmp_path, max_workers=0)
+    assert mtimes == {name: p.stat().st_mtime_ns for name, p in gdspaths.items()}
+
+    # without a manifest the existing files are read and compared
+    (tmp_path / "manifest.json").unlink()
+    name, path = next(iter(gdspaths.items()))
+    path.write_bytes(b"")
+    write_cells_recursively(
+        gdspath=gdspath, dirpath=tmp_path, max_workers=0, manifest=False
+    )
+    assert path.stat().st_size > 0
+    assert not (tmp_path / "manifest.json").exists()
+    mtimes.pop(name)
+    assert mtimes == {n: p.stat().st_mtime_ns for n, p in gdspaths.items() if n != name}
 
 
 @pytest.mark.skip("TODO")
@@ -17,3 +43,14 @@ def test_write_cells() -> None:
     gdspath = PATH.gdsdir / "alphabet_3top_cells.gds"
     gdspaths = write_cells(gdspath=gdspath, dirpath=GDSDIR_TEMP)
     assert len(gdspaths) == 4, len(gdspaths)
+
+
+def test_write_cells_recursively_oasis(tmp_path) -> None:
+    gdspath = PATH.gdsdir / "mzi2x2.gds"
+    gdspaths = write_cells_recursively(
+        gdspath=gdspath, dirpath=tmp_path, max_workers=0, format="oas"
+    )
+    assert all(path.suffix == ".oas" for path in gdspaths.values())
+    assert all(
+        path.read_bytes().startswith(b"%SEMI-OASIS") for path in gdspaths.values()
+    )